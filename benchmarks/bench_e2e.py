@@ -0,0 +1,247 @@
+"""
+End-to-end latency of /summary_today and /audio_today against local fakes.
+
+Runs the real bot handler, MCP client, MCP server subprocess, parser, summarizer and
+TTS tool, with Gmail, OpenAI, Google TTS and Telegram replaced by the fakes in
+benchmarks.fakes. No accounts or network are needed:
+
+    python -m benchmarks.bench_e2e --command audio_today --emails 100 --llm-latency 0.8
+
+A stage's time is the wall time during which at least one of its calls was running,
+so parallel calls (summary chunks, TTS chunks, fetch batches) count once. Fetching and
+parsing overlap each other, so the stages can add up to more than the total; "other"
+is the time no stage was busy (MCP round trips, compaction, prompt building).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import ExitStack, asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from benchmarks.corpus import KINDS
+from benchmarks.fakes import FakeOpenAI, FakeTelegramMessage, StageTimings
+from voice_agent.client.agent import VoiceAgentClient
+from voice_agent.config import settings
+from voice_agent.host.bot import EmailSummaryBot
+
+STAGES = ("spawn", "list", "fetch", "parse", "llm", "tts", "telegram")
+COMMANDS = ("summary_today", "audio_today")
+_ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass
+class FakeConfig:
+    emails: int = 50
+    kind: str | None = None
+    seed: int = 0
+    gmail_latency: float = 0.05
+    llm_latency: float = 0.5
+    llm_tokens_per_second: float = 0.0
+    reply_words: int = 200
+    tts_latency: float = 0.3
+    telegram_latency: float = 0.05
+    stream: bool = True
+
+
+@dataclass
+class RunResult:
+    total: float
+    stages: dict[str, float]
+    calls: dict[str, int]
+    other: float
+
+
+def _server_env(config: FakeConfig, timings_path: Path, spool_dir: str) -> dict[str, str]:
+    fakes = {
+        "emails": config.emails,
+        "kind": config.kind,
+        "seed": config.seed,
+        "gmail_latency": config.gmail_latency,
+        "tts_latency": config.tts_latency,
+    }
+    return {
+        **os.environ,
+        "BENCH_FAKES": json.dumps(fakes),
+        "BENCH_TIMINGS": str(timings_path),
+        # Measure the full fetch and synthesis path on every run.
+        "STORE__ENABLED": "false",
+        "TTS__CACHE_ENABLED": "false",
+        "TTS__WARM_UP": "false",
+        "TTS__SPOOL_DIR": spool_dir,
+        "PARSER__POOL_WORKERS": "1",
+        "MAILBOX_WATCH__ENABLED": "false",
+    }
+
+
+async def run_once(command: str, config: FakeConfig) -> RunResult:
+    """
+    Run one bot command end to end and break its latency down by stage.
+
+    Args:
+        command: The bot command, "summary_today" or "audio_today".
+        config: Latencies and payload sizes of the fakes.
+
+    Returns:
+        The total wall time and the seconds and calls per stage.
+    """
+    timings = StageTimings()
+    with tempfile.TemporaryDirectory() as tmp, ExitStack() as stack:
+        timings_path = Path(tmp) / "server-timings.json"
+        spool_dir = str(Path(tmp) / "audio")
+        params = StdioServerParameters(
+            command=sys.executable,
+            args=["-m", "benchmarks.fake_server"],
+            env=_server_env(config, timings_path, spool_dir),
+            cwd=str(_ROOT),
+        )
+
+        @asynccontextmanager
+        async def fake_server_session() -> AsyncIterator[Any]:
+            started = time.monotonic()
+            async with stdio_client(params) as (read, write), ClientSession(read, write) as session:
+                await session.initialize()
+                timings.add("spawn", started, time.monotonic())
+                yield session
+
+        stack.enter_context(
+            patch.object(
+                VoiceAgentClient, "mcp_host_initialized_session", staticmethod(fake_server_session)
+            )
+        )
+        stack.enter_context(patch.object(settings.mcp_pool, "size", 0))
+        stack.enter_context(patch.object(settings.summary_cache, "backend", "none"))
+        stack.enter_context(patch.object(settings.tts, "spool_dir", spool_dir))
+        stack.enter_context(patch.object(settings.openai, "stream", config.stream))
+
+        bot = EmailSummaryBot("bench", "", "gpt-4o-mini")
+        bot.voice_agent_client.openai_client = FakeOpenAI(
+            latency=config.llm_latency,
+            tokens_per_second=config.llm_tokens_per_second,
+            reply_words=config.reply_words,
+            timings=timings,
+        )
+        message = FakeTelegramMessage(latency=config.telegram_latency, timings=timings)
+        update = SimpleNamespace(message=message)
+        context = SimpleNamespace(args=[], chat_data={})
+
+        started = time.monotonic()
+        await getattr(bot, command)(update, context)
+        total = time.monotonic() - started
+
+        failures = [text for text in message.texts if text.startswith("❌")]
+        if failures:
+            raise RuntimeError(failures[0])
+        if timings_path.exists():
+            timings.merge(timings_path)
+
+    return RunResult(
+        total=total,
+        stages={stage: timings.seconds(stage) for stage in STAGES},
+        calls={stage: timings.calls(stage) for stage in STAGES},
+        other=max(0.0, total - timings.seconds()),
+    )
+
+
+def format_breakdown(command: str, results: list[RunResult]) -> str:
+    """
+    Render the median latency per stage over several runs.
+
+    Args:
+        command: The benchmarked command.
+        results: One result per run.
+
+    Returns:
+        The table.
+    """
+    total = statistics.median(r.total for r in results)
+    lines = [
+        f"/{command}: median of {len(results)} run(s), total {total * 1000:.0f} ms",
+        f"{'stage':<10} {'ms':>9} {'share':>7} {'calls':>6}",
+        "-" * 35,
+    ]
+    for stage in STAGES:
+        seconds = statistics.median(r.stages[stage] for r in results)
+        calls = results[-1].calls[stage]
+        share = seconds / total if total else 0.0
+        lines.append(f"{stage:<10} {seconds * 1000:>9.1f} {share:>7.1%} {calls:>6}")
+    other = statistics.median(r.other for r in results)
+    lines.append(f"{'other':<10} {other * 1000:>9.1f} {other / total if total else 0:>7.1%}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Command line entry point.
+
+    Args:
+        argv: Command line arguments; sys.argv if None.
+
+    Returns:
+        None
+    """
+    defaults = FakeConfig()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--command", choices=COMMANDS, default="summary_today")
+    parser.add_argument("--runs", type=int, default=3, help="runs to take the median of")
+    parser.add_argument("--emails", type=int, default=defaults.emails, help="emails today")
+    parser.add_argument("--kind", choices=sorted(KINDS), help="only this kind of message")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="corpus random seed")
+    parser.add_argument(
+        "--gmail-latency", type=float, default=defaults.gmail_latency, help="s per round trip"
+    )
+    parser.add_argument(
+        "--llm-latency", type=float, default=defaults.llm_latency, help="s to first token"
+    )
+    parser.add_argument(
+        "--llm-tokens-per-second",
+        type=float,
+        default=defaults.llm_tokens_per_second,
+        help="generation speed (0 = instant)",
+    )
+    parser.add_argument(
+        "--reply-words", type=int, default=defaults.reply_words, help="words per LLM reply"
+    )
+    parser.add_argument(
+        "--tts-latency", type=float, default=defaults.tts_latency, help="s per TTS request"
+    )
+    parser.add_argument(
+        "--telegram-latency",
+        type=float,
+        default=defaults.telegram_latency,
+        help="s per Bot API call",
+    )
+    parser.add_argument("--no-stream", action="store_true", help="disable streamed replies")
+    args = parser.parse_args(argv)
+
+    config = FakeConfig(
+        emails=args.emails,
+        kind=args.kind,
+        seed=args.seed,
+        gmail_latency=args.gmail_latency,
+        llm_latency=args.llm_latency,
+        llm_tokens_per_second=args.llm_tokens_per_second,
+        reply_words=args.reply_words,
+        tts_latency=args.tts_latency,
+        telegram_latency=args.telegram_latency,
+        stream=not args.no_stream,
+    )
+    results = [asyncio.run(run_once(args.command, config)) for _ in range(max(1, args.runs))]
+    print(format_breakdown(args.command, results))
+
+
+if __name__ == "__main__":
+    main()
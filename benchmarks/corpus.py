@@ -0,0 +1,203 @@
+"""Deterministic corpus of realistic RFC 2822 messages for the parser benchmarks."""
+
+import random
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from email.message import EmailMessage
+from email.utils import format_datetime
+
+# fmt: off
+_WORDS = (
+    "meeting", "invoice", "project", "update", "schedule", "review", "budget", "release",
+    "customer", "report", "quarterly", "deadline", "agenda", "follow-up", "shipment", "order",
+    "delivery", "feedback", "proposal", "contract", "renewal", "team", "launch", "design",
+    "roadmap", "survey", "webinar", "newsletter", "offer",
+)
+# fmt: on
+_EMOJI = "📦🚀✅🎉🔥💡📈🙏😀👍🌟📣🛒💬⏰"
+# Text in each charset's repertoire, so encoding it is lossless.
+_CHARSET_TEXT = {
+    "iso-8859-1": "Café, crème brûlée et façade à l'hôtel. Grüße aus München!",
+    "windows-1252": "“Smart quotes” – en dash — em dash… €100 ‰ • bullet",
+    "koi8-r": "Привет! Встреча перенесена на пятницу, отчёт во вложении.",
+    "shift_jis": "お世話になっております。会議の資料を添付いたします。",
+}
+_SENDERS = (
+    "Alice Example <alice@example.com>",
+    "=?utf-8?q?J=C3=BCrgen_M=C3=BCller?= <juergen@example.de>",
+    "Shop Newsletter <news@shop.example>",
+    "noreply@service.example",
+)
+
+
+def _sentence(rng: random.Random, emoji: bool = False) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(6, 16))
+    if emoji:
+        words = [w + rng.choice(_EMOJI) if rng.random() < 0.4 else w for w in words]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraphs(rng: random.Random, count: int, emoji: bool = False) -> list[str]:
+    return [" ".join(_sentence(rng, emoji) for _ in range(rng.randint(2, 5))) for _ in range(count)]
+
+
+def _newsletter_html(rng: random.Random, paragraphs: list[str]) -> str:
+    rows = "".join(
+        f'<tr><td style="padding:8px;font-family:Arial"><p>{text}</p>'
+        f'<a href="https://shop.example/item/{i}?utm_source=mail">Read&nbsp;more</a></td></tr>'
+        for i, text in enumerate(paragraphs)
+    )
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Newsletter</title>"
+        "<style>td {color: #333} .btn {background: #06c}</style></head><body>"
+        '<div style="display:none;max-height:0;overflow:hidden">Preheader text &zwnj;'
+        + "&nbsp;&zwnj;"
+        * 40
+        + "</div>"
+        f'<table width="100%" cellpadding="0" cellspacing="0">{rows}</table>'
+        "<!-- tracking --><img src='https://t.example/open.gif' width='1' height='1'>"
+        "<script>window.track && track();</script></body></html>"
+    )
+
+
+def _base(rng: random.Random, index: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = rng.choice(_SENDERS)
+    msg["To"] = "me@example.com"
+    msg["Subject"] = f"{_sentence(rng)[:-1]} #{index}"
+    sent = datetime(2025, 1, 1, tzinfo=UTC) + timedelta(minutes=rng.randint(0, 500_000))
+    msg["Date"] = format_datetime(sent)
+    msg["Message-ID"] = f"<bench-{index}@example.com>"
+    return msg
+
+
+def multipart_alternative(rng: random.Random, index: int) -> bytes:
+    """
+    Build a multipart/alternative message with plain text and HTML versions.
+
+    Args:
+        rng: Random source.
+        index: Message number, used in the subject and Message-ID.
+
+    Returns:
+        The RFC 2822 bytes.
+    """
+    paragraphs = _paragraphs(rng, rng.randint(3, 8))
+    msg = _base(rng, index)
+    msg.set_content("\n\n".join(paragraphs))
+    msg.add_alternative(_newsletter_html(rng, paragraphs), subtype="html")
+    # A fixed boundary keeps the corpus byte-for-byte reproducible.
+    msg.set_boundary(f"==bench-{index}==")
+    return msg.as_bytes()
+
+
+def html_only(rng: random.Random, index: int) -> bytes:
+    """
+    Build a single-part HTML newsletter, which forces HTML-to-text extraction.
+
+    Args:
+        rng: Random source.
+        index: Message number, used in the subject and Message-ID.
+
+    Returns:
+        The RFC 2822 bytes.
+    """
+    msg = _base(rng, index)
+    msg.set_content(_newsletter_html(rng, _paragraphs(rng, rng.randint(10, 40))), subtype="html")
+    return msg.as_bytes()
+
+
+def legacy_charset(rng: random.Random, index: int) -> bytes:
+    """
+    Build a plain text message in a non-UTF-8 charset.
+
+    Args:
+        rng: Random source.
+        index: Message number, used in the subject and Message-ID.
+
+    Returns:
+        The RFC 2822 bytes.
+    """
+    charset, text = rng.choice(sorted(_CHARSET_TEXT.items()))
+    msg = _base(rng, index)
+    body = "\n\n".join([text] * rng.randint(5, 30))
+    msg.set_content(body.encode(charset), maintype="text", subtype="plain")
+    msg.set_param("charset", charset)
+    return msg.as_bytes()
+
+
+def with_attachment(rng: random.Random, index: int) -> bytes:
+    """
+    Build a short multipart/mixed message carrying a large binary attachment.
+
+    Args:
+        rng: Random source.
+        index: Message number, used in the subject and Message-ID.
+
+    Returns:
+        The RFC 2822 bytes.
+    """
+    msg = _base(rng, index)
+    msg.set_content("\n\n".join(_paragraphs(rng, 2)))
+    size = rng.randint(512 * 1024, 2 * 1024 * 1024)
+    msg.add_attachment(
+        rng.randbytes(size), maintype="application", subtype="pdf", filename=f"report-{index}.pdf"
+    )
+    # A fixed boundary keeps the corpus byte-for-byte reproducible.
+    msg.set_boundary(f"==bench-{index}==")
+    return msg.as_bytes()
+
+
+def emoji_heavy(rng: random.Random, index: int) -> bytes:
+    """
+    Build a plain text message full of emoji, zero-width joiners and non-breaking spaces.
+
+    Args:
+        rng: Random source.
+        index: Message number, used in the subject and Message-ID.
+
+    Returns:
+        The RFC 2822 bytes.
+    """
+    paragraphs = _paragraphs(rng, rng.randint(3, 10), emoji=True)
+    paragraphs.append(
+        "\U0001f469\u200d\U0001f469\u200d\U0001f467 family\u00a0photo\u200b attached \u2764\ufe0f"
+    )
+    msg = _base(rng, index)
+    msg.set_content("\n\n".join(paragraphs))
+    return msg.as_bytes()
+
+
+KINDS: dict[str, Callable[[random.Random, int], bytes]] = {
+    "multipart_alternative": multipart_alternative,
+    "html_only": html_only,
+    "legacy_charset": legacy_charset,
+    "with_attachment": with_attachment,
+    "emoji_heavy": emoji_heavy,
+}
+# Share of each kind in the mixed corpus; attachments are rare but dominate the bytes.
+_WEIGHTS = {
+    "multipart_alternative": 35,
+    "html_only": 30,
+    "legacy_charset": 10,
+    "with_attachment": 5,
+    "emoji_heavy": 20,
+}
+
+
+def generate_corpus(count: int, seed: int = 0, kind: str | None = None) -> list[bytes]:
+    """
+    Generate the same list of raw messages for a given count, seed and kind.
+
+    Args:
+        count: Number of messages.
+        seed: Random seed.
+        kind: Only generate this kind of message (a key of KINDS); mixed if None.
+
+    Returns:
+        The raw RFC 2822 messages.
+    """
+    rng = random.Random(seed)
+    kinds = [kind] if kind else list(_WEIGHTS)
+    weights = [1] if kind else list(_WEIGHTS.values())
+    return [KINDS[rng.choices(kinds, weights)[0]](rng, i) for i in range(count)]
@@ -0,0 +1,71 @@
+"""
+Gmail MCP server wired to the fakes, for the end-to-end benchmark.
+
+Started by benchmarks.bench_e2e as `python -m benchmarks.fake_server`. The fake settings
+come from the BENCH_FAKES environment variable (JSON) and the server writes the time
+its fakes and parser spent per stage to the file named by BENCH_TIMINGS after every
+tool call.
+"""
+
+import functools
+import json
+import os
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from benchmarks.fakes import FakeGmailService, FakeTtsClient, StageTimings
+from voice_agent.server import gmail_server
+from voice_agent.server.tools import get_email_body, get_emails, tts_reply
+
+
+def _dumping[**P, R](
+    fn: Callable[P, Awaitable[R]], timings: StageTimings, path: Path
+) -> Callable[P, Awaitable[R]]:
+    @functools.wraps(fn)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            timings.dump(path)
+
+    return wrapper
+
+
+def main() -> None:
+    """
+    Install the fakes and run the MCP server over stdio.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    config: dict[str, Any] = json.loads(os.environ.get("BENCH_FAKES", "{}"))
+    path = Path(os.environ["BENCH_TIMINGS"])
+    timings = StageTimings()
+
+    gmail = FakeGmailService(
+        count=config.get("emails", 50),
+        latency=config.get("gmail_latency", 0.0),
+        kind=config.get("kind"),
+        seed=config.get("seed", 0),
+        timings=timings,
+    )
+    tts = FakeTtsClient(latency=config.get("tts_latency", 0.0), timings=timings)
+
+    get_emails.get_gmail_service = lambda: gmail
+    get_email_body.get_gmail_service = lambda: gmail
+    tts_reply._init_tts_client = lambda: tts
+    # A closure cannot be sent to parse worker processes; the harness parses in-process.
+    get_emails.parse_gmail_raw_message = timings.timed("parse", get_emails.parse_gmail_raw_message)
+    gmail_server.get_emails = _dumping(get_emails.get_emails, timings, path)
+    gmail_server.get_email_body = _dumping(get_email_body.get_email_body, timings, path)
+    gmail_server.tts_instagram_audio = _dumping(tts_reply.tts_instagram_audio, timings, path)
+
+    gmail_server.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,546 @@
+"""
+In-process stand-ins for Gmail, OpenAI, Google TTS and Telegram with configurable latency.
+
+Each fake records when its calls ran in a StageTimings, so the end-to-end harness
+can break a command's latency down by stage.
+"""
+
+import asyncio
+import base64
+import json
+import threading
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email import message_from_bytes
+from email.parser import BytesParser
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from benchmarks.corpus import generate_corpus
+
+
+def busy_seconds(intervals: list[tuple[float, float]]) -> float:
+    """
+    Wall time covered by a set of possibly overlapping intervals.
+
+    Args:
+        intervals: (start, end) pairs on the time.monotonic() clock.
+
+    Returns:
+        The length of their union in seconds.
+    """
+    busy = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None and current_start is not None:
+                busy += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None and current_start is not None:
+        busy += current_end - current_start
+    return busy
+
+
+class StageTimings:
+    """
+    Thread-safe record of when each stage was busy.
+
+    Intervals use time.monotonic(), which is shared by all processes on the machine, so
+    the MCP server's timings can be merged with the bot's.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.intervals: dict[str, list[tuple[float, float]]] = defaultdict(list)
+
+    def add(self, stage: str, start: float, end: float) -> None:
+        """
+        Record one call of a stage.
+
+        Args:
+            stage: Name of the stage.
+            start: time.monotonic() when the call started.
+            end: time.monotonic() when the call ended.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.intervals[stage].append((start, end))
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """
+        Record the enclosed block as one call of a stage.
+
+        Args:
+            stage: Name of the stage.
+
+        Yields:
+            None
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(stage, start, time.monotonic())
+
+    def timed[**P, R](self, stage: str, fn: Callable[P, R]) -> Callable[P, R]:
+        """
+        Wrap a function so each call is recorded under stage.
+
+        Args:
+            stage: Name of the stage.
+            fn: The function to wrap.
+
+        Returns:
+            The wrapped function.
+        """
+
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with self.measure(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    def seconds(self, stage: str | None = None) -> float:
+        """
+        Wall time during which a stage (or any stage, if None) had a call running.
+
+        Concurrent calls of a stage, such as parallel TTS chunks, count once.
+
+        Args:
+            stage: Name of the stage, or None for all stages together.
+
+        Returns:
+            The busy time in seconds.
+        """
+        with self._lock:
+            if stage is not None:
+                return busy_seconds(self.intervals.get(stage, []))
+            return busy_seconds([i for intervals in self.intervals.values() for i in intervals])
+
+    def calls(self, stage: str) -> int:
+        """
+        Number of recorded calls of a stage.
+
+        Args:
+            stage: Name of the stage.
+
+        Returns:
+            The call count.
+        """
+        with self._lock:
+            return len(self.intervals.get(stage, []))
+
+    def merge(self, path: Path) -> None:
+        """
+        Add timings another process saved with dump.
+
+        Args:
+            path: The file written by dump.
+
+        Returns:
+            None
+        """
+        other = json.loads(path.read_text())
+        with self._lock:
+            for stage, intervals in other.items():
+                self.intervals[stage].extend((start, end) for start, end in intervals)
+
+    def dump(self, path: Path) -> None:
+        """
+        Write the timings to a JSON file.
+
+        Args:
+            path: The file to write.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            path.write_text(json.dumps(self.intervals))
+
+
+# --- Gmail ---------------------------------------------------------------------------
+
+
+class _FakeRequest:
+    def __init__(self, gmail: "FakeGmailService", stage: str, call: Callable[[], Any]) -> None:
+        self._gmail = gmail
+        self._stage = stage
+        self._call = call
+
+    def execute(self, http: Any = None, num_retries: int = 0) -> Any:
+        with self._gmail.timings.measure(self._stage):
+            time.sleep(self._gmail.latency)
+            return self._call()
+
+
+class _FakeBatch:
+    def __init__(self, gmail: "FakeGmailService", callback: Callable[..., None]) -> None:
+        self._gmail = gmail
+        self._callback = callback
+        self._requests: list[tuple[str, _FakeRequest]] = []
+
+    def add(self, request: _FakeRequest, request_id: str) -> None:
+        self._requests.append((request_id, request))
+
+    def execute(self, http: Any = None) -> None:
+        # One round trip for the whole batch, like the real batch endpoint.
+        self._gmail.round_trips += 1
+        responses: list[tuple[str, Any, Exception | None]] = []
+        with self._gmail.timings.measure("fetch"):
+            time.sleep(self._gmail.latency)
+            for request_id, request in self._requests:
+                try:
+                    responses.append((request_id, request._call(), None))
+                except Exception as e:
+                    responses.append((request_id, None, e))
+        for request_id, response, error in responses:
+            self._callback(request_id, response, error)
+
+
+class _FakeMessages:
+    def __init__(self, gmail: "FakeGmailService") -> None:
+        self._gmail = gmail
+
+    def list(
+        self, userId: str, q: str = "", maxResults: int = 100, pageToken: str | None = None
+    ) -> _FakeRequest:
+        # The search query is ignored; every message matches.
+        ids = self._gmail.ids
+        start = int(pageToken or 0)
+        end = start + min(maxResults, self._gmail.page_size)
+        response: dict[str, Any] = {"messages": [{"id": i, "threadId": i} for i in ids[start:end]]}
+        if end < len(ids):
+            response["nextPageToken"] = str(end)
+        return _FakeRequest(self._gmail, "list", lambda: response)
+
+    def get(self, userId: str, id: str, format: str = "full", **kwargs: Any) -> _FakeRequest:
+        def fetch() -> dict:
+            self._gmail.fetched_ids.append(id)
+            if id in self._gmail.flaky_ids:
+                # Fail once inside the batch, succeed on the individual retry.
+                self._gmail.flaky_ids.discard(id)
+                raise ConnectionError(f"transient failure for {id}")
+            return self._gmail.message(id, format)
+
+        return _FakeRequest(self._gmail, "fetch", fetch)
+
+
+class _FakeHistory:
+    def __init__(self, gmail: "FakeGmailService") -> None:
+        self._gmail = gmail
+
+    def list(
+        self,
+        userId: str,
+        startHistoryId: str,
+        historyTypes: list[str] | None = None,
+        pageToken: str | None = None,
+    ) -> _FakeRequest:
+        self._gmail.history_reads += 1
+        start = int(startHistoryId)
+        records = [r for r in self._gmail.history_records if int(r["id"]) > start]
+        response = {"history": records, "historyId": str(self._gmail.history_id)}
+        return _FakeRequest(self._gmail, "list", lambda: response)
+
+
+class FakeGmailService:
+    """
+    Answers the Gmail API calls the server makes from an in-memory mailbox.
+
+    The mailbox is a synthetic corpus unless raw_messages is given. Deliveries, deletions
+    and label changes made through its methods are reported by users.history.list, and
+    the counters (fetched_ids, round_trips, profile_reads, history_reads) let tests check
+    which calls were made.
+
+    Args:
+        count: Number of corpus messages in the mailbox.
+        latency: Seconds per round trip (a list page, a batch or a single get).
+        kind: Corpus message kind (see benchmarks.corpus.KINDS); mixed if None.
+        seed: Corpus random seed.
+        timings: Where list and fetch round trips are recorded.
+        raw_messages: Raw messages by id, oldest first, to use instead of the corpus.
+    """
+
+    def __init__(
+        self,
+        count: int = 50,
+        latency: float = 0.0,
+        kind: str | None = None,
+        seed: int = 0,
+        timings: StageTimings | None = None,
+        raw_messages: dict[str, bytes] | None = None,
+    ) -> None:
+        self.latency = latency
+        self.timings = timings or StageTimings()
+        self.raw_messages: dict[str, bytes] = {}
+        self.internal_dates: dict[str, int] = {}
+        self.history_records: list[dict] = []
+        self.history_id = 100
+        self.page_size = 500
+        self.flaky_ids: set[str] = set()
+        self.fetched_ids: list[str] = []
+        self.round_trips = 0
+        self.profile_reads = 0
+        self.history_reads = 0
+        if raw_messages is None:
+            corpus = generate_corpus(count, seed=seed, kind=kind)
+            # Deliver the corpus last message first, so it lists in corpus order.
+            raw_messages = {f"{i:016x}": corpus[i] for i in reversed(range(count))}
+        for message_id, raw in raw_messages.items():
+            self.add_message(message_id, raw, record_history=False)
+
+    @property
+    def ids(self) -> list[str]:
+        """Message ids in listing order, newest delivery first."""
+        return list(reversed(self.raw_messages))
+
+    def add_message(self, message_id: str, raw: bytes, record_history: bool = True) -> None:
+        """Deliver a new message, recording a messageAdded history entry."""
+        self.raw_messages[message_id] = raw
+        date = message_from_bytes(raw)["Date"]
+        if date:
+            self.internal_dates[message_id] = int(parsedate_to_datetime(date).timestamp() * 1000)
+        else:
+            self.internal_dates[message_id] = int(time.time() * 1000) + len(self.raw_messages)
+        self.history_id += 1
+        if record_history:
+            self.history_records.append(
+                {
+                    "id": str(self.history_id),
+                    "messagesAdded": [{"message": {"id": message_id, "labelIds": ["INBOX"]}}],
+                }
+            )
+
+    def delete_message(self, message_id: str) -> None:
+        """Delete a message, recording a messageDeleted history entry."""
+        del self.raw_messages[message_id]
+        self.history_id += 1
+        self.history_records.append(
+            {"id": str(self.history_id), "messagesDeleted": [{"message": {"id": message_id}}]}
+        )
+
+    def change_label(self, message_id: str, label: str, added: bool = True) -> None:
+        """Add or remove a label, recording a labelAdded or labelRemoved history entry."""
+        self.history_id += 1
+        key = "labelsAdded" if added else "labelsRemoved"
+        labels = [label] if added else ["INBOX"]
+        self.history_records.append(
+            {
+                "id": str(self.history_id),
+                key: [{"message": {"id": message_id, "labelIds": labels}, "labelIds": [label]}],
+            }
+        )
+
+    def message(self, message_id: str, fmt: str) -> dict:
+        """Build the message resource Gmail would return in the given format."""
+        raw = self.raw_messages[message_id]
+        resource: dict[str, Any] = {
+            "id": message_id,
+            "threadId": message_id,
+            "internalDate": str(self.internal_dates[message_id]),
+        }
+        if fmt == "metadata":
+            msg = BytesParser().parsebytes(raw, headersonly=True)
+            resource["snippet"] = raw.split(b"\n\n", 1)[-1][:100].decode(errors="replace")
+            resource["payload"] = {"headers": [{"name": k, "value": v} for k, v in msg.items()]}
+        else:
+            resource["raw"] = base64.urlsafe_b64encode(raw).decode("ascii")
+        return resource
+
+    def users(self) -> "FakeGmailService":
+        """Return the users resource."""
+        return self
+
+    def messages(self) -> _FakeMessages:
+        """Return the messages resource."""
+        return _FakeMessages(self)
+
+    def history(self) -> _FakeHistory:
+        """Return the history resource."""
+        return _FakeHistory(self)
+
+    def getProfile(self, userId: str) -> _FakeRequest:
+        """Return the mailbox profile with the current historyId."""
+        self.profile_reads += 1
+        profile = {
+            "emailAddress": "me@example.com",
+            "historyId": str(self.history_id),
+            "messagesTotal": len(self.raw_messages),
+        }
+        return _FakeRequest(self, "list", lambda: profile)
+
+    def new_batch_http_request(self, callback: Callable[..., None]) -> _FakeBatch:
+        """Start a batch whose sub-requests share one round trip."""
+        return _FakeBatch(self, callback)
+
+
+# --- OpenAI --------------------------------------------------------------------------
+
+
+@dataclass
+class _Usage:
+    prompt_tokens: int
+    completion_tokens: int
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class _FakeStream:
+    def __init__(self, chunks: list[Any], token_delay: float, on_done: Callable[[], None]) -> None:
+        self._chunks = chunks
+        self._token_delay = token_delay
+        self._on_done = on_done
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        for chunk in self._chunks:
+            await asyncio.sleep(self._token_delay)
+            yield chunk
+        self._on_done()
+
+
+class FakeOpenAI:
+    """
+    AsyncOpenAI stand-in whose chat completions wait, then reply with filler text.
+
+    Args:
+        latency: Seconds before the first token.
+        tokens_per_second: Generation speed; 0 returns all tokens at once.
+        reply_words: Length of every reply in words (about one token each).
+        timings: Where completions are recorded under "llm".
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        reply_words: int = 200,
+        timings: StageTimings | None = None,
+    ) -> None:
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.reply_words = reply_words
+        self.timings = timings or StageTimings()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def _reply(self) -> list[str]:
+        sentence = "Your inbox has an update about the project schedule and the budget review."
+        words = (sentence.split() * (self.reply_words // 13 + 1))[: self.reply_words]
+        return [word + " " for word in words]
+
+    async def create(self, **kwargs: Any) -> Any:
+        """Return a completion, or a stream of chunks if stream=True."""
+        started = time.monotonic()
+        await asyncio.sleep(self.latency)
+        tokens = self._reply()
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in kwargs["messages"]) // 4
+        usage = _Usage(prompt_tokens, len(tokens))
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+        if kwargs.get("stream"):
+            chunks = [
+                SimpleNamespace(
+                    choices=[SimpleNamespace(delta=SimpleNamespace(content=t, tool_calls=None))],
+                    usage=None,
+                )
+                for t in tokens
+            ]
+            chunks.append(SimpleNamespace(choices=[], usage=usage))
+            return _FakeStream(
+                chunks, delay, lambda: self.timings.add("llm", started, time.monotonic())
+            )
+        await asyncio.sleep(delay * len(tokens))
+        self.timings.add("llm", started, time.monotonic())
+        message = SimpleNamespace(content="".join(tokens).strip(), tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+# --- Google TTS ----------------------------------------------------------------------
+
+
+class FakeTtsClient:
+    """
+    TextToSpeechClient stand-in returning silent MP3-sized audio after a delay.
+
+    Args:
+        latency: Seconds per synthesize_speech call.
+        bytes_per_char: Audio bytes returned per input character.
+        timings: Where calls are recorded under "tts".
+    """
+
+    def __init__(
+        self, latency: float = 0.0, bytes_per_char: int = 600, timings: StageTimings | None = None
+    ) -> None:
+        self.latency = latency
+        self.bytes_per_char = bytes_per_char
+        self.timings = timings or StageTimings()
+        self.transport = SimpleNamespace(close=lambda: None)
+
+    def synthesize_speech(self, request: dict[str, Any]) -> Any:
+        """Return audio sized by the request text."""
+        with self.timings.measure("tts"):
+            time.sleep(self.latency)
+            size = len(request["input"].text) * self.bytes_per_char
+            return SimpleNamespace(audio_content=b"\xff\xfb" + bytes(size))
+
+    def list_voices(self, request: Any = None) -> Any:
+        """Return no voices; used as the warm-up call."""
+        return SimpleNamespace(voices=[])
+
+
+# --- Telegram ------------------------------------------------------------------------
+
+
+class FakeTelegramMessage:
+    """
+    telegram.Message stand-in recording replies, edits and audio uploads.
+
+    Args:
+        latency: Seconds per Bot API call.
+        timings: Where calls are recorded under "telegram".
+    """
+
+    def __init__(self, latency: float = 0.0, timings: StageTimings | None = None) -> None:
+        self.latency = latency
+        self.timings = timings or StageTimings()
+        self.texts: list[str] = []
+        self.audio_bytes = 0
+        self.text = ""
+        self.from_user = SimpleNamespace(first_name="Bench")
+
+    async def _call(self) -> None:
+        started = time.monotonic()
+        await asyncio.sleep(self.latency)
+        self.timings.add("telegram", started, time.monotonic())
+
+    async def reply_text(self, text: str, **kwargs: Any) -> "FakeTelegramMessage":
+        """Send a new message and return it, so it can be edited later."""
+        await self._call()
+        self.texts.append(text)
+        return self
+
+    async def edit_text(self, text: str, **kwargs: Any) -> "FakeTelegramMessage":
+        """Replace the message text."""
+        await self._call()
+        self.texts.append(text)
+        return self
+
+    async def reply_audio(self, audio: Any, **kwargs: Any) -> "FakeTelegramMessage":
+        """Upload an audio file."""
+        self.audio_bytes += len(audio.read())
+        await self._call()
+        return self
@@ -1,27 +1,58 @@
 import json as _json
-from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
 from typing import Any
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from openai import OpenAI
+from openai import AsyncOpenAI
 
+from voice_agent.client.session_pool import McpSessionPool
+from voice_agent.client.summarizer import EmailSummarizer
 from voice_agent.config import settings
 from voice_agent.server.prompts.email_prompts import (
     EMAIL_ASSISTANT_SYSTEM_PROMPT,
     EMAIL_SUMMARY_AUDIO_PROMPT,
     EMAIL_SUMMARY_PROMPT,
 )
+from voice_agent.utils.audio_spool_util import audio_file_from_content, release_audio
 from voice_agent.utils.logger_util import get_logger
-from voice_agent.utils.openai_utils import get_openai_completion
+from voice_agent.utils.openai_utils import (
+    AssistantMessage,
+    AssistantToolCall,
+    get_openai_completion_async,
+    stream_openai_completion,
+)
+from voice_agent.utils.payload_compaction_util import compact_emails_json
+from voice_agent.utils.summary_cache_util import get_summary_cache, summary_cache_key
+from voice_agent.utils.tracing_util import record_remote_spans, span, trace_meta
+
+
+def _message_ids(emails_json: str) -> list[str] | None:
+    try:
+        emails = _json.loads(emails_json)
+    except ValueError:
+        return None
+    if not isinstance(emails, list):
+        return None
+    ids = [e.get("id") if isinstance(e, dict) else None for e in emails]
+    return [i for i in ids if isinstance(i, str)] if all(isinstance(i, str) for i in ids) else None
 
 
 class VoiceAgentClient:
-    def __init__(self, openai_client: OpenAI | None = None, model: str | None = None):
+    def __init__(
+        self,
+        openai_client: AsyncOpenAI | None = None,
+        model: str | None = None,
+        session_pool: McpSessionPool | None = None,
+    ):
         self.logger = get_logger("VoiceAgentClient")
 
         self.openai_client = openai_client
         self.model = model
+        self.session_pool = session_pool
+        self._summarizer: EmailSummarizer | None = None
 
     @staticmethod
     def _server_params() -> StdioServerParameters:
@@ -43,13 +74,167 @@ class VoiceAgentClient:
                 An initialized ClientSession connected to the MCP server.
         """
         server_params = VoiceAgentClient._server_params()
-        async with (
-            stdio_client(server_params) as (read, write),
-            ClientSession(read, write) as session,
-        ):
-            await session.initialize()
+        async with AsyncExitStack() as stack:
+            with span("mcp.spawn"):
+                read, write = await stack.enter_async_context(stdio_client(server_params))
+                session = await stack.enter_async_context(ClientSession(read, write))
+                await session.initialize()
             yield session
 
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Any]:
+        """
+        Context manager that yields an MCP ClientSession for a single request.
+        Uses a warm session from the pool when one is running, otherwise spawns a server.
+
+        Args:
+                None
+
+        Yields:
+                An initialized ClientSession connected to the MCP server.
+        """
+        if self.session_pool is not None and self.session_pool.started:
+            async with AsyncExitStack() as stack:
+                with span("mcp.checkout"):
+                    session = await stack.enter_async_context(self.session_pool.session())
+                yield session
+        else:
+            async with self.mcp_host_initialized_session() as session:
+                yield session
+
+    @staticmethod
+    async def call_tool(session: Any, name: str, arguments: dict[str, Any]) -> Any:
+        """
+        Call an MCP tool as a span of the current trace.
+
+        The traceparent travels in the request _meta, and the spans the server recorded
+        for the call come back in the result _meta and are added to the trace.
+
+        Args:
+                session: An initialized ClientSession.
+                name: The tool name.
+                arguments: The tool arguments.
+
+        Returns:
+                The CallToolResult.
+        """
+        with span(f"mcp.call_tool.{name}"):
+            result = await session.call_tool(name, arguments=arguments, meta=trace_meta())
+            record_remote_spans(getattr(result, "meta", None))
+        return result
+
+    async def get_mailbox_history_id(self, session: Any) -> str | None:
+        """
+        Read the mailbox's current Gmail history id from the MCP server.
+
+        Args:
+                session: An initialized ClientSession.
+
+        Returns:
+                The history id, or None if the server could not report it.
+        """
+        try:
+            with span("mcp.mailbox_state"):
+                result = await session.read_resource(settings.resources.mailbox_state_uri)
+            return str(_json.loads(result.contents[0].text)["history_id"])
+        except Exception as e:
+            self.logger.error(f"Error reading the mailbox state: {e}")
+            return None
+
+    def compact_emails_payload(
+        self, emails_json: str, drop_fields: list[str] | None = None
+    ) -> tuple[str, str | None]:
+        """
+        Fit a get_emails JSON payload into the configured token budget.
+
+        Args:
+                emails_json: JSON array of emails returned by the MCP server.
+                drop_fields: Email fields to remove entirely (default: none).
+
+        Returns:
+                A tuple of the compacted JSON and a note describing what was cut, or None
+                if nothing was cut.
+        """
+        compaction = settings.compaction
+        payload, report = compact_emails_json(
+            emails_json,
+            token_budget=compaction.token_budget,
+            max_body_tokens=compaction.max_body_tokens,
+            min_body_tokens=compaction.min_body_tokens,
+            drop_fields=drop_fields or [],
+        )
+        if not report.changed:
+            return payload, None
+        self.logger.info(f"Compacted email payload: {report.summary()}")
+        return payload, f"Email payload was compacted to fit the context: {report.summary()}."
+
+    @property
+    def summarizer(self) -> EmailSummarizer:
+        """The map-reduce summarizer sharing this client's OpenAI client and model."""
+        if self.openai_client is None:
+            raise ValueError("OpenAI client must be set for summaries.")
+        if self._summarizer is None or self._summarizer.openai_client is not self.openai_client:
+            self._summarizer = EmailSummarizer(
+                openai_client=self.openai_client,
+                model=self.model or settings.openai.model,
+                chunk_tokens=settings.summarizer.chunk_tokens,
+                max_concurrency=settings.summarizer.max_concurrency,
+            )
+        return self._summarizer
+
+    async def summarize_emails(
+        self,
+        emails_json: str,
+        system_prompt: str,
+        drop_fields: list[str] | None = None,
+        prompt_name: str = "",
+        prompt_args: dict[str, Any] | None = None,
+        on_text: Callable[[str], Awaitable[None]] | None = None,
+    ) -> str:
+        """
+        Summarize a get_emails payload, in chunks when it is too large for one completion.
+        Summaries are cached by message ids, prompt, model and temperature, so a repeat
+        request for an unchanged inbox skips OpenAI entirely.
+
+        Args:
+                emails_json: JSON array of emails returned by the MCP server.
+                system_prompt: The summary prompt (text or audio format).
+                drop_fields: Email fields to remove before summarizing (default: none).
+                prompt_name: Name of the MCP prompt behind system_prompt.
+                prompt_args: Arguments the prompt was rendered with.
+                on_text: Optional callback streamed the summary text as it arrives.
+
+        Returns:
+                The summary text.
+        """
+        summarizer = self.summarizer
+        cache = get_summary_cache()
+        message_ids = _message_ids(emails_json) if cache is not None else None
+        key = None
+        if cache is not None and message_ids is not None:
+            key = summary_cache_key(
+                message_ids,
+                prompt_name,
+                prompt_args or {},
+                summarizer.model,
+                summarizer.temperature,
+                prompt_text=system_prompt,
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                self.logger.info(f"Summary cache hit for {len(message_ids)} emails")
+                return cached
+
+        with span("summarize"):
+            with span("compact"):
+                payload, note = self.compact_emails_payload(emails_json, drop_fields=drop_fields)
+            if note:
+                system_prompt = f"{system_prompt}\n\nNOTE: {note}"
+            summary = await summarizer.summarize(payload, system_prompt, on_text)
+        if cache is not None and key is not None and summary:
+            cache.set(key, summary)
+        return summary
+
     async def get_summary_prompt(
         self, timespan: str = "today", for_audio: bool = False, session: Any = None
     ) -> str:
@@ -64,7 +249,7 @@ class VoiceAgentClient:
                 The email summary prompt string.
         """
         if session is None:
-            async with self.mcp_host_initialized_session() as session:
+            async with self.session() as session:
                 try:
                     prompt_name = (
                         settings.prompts.summary_audio_prompt
@@ -99,114 +284,169 @@ class VoiceAgentClient:
             fallback = EMAIL_SUMMARY_AUDIO_PROMPT if for_audio else EMAIL_SUMMARY_PROMPT
             return fallback.format(timespan=timespan)
 
-    async def run_agentic_query(self, user_query: str) -> tuple[str, str | None]:
+    async def _agent_completion(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        on_text: Callable[[str], Awaitable[None]] | None,
+    ) -> AssistantMessage:
+        model = self.model or settings.openai.model
+        if on_text is not None:
+            return await stream_openai_completion(
+                openai_client=self.openai_client,
+                model=model,
+                messages=messages,
+                on_text=on_text,
+                tools=tools,
+                tool_choice="auto",
+                temperature=0.2,
+            )
+        completion = await get_openai_completion_async(
+            openai_client=self.openai_client,
+            model=model,
+            messages=messages,
+            tools=tools,
+            tool_choice="auto",
+            temperature=0.2,
+        )
+        choice = completion.choices[0].message
+        return AssistantMessage(
+            content=choice.content or "",
+            tool_calls=[
+                AssistantToolCall(tc.id, tc.function.name, tc.function.arguments or "")
+                for tc in choice.tool_calls or []
+            ],
+        )
+
+    async def run_agentic_query(
+        self, user_query: str, on_text: Callable[[str], Awaitable[None]] | None = None
+    ) -> tuple[str, Path | None]:
         """
         Run an agentic query against the MCP server.
 
         Args:
                 user_query: The user's query string.
+                on_text: Optional callback streamed the answer text as it arrives.
 
         Returns:
-                A tuple containing the final response string and optional base64-encoded audio.
+                A tuple containing the final response string and the optional MP3 file,
+                which the caller releases with release_audio once delivered.
         """
         if not self.openai_client or not self.model:
             raise ValueError("OpenAI client and model must be set for agentic queries.")
-        async with self.mcp_host_initialized_session() as session:
-            mcp_tools = await session.list_tools()
-            oa_tools = []
-            for tool in mcp_tools.tools:
-                oa_tools.append(
-                    {
-                        "type": "function",
-                        "function": {
-                            "name": tool.name,
-                            "description": tool.description or f"Execute {tool.name}",
-                            "parameters": tool.inputSchema
-                            if tool.inputSchema
-                            else {
-                                "type": "object",
-                                "properties": {},
-                                "additionalProperties": False,
+        with span("agent.query", model=self.model):
+            async with self.session() as session:
+                mcp_tools = await session.list_tools()
+                oa_tools = []
+                for tool in mcp_tools.tools:
+                    oa_tools.append(
+                        {
+                            "type": "function",
+                            "function": {
+                                "name": tool.name,
+                                "description": tool.description or f"Execute {tool.name}",
+                                "parameters": tool.inputSchema
+                                if tool.inputSchema
+                                else {
+                                    "type": "object",
+                                    "properties": {},
+                                    "additionalProperties": False,
+                                },
                             },
-                        },
-                    }
-                )
+                        }
+                    )
 
-            try:
-                mcp_prompts = await session.list_prompts()
-                system_prompt_obj = None
-                for prompt in mcp_prompts.prompts:
-                    if prompt.name == settings.prompts.assistant_prompt:
-                        prompt_result = await session.get_prompt(prompt.name)
-                        if prompt_result.messages:
-                            system_prompt_obj = prompt_result.messages[0].content.text
-                        break
-                system_msg = (
-                    system_prompt_obj if system_prompt_obj else EMAIL_ASSISTANT_SYSTEM_PROMPT
-                )
-            except Exception:
-                system_msg = EMAIL_ASSISTANT_SYSTEM_PROMPT
-
-            messages = [
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user_query},
-            ]
-
-            audio_b64 = None
-            for _ in range(4):
-                completion = get_openai_completion(
-                    openai_client=self.openai_client,
-                    model=self.model,
-                    messages=messages,
-                    tools=oa_tools,
-                    tool_choice="auto",
-                    temperature=0.2,
-                )
-                choice = completion.choices[0].message  # type: ignore
-                if hasattr(choice, "tool_calls") and choice.tool_calls:
-                    messages.append(
-                        {
-                            "role": "assistant",
-                            "content": getattr(choice, "content", "") or "",
-                            "tool_calls": [
+                try:
+                    mcp_prompts = await session.list_prompts()
+                    system_prompt_obj = None
+                    for prompt in mcp_prompts.prompts:
+                        if prompt.name == settings.prompts.assistant_prompt:
+                            prompt_result = await session.get_prompt(prompt.name)
+                            if prompt_result.messages:
+                                system_prompt_obj = prompt_result.messages[0].content.text
+                            break
+                    system_msg = (
+                        system_prompt_obj if system_prompt_obj else EMAIL_ASSISTANT_SYSTEM_PROMPT
+                    )
+                except Exception:
+                    system_msg = EMAIL_ASSISTANT_SYSTEM_PROMPT
+
+                messages = [
+                    {"role": "system", "content": system_msg},
+                    {"role": "user", "content": user_query},
+                ]
+
+                audio_path: Path | None = None
+                delivered = False
+                try:
+                    # Room for list, body fetch and TTS tool rounds before the final answer
+                    for _ in range(6):
+                        choice = await self._agent_completion(messages, oa_tools, on_text)
+                        if choice.tool_calls:
+                            messages.append(
                                 {
-                                    "id": tc.id,
-                                    "type": "function",
-                                    "function": {
-                                        "name": tc.function.name,
-                                        "arguments": tc.function.arguments,
-                                    },
+                                    "role": "assistant",
+                                    "content": choice.content,
+                                    "tool_calls": [
+                                        {
+                                            "id": tc.id,
+                                            "type": "function",
+                                            "function": {
+                                                "name": tc.name,
+                                                "arguments": tc.arguments,
+                                            },
+                                        }
+                                        for tc in choice.tool_calls
+                                    ],
                                 }
-                                for tc in choice.tool_calls
-                            ],
-                        }
-                    )
-                    for tc in choice.tool_calls:
-                        tool_name = tc.function.name
-                        try:
-                            args = _json.loads(tc.function.arguments or "{}")
-                        except Exception:
-                            args = {}
-                        try:
-                            tool_result = await session.call_tool(tool_name, arguments=args)
-                            result_text = (
-                                tool_result.content[0].text
-                                if getattr(tool_result, "content", None)
-                                else str(tool_result)
                             )
-                            if tool_name == "tts_instagram_audio":
-                                audio_b64 = result_text
-                                result_text = "[Audio generated successfully]"
-                        except Exception as e:
-                            result_text = f"ERROR: {str(e)}"
-                        messages.append(
-                            {
-                                "role": "tool",
-                                "tool_call_id": tc.id,
-                                "name": tool_name,
-                                "content": result_text,
-                            }
-                        )
-                    continue
-                return (getattr(choice, "content", "") or "", audio_b64)
-            return ("Sorry, I couldn't complete the request.", None)
+                            for tc in choice.tool_calls:
+                                tool_name = tc.name
+                                try:
+                                    args = _json.loads(tc.arguments or "{}")
+                                except Exception:
+                                    args = {}
+                                try:
+                                    tool_result = await self.call_tool(session, tool_name, args)
+                                    if tool_name == settings.tools.tts_instagram_audio_tool:
+                                        if audio_path is not None:
+                                            release_audio(audio_path)
+                                        audio_path = audio_file_from_content(tool_result.content)
+                                        result_text = (
+                                            "[Audio generated successfully]"
+                                            if audio_path is not None
+                                            else "ERROR: the tool returned no audio"
+                                        )
+                                    else:
+                                        result_text = (
+                                            tool_result.content[0].text
+                                            if getattr(tool_result, "content", None)
+                                            else str(tool_result)
+                                        )
+                                    if tool_name in (
+                                        settings.tools.get_emails_tool,
+                                        settings.tools.get_email_body_tool,
+                                    ):
+                                        result_text, note = self.compact_emails_payload(result_text)
+                                        result_text = await self.summarizer.condense(result_text)
+                                        if note:
+                                            result_text = f"{result_text}\n\nNOTE: {note}"
+                                except Exception as e:
+                                    result_text = f"ERROR: {str(e)}"
+                                messages.append(
+                                    {
+                                        "role": "tool",
+                                        "tool_call_id": tc.id,
+                                        "name": tool_name,
+                                        "content": result_text,
+                                    }
+                                )
+                            continue
+                        delivered = True
+                        return (choice.content, audio_path)
+                    return ("Sorry, I couldn't complete the request.", None)
+                finally:
+                    # Errors after the TTS call (e.g. in a follow-up completion) must not
+                    # leave the spooled audio behind until the stale cleanup.
+                    if audio_path is not None and not delivered:
+                        release_audio(audio_path)
@@ -0,0 +1,243 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
+from typing import Any
+
+from voice_agent.utils.logger_util import get_logger
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[Any]]
+
+
+class _PooledServer:
+    """A single warm MCP server process and the session connected to it."""
+
+    def __init__(self, slot_id: int, session_factory: SessionFactory) -> None:
+        self.slot_id = slot_id
+        self.session: Any = None
+        self.last_healthy = 0.0
+        self._session_factory = session_factory
+        self._task: asyncio.Task | None = None
+        self._ready: asyncio.Event = asyncio.Event()
+        self._stop: asyncio.Event = asyncio.Event()
+        self._error: BaseException | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._task is not None and not self._task.done() and self.session is not None
+
+    async def _serve(self) -> None:
+        # The stdio transport uses anyio task groups, so the session has to be
+        # entered and exited from the same task. Keep it open until told to stop.
+        try:
+            async with self._session_factory() as session:
+                self.session = session
+                self.last_healthy = time.monotonic()
+                self._ready.set()
+                await self._stop.wait()
+        except BaseException as e:
+            self._error = e
+            raise
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def start(self, timeout: float) -> None:
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._error = None
+        self._task = asyncio.create_task(self._serve(), name=f"mcp-pool-{self.slot_id}")
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.CancelledError:
+            self._task.cancel()
+            raise
+        except TimeoutError:
+            await self.stop(timeout)
+            raise RuntimeError(
+                f"MCP server {self.slot_id} did not start within {timeout}s"
+            ) from None
+        if not self.alive:
+            raise RuntimeError(f"MCP server {self.slot_id} failed to start: {self._error}")
+
+    async def stop(self, timeout: float) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
+        except BaseException:
+            self._task.cancel()
+            with suppress(BaseException):
+                await self._task
+        self._task = None
+        self.session = None
+
+    async def ping(self, timeout: float) -> bool:
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout)
+        except Exception:
+            return False
+        self.last_healthy = time.monotonic()
+        return True
+
+
+class McpSessionPool:
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        size: int = 2,
+        health_check_interval: float = 30.0,
+        ping_timeout: float = 5.0,
+        start_timeout: float = 30.0,
+        checkout_timeout: float = 60.0,
+    ) -> None:
+        if size < 1:
+            raise ValueError("MCP session pool size must be at least 1")
+        self.logger = get_logger("McpSessionPool")
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self.start_timeout = start_timeout
+        self.checkout_timeout = checkout_timeout
+        self._servers = [_PooledServer(i, session_factory) for i in range(size)]
+        self._idle: asyncio.Queue[_PooledServer] = asyncio.Queue()
+        self._health_task: asyncio.Task | None = None
+        self._respawns: set[asyncio.Task] = set()
+        self._started = False
+
+    @property
+    def started(self) -> bool:
+        """Whether the pool has been started and can hand out sessions."""
+        return self._started
+
+    async def start(self) -> None:
+        """
+        Spawn the warm MCP server processes and start the background health checks.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        if self._started:
+            return
+        self._idle = asyncio.Queue()
+        for server in self._servers:
+            try:
+                await server.start(self.start_timeout)
+            except Exception as e:
+                # Keep the slot; it will be respawned lazily on checkout.
+                self.logger.error(f"Error starting MCP server {server.slot_id}: {e}")
+            self._idle.put_nowait(server)
+        self._started = True
+        if self.health_check_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop(), name="mcp-pool-health")
+        self.logger.info(f"Started MCP session pool with {self.size} server(s)")
+
+    async def close(self) -> None:
+        """
+        Stop the health checks and shut down every pooled MCP server.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        if not self._started:
+            return
+        self._started = False
+        if self._health_task is not None:
+            self._health_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._health_task
+            self._health_task = None
+        for task in list(self._respawns):
+            task.cancel()
+        await asyncio.gather(*self._respawns, return_exceptions=True)
+        await asyncio.gather(
+            *(server.stop(self.ping_timeout) for server in self._servers), return_exceptions=True
+        )
+        self.logger.info("Closed MCP session pool")
+
+    async def _respawn(self, server: _PooledServer) -> None:
+        self.logger.warning(f"Respawning MCP server {server.slot_id}")
+        await server.stop(self.ping_timeout)
+        await server.start(self.start_timeout)
+
+    async def _ensure_healthy(self, server: _PooledServer) -> None:
+        stale = time.monotonic() - server.last_healthy > self.health_check_interval
+        if server.alive and (not stale or await server.ping(self.ping_timeout)):
+            return
+        await self._respawn(server)
+
+    async def _respawn_in_background(self, server: _PooledServer) -> None:
+        try:
+            await self._respawn(server)
+        except Exception as e:
+            self.logger.error(f"Error respawning MCP server {server.slot_id}: {e}")
+        finally:
+            if self._started:
+                self._idle.put_nowait(server)
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            # Only check servers that are idle; checked-out ones are in use. Take them
+            # one at a time so the others stay available for checkout meanwhile.
+            checked: set[int] = set()
+            for _ in range(self._idle.qsize()):
+                try:
+                    server = self._idle.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if server.slot_id in checked:
+                    self._idle.put_nowait(server)
+                    continue
+                checked.add(server.slot_id)
+                if await server.ping(self.ping_timeout):
+                    self._idle.put_nowait(server)
+                    continue
+                # A respawn can take start_timeout; do not hold up the healthy servers.
+                task = asyncio.create_task(
+                    self._respawn_in_background(server), name=f"mcp-pool-respawn-{server.slot_id}"
+                )
+                self._respawns.add(task)
+                task.add_done_callback(self._respawns.discard)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Any]:
+        """
+        Check out a warm, initialized MCP ClientSession for the duration of a request.
+
+        Args:
+                None
+
+        Yields:
+                An initialized ClientSession owned by the pool.
+        """
+        if not self._started:
+            raise RuntimeError("MCP session pool is not started.")
+        try:
+            server = await asyncio.wait_for(self._idle.get(), timeout=self.checkout_timeout)
+        except TimeoutError:
+            raise RuntimeError(
+                f"No MCP session available within {self.checkout_timeout}s"
+            ) from None
+        try:
+            await self._ensure_healthy(server)
+            try:
+                yield server.session
+            except Exception:
+                # Tool and prompt errors come from a healthy server; only respawn
+                # when the failure took the transport down with it.
+                if not await server.ping(self.ping_timeout):
+                    await self._respawn(server)
+                raise
+        finally:
+            if self._started:
+                self._idle.put_nowait(server)
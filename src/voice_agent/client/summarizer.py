@@ -0,0 +1,186 @@
+"""Map-reduce summarization of email windows that are too large for one completion."""
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from voice_agent.server.prompts.email_prompts import EMAIL_CHUNK_SUMMARY_PROMPT, EMAIL_REDUCE_NOTE
+from voice_agent.utils.logger_util import get_logger
+from voice_agent.utils.openai_utils import (
+    get_openai_completion_async,
+    stream_openai_completion,
+)
+from voice_agent.utils.payload_compaction_util import estimate_tokens
+
+_NOTES_SEPARATOR = "\n\n"
+
+
+def chunk_emails(emails: list[dict], chunk_tokens: int) -> list[list[dict]]:
+    """
+    Split emails into consecutive chunks of at most chunk_tokens estimated tokens.
+
+    An email larger than chunk_tokens gets a chunk of its own.
+
+    Args:
+            emails: Email dicts as returned by get_emails.
+            chunk_tokens: Estimated token budget of one chunk's JSON.
+
+    Returns:
+            The chunks, in the original email order.
+    """
+    chunks: list[list[dict]] = []
+    current: list[dict] = []
+    current_tokens = 2
+    for email in emails:
+        tokens = estimate_tokens(json.dumps(email, ensure_ascii=False)) + 2
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 2
+        current.append(email)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _group_notes(notes: list[str], chunk_tokens: int) -> list[list[str]]:
+    groups: list[list[str]] = []
+    current: list[str] = []
+    current_tokens = 0
+    for note in notes:
+        tokens = estimate_tokens(note + _NOTES_SEPARATOR)
+        if current and current_tokens + tokens > chunk_tokens:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(note)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _join_notes(notes: list[str]) -> str:
+    if len(notes) == 1:
+        return notes[0]
+    return _NOTES_SEPARATOR.join(
+        f"BATCH {i} of {len(notes)}:\n{note}" for i, note in enumerate(notes, start=1)
+    )
+
+
+class EmailSummarizer:
+    def __init__(
+        self,
+        openai_client: Any,
+        model: str,
+        chunk_tokens: int,
+        max_concurrency: int,
+        temperature: float = 0.2,
+    ) -> None:
+        self.logger = get_logger("EmailSummarizer")
+
+        self.openai_client = openai_client
+        self.model = model
+        self.chunk_tokens = chunk_tokens
+        self.temperature = temperature
+        # Shared by every summary in flight so concurrent commands respect one limit.
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _complete(
+        self,
+        system_prompt: str,
+        content: str,
+        on_text: Callable[[str], Awaitable[None]] | None = None,
+    ) -> str:
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": content},
+        ]
+        async with self._semaphore:
+            if on_text is not None:
+                message = await stream_openai_completion(
+                    openai_client=self.openai_client,
+                    model=self.model,
+                    messages=messages,
+                    on_text=on_text,
+                    temperature=self.temperature,
+                )
+                return message.content
+            completion = await get_openai_completion_async(
+                openai_client=self.openai_client,
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+            )
+        return completion.choices[0].message.content or ""
+
+    async def _map(self, inputs: list[str]) -> list[str]:
+        return list(
+            await asyncio.gather(
+                *(self._complete(EMAIL_CHUNK_SUMMARY_PROMPT, text) for text in inputs)
+            )
+        )
+
+    async def _notes(self, emails_json: str) -> list[str] | None:
+        try:
+            emails = json.loads(emails_json)
+        except ValueError:
+            return None
+        if not isinstance(emails, list) or len(emails) < 2:
+            return None
+        if estimate_tokens(emails_json) <= self.chunk_tokens:
+            return None
+
+        chunks = chunk_emails(emails, self.chunk_tokens)
+        self.logger.info(f"Summarizing {len(emails)} emails in {len(chunks)} chunks")
+        notes = await self._map([json.dumps(chunk, ensure_ascii=False) for chunk in chunks])
+
+        # Combine notes level by level until they fit a single completion.
+        while len(notes) > 1 and estimate_tokens(_join_notes(notes)) > self.chunk_tokens:
+            groups = _group_notes(notes, self.chunk_tokens)
+            if len(groups) == len(notes):
+                break
+            self.logger.info(f"Combining {len(notes)} partial summaries into {len(groups)}")
+            notes = await self._map([_join_notes(group) for group in groups])
+        return notes
+
+    async def summarize(
+        self,
+        emails_json: str,
+        system_prompt: str,
+        on_text: Callable[[str], Awaitable[None]] | None = None,
+    ) -> str:
+        """
+        Summarize an email payload with the given summary prompt.
+
+        Payloads within chunk_tokens go out in a single completion. Larger ones are
+        split into chunks that are condensed concurrently, and the final prompt runs
+        over the combined notes, so wall time follows chunk latency, not input size.
+
+        Args:
+                emails_json: JSON array of emails as returned by get_emails.
+                system_prompt: The summary prompt (text or audio format) for the final step.
+                on_text: Optional callback streamed the final summary text as it arrives.
+
+        Returns:
+                The summary text.
+        """
+        notes = await self._notes(emails_json)
+        if notes is None:
+            return await self._complete(system_prompt, emails_json, on_text)
+        return await self._complete(
+            f"{system_prompt}\n{EMAIL_REDUCE_NOTE}", _join_notes(notes), on_text
+        )
+
+    async def condense(self, emails_json: str) -> str:
+        """
+        Condense an email payload into notes that fit chunk_tokens, for the agent loop.
+
+        Args:
+                emails_json: JSON array of emails as returned by get_emails.
+
+        Returns:
+                The payload unchanged if it already fits, otherwise notes on every email.
+        """
+        notes = await self._notes(emails_json)
+        return emails_json if notes is None else _join_notes(notes)
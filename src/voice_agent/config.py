@@ -1,4 +1,4 @@
-from typing import ClassVar
+from typing import ClassVar, Literal
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -6,11 +6,17 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class TelegramBotConfig(BaseModel):
     bot_token: str = Field(default="", description="Telegram bot token")
+    stream_edit_interval: float = Field(
+        default=1.0, description="Minimum seconds between edits of a streamed reply"
+    )
 
 
 class OpenAIConfig(BaseModel):
     api_key: str = Field(default="", description="OpenAI API key")
     model: str = Field(default="gpt-4o-mini", description="OpenAI model")
+    stream: bool = Field(
+        default=True, description="Stream text replies to Telegram as tokens arrive"
+    )
 
 
 class GoogleConfig(BaseModel):
@@ -34,6 +40,141 @@ class GoogleConfig(BaseModel):
     token_uri: str = Field(
         default="https://oauth2.googleapis.com/token", description="OAuth2 token endpoint"
     )
+    token_refresh_margin: int = Field(
+        default=300, description="Seconds before expiry at which the Gmail token is refreshed"
+    )
+
+
+class GmailConfig(BaseModel):
+    batch_size: int = Field(
+        default=25, description="Messages fetched per Gmail batch HTTP request (max 100)"
+    )
+    max_retries: int = Field(
+        default=3, description="Retries for a message that failed inside a batch request"
+    )
+    max_total_results: int = Field(
+        default=500, description="Hard cap on emails fetched by one get_emails call"
+    )
+    max_concurrency: int = Field(
+        default=2,
+        description=(
+            "Gmail batch requests in flight at once. Each message get costs 5 of the "
+            "250 per-user quota units per second, so 2 x 25 messages stays within quota."
+        ),
+    )
+
+
+class StoreConfig(BaseModel):
+    enabled: bool = Field(
+        default=True, description="Keep parsed emails in a local store synced by history id"
+    )
+    path: str = Field(default=".cache/emails.sqlite3", description="Path of the SQLite email store")
+
+
+class ParserConfig(BaseModel):
+    html_engine: Literal["lxml", "bs4"] = Field(
+        default="lxml",
+        description=(
+            "HTML-to-text engine: 'lxml' walks the tree directly and skips hidden content, "
+            "falling back to 'bs4' (BeautifulSoup) on failure"
+        ),
+    )
+    max_html_chars: int = Field(
+        default=1_000_000, description="HTML characters of one email considered for its text"
+    )
+    max_html_seconds: float = Field(
+        default=0.5, description="Time budget for extracting the text of one HTML email"
+    )
+    pool_workers: int = Field(
+        default=0,
+        description=(
+            "Worker processes parsing raw emails in each MCP server (0 shares the CPUs "
+            "between the MCP_POOL__SIZE servers, 1 parses in-process)"
+        ),
+    )
+    pool_min_batch: int = Field(
+        default=8, description="Smallest batch of emails worth sending to the parse workers"
+    )
+    pool_chunk_size: int = Field(
+        default=4, description="Emails sent to a parse worker per round trip"
+    )
+
+
+class CompactionConfig(BaseModel):
+    token_budget: int = Field(
+        default=48000,
+        description=(
+            "Estimated token budget for email JSON handed to the summarizer; "
+            "payloads above summarizer.chunk_tokens are summarized in chunks"
+        ),
+    )
+    max_body_tokens: int = Field(
+        default=600, description="Estimated token cap for a single email body"
+    )
+    min_body_tokens: int = Field(
+        default=60,
+        description="Size low-priority bodies are shrunk to before emails are omitted",
+    )
+    summary_drop_fields: list[str] = Field(
+        default=["id"], description="Email fields removed from the quick summary payloads"
+    )
+
+
+class SummarizerConfig(BaseModel):
+    chunk_tokens: int = Field(
+        default=6000,
+        description="Estimated tokens of email JSON summarized in one completion",
+    )
+    max_concurrency: int = Field(
+        default=4, description="Chunk summaries requested from OpenAI at once"
+    )
+
+
+class SummaryCacheConfig(BaseModel):
+    backend: Literal["memory", "disk", "none"] = Field(
+        default="memory", description="Where summaries are cached ('none' disables the cache)"
+    )
+    ttl: float = Field(default=21600.0, description="Seconds a cached summary stays valid")
+    max_entries: int = Field(
+        default=256, description="Cached summaries kept before least recently used are evicted"
+    )
+    path: str = Field(
+        default=".cache/summaries.sqlite3", description="Path of the on-disk summary cache"
+    )
+
+
+class TtsConfig(BaseModel):
+    max_chunk_bytes: int = Field(
+        default=1500,
+        description=(
+            "UTF-8 bytes of text per synthesis request, split at sentence boundaries "
+            "(Google TTS rejects inputs over 5000 bytes)"
+        ),
+    )
+    max_concurrency: int = Field(default=4, description="Text chunks synthesized at once")
+    warm_up: bool = Field(
+        default=True, description="Open the TTS channel in the background at server startup"
+    )
+    audio_transfer: Literal["file", "inline"] = Field(
+        default="file",
+        description=(
+            "How audio reaches the bot: 'file' spools the MP3 and returns a file link "
+            "(server and bot on one host), 'inline' embeds it as base64 audio content"
+        ),
+    )
+    spool_dir: str = Field(
+        default=".cache/audio", description="Directory for audio handed from server to bot"
+    )
+    spool_max_age: float = Field(
+        default=3600.0, description="Seconds after which uncollected spooled audio is deleted"
+    )
+    cache_enabled: bool = Field(
+        default=True, description="Reuse synthesized audio for text that was spoken before"
+    )
+    cache_dir: str = Field(default=".cache/tts", description="Directory of the audio cache")
+    cache_max_bytes: int = Field(
+        default=200 * 1024 * 1024, description="Size of the audio cache before LRU eviction"
+    )
 
 
 class ToolConfig(BaseModel):
@@ -41,6 +182,14 @@ class ToolConfig(BaseModel):
         default="get_emails",
         description=(
             "Fetch emails from Gmail for a specified number of days. "
+            "Returns JSON array of emails with id, from, subject, date, and body fields. "
+            "With include_body=False returns a snippet instead of the body."
+        ),
+    )
+    get_email_body_tool: str = Field(
+        default="get_email_body",
+        description=(
+            "Fetch the full body of specific emails by id. "
             "Returns JSON array of emails with id, from, subject, date, and body fields."
         ),
     )
@@ -50,6 +199,13 @@ class ToolConfig(BaseModel):
     )
 
 
+class ResourceConfig(BaseModel):
+    mailbox_state_uri: str = Field(
+        default="mailbox://state",
+        description="Resource with the mailbox's current Gmail history id",
+    )
+
+
 class PromptConfig(BaseModel):
     assistant_prompt: str = Field(
         default="email_assistant_system_prompt",
@@ -65,12 +221,101 @@ class PromptConfig(BaseModel):
     )
 
 
+class McpPoolConfig(BaseModel):
+    size: int = Field(
+        default=2,
+        description="Number of warm MCP server processes kept by the bot (0 spawns per request)",
+    )
+    health_check_interval: float = Field(
+        default=30.0, description="Seconds between pings of idle pooled MCP servers"
+    )
+    ping_timeout: float = Field(default=5.0, description="Seconds to wait for an MCP ping reply")
+    start_timeout: float = Field(
+        default=30.0, description="Seconds to wait for a pooled MCP server to initialize"
+    )
+    checkout_timeout: float = Field(
+        default=60.0, description="Seconds to wait for a free pooled MCP session"
+    )
+
+
+class SchedulerConfig(BaseModel):
+    max_in_flight: int = Field(
+        default=2,
+        description="Bot requests handled at once (0 lets the Telegram library run them directly)",
+    )
+    max_queue: int = Field(
+        default=20, description="Requests waiting for a worker before new ones are turned away"
+    )
+    chat_rate: float = Field(
+        default=0.2, description="Sustained requests per second allowed per chat (0 = no limit)"
+    )
+    chat_burst: int = Field(default=3, description="Requests a chat can send at once")
+    global_rate: float = Field(
+        default=1.0, description="Requests per second started across all chats (0 = no limit)"
+    )
+    global_burst: int = Field(default=5, description="Requests started at once across all chats")
+    retry_after: float = Field(
+        default=30.0, description="Seconds users are told to wait when the queue is full"
+    )
+
+
+class DigestConfig(BaseModel):
+    enabled: bool = Field(
+        default=False,
+        description="Precompute today's digest in the background and serve it while fresh",
+    )
+    interval: float = Field(default=900.0, description="Seconds between digest refreshes")
+    first_delay: float = Field(
+        default=10.0, description="Seconds after startup before the first digest refresh"
+    )
+    audio: bool = Field(default=False, description="Also precompute the audio digest")
+    audio_dir: str = Field(
+        default=".cache/digests", description="Directory of the precomputed audio digests"
+    )
+
+
+class MailboxWatchConfig(BaseModel):
+    enabled: bool = Field(
+        default=True,
+        description="Poll the mailbox historyId in the server so unchanged mailboxes skip Gmail",
+    )
+    poll_interval: float = Field(default=10.0, description="Seconds between historyId checks")
+    max_age: float = Field(
+        default=30.0,
+        description="Seconds a check is trusted; older ones make requests ask Gmail again",
+    )
+    max_changes: int = Field(
+        default=100, description="Recent change sets kept for stores that are behind"
+    )
+
+
+class MetricsConfig(BaseModel):
+    enabled: bool = Field(
+        default=False, description="Serve Prometheus metrics from the bot process"
+    )
+    host: str = Field(default="127.0.0.1", description="Interface the metrics endpoint binds")
+    port: int = Field(default=9464, description="Port of the /metrics endpoint")
+
+
 class Settings(BaseSettings):
     telegram: TelegramBotConfig = Field(default_factory=TelegramBotConfig)
     openai: OpenAIConfig = Field(default_factory=OpenAIConfig)
     google: GoogleConfig = Field(default_factory=GoogleConfig)
+    gmail: GmailConfig = Field(default_factory=GmailConfig)
+    store: StoreConfig = Field(default_factory=StoreConfig)
+    parser: ParserConfig = Field(default_factory=ParserConfig)
+    compaction: CompactionConfig = Field(default_factory=CompactionConfig)
+    summarizer: SummarizerConfig = Field(default_factory=SummarizerConfig)
+    summary_cache: SummaryCacheConfig = Field(default_factory=SummaryCacheConfig)
+    tts: TtsConfig = Field(default_factory=TtsConfig)
     tools: ToolConfig = Field(default_factory=ToolConfig)
+    resources: ResourceConfig = Field(default_factory=ResourceConfig)
     prompts: PromptConfig = Field(default_factory=PromptConfig)
+    mcp_pool: McpPoolConfig = Field(default_factory=McpPoolConfig)
+    scheduler: SchedulerConfig = Field(default_factory=SchedulerConfig)
+    digest: DigestConfig = Field(default_factory=DigestConfig)
+    mailbox_watch: MailboxWatchConfig = Field(default_factory=MailboxWatchConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
 
     model_config: ClassVar[SettingsConfigDict] = SettingsConfigDict(
         env_file=[".env"],
@@ -1,32 +1,321 @@
-import base64
-import io
-
-from openai import OpenAI
+import functools
+import hashlib
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from openai import AsyncOpenAI
 from telegram import Update
 from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
 
 from voice_agent.client.agent import VoiceAgentClient
+from voice_agent.client.session_pool import McpSessionPool
 from voice_agent.config import settings
+from voice_agent.host.daily_digest import DigestKind, DigestStore
+from voice_agent.host.request_scheduler import RequestRejected, RequestScheduler
+from voice_agent.host.single_flight import SingleFlight
+from voice_agent.host.streaming_reply import StreamingReply
+from voice_agent.utils.audio_spool_util import audio_file_from_content, release_audio
 from voice_agent.utils.logger_util import get_logger
-from voice_agent.utils.openai_utils import get_openai_completion
+from voice_agent.utils.metrics_util import start_metrics_server
+from voice_agent.utils.tracing_util import span
+
+type UpdateHandler = Callable[[Update, ContextTypes.DEFAULT_TYPE], Coroutine[Any, Any, None]]
+type Handler = Callable[
+    ["EmailSummaryBot", Update, ContextTypes.DEFAULT_TYPE], Coroutine[Any, Any, None]
+]
+
+
+def _traced(name: str) -> Callable[[Handler], Handler]:
+    # Every command is the root span of its trace; the stages it runs become children.
+    def decorator(handler: Handler) -> Handler:
+        @functools.wraps(handler)
+        async def wrapper(
+            self: "EmailSummaryBot", update: Update, context: ContextTypes.DEFAULT_TYPE
+        ) -> None:
+            with span(name):
+                await handler(self, update, context)
+
+        return wrapper
+
+    return decorator
+
+
+def _account_key() -> str:
+    # The bot serves the account its Gmail token belongs to; hashed so keys can be logged.
+    return hashlib.sha256((settings.google.gmail_token or "").encode()).hexdigest()[:12]
+
+
+def _release_answer_audio(result: tuple[str, Path | None]) -> None:
+    if result[1] is not None:
+        release_audio(result[1])
 
 
 class EmailSummaryBot:
     def __init__(self, telegram_token: str, openai_api_key: str, openai_model: str) -> None:
+        pool_config = settings.mcp_pool
+        self.session_pool = (
+            McpSessionPool(
+                session_factory=VoiceAgentClient.mcp_host_initialized_session,
+                size=pool_config.size,
+                health_check_interval=pool_config.health_check_interval,
+                ping_timeout=pool_config.ping_timeout,
+                start_timeout=pool_config.start_timeout,
+                checkout_timeout=pool_config.checkout_timeout,
+            )
+            if pool_config.size > 0
+            else None
+        )
+        scheduler_config = settings.scheduler
+        self.scheduler = (
+            RequestScheduler(
+                max_in_flight=scheduler_config.max_in_flight,
+                max_queue=scheduler_config.max_queue,
+                chat_rate=scheduler_config.chat_rate,
+                chat_burst=scheduler_config.chat_burst,
+                global_rate=scheduler_config.global_rate,
+                global_burst=scheduler_config.global_burst,
+                retry_after=scheduler_config.retry_after,
+            )
+            if scheduler_config.max_in_flight > 0
+            else None
+        )
         self.voice_agent_client = VoiceAgentClient(
-            openai_client=OpenAI(api_key=openai_api_key) if openai_api_key else None,
+            openai_client=AsyncOpenAI(api_key=openai_api_key) if openai_api_key else None,
             model=openai_model,
+            session_pool=self.session_pool,
         )
         self.telegram_token = telegram_token
+        self.metrics_server: Any = None
+        # Identical requests running at the same time share one fetch and completion.
+        self.in_flight = SingleFlight()
+        self.digests = DigestStore(Path(settings.digest.audio_dir))
         self.logger = get_logger("EmailSummaryBot")
 
     def _assert_openai_configured(self) -> None:
         if self.voice_agent_client.openai_client is None:
             raise RuntimeError("OpenAI is not configured. Set OPENAI_API_KEY.")
 
+    async def _post_init(self, app: Application) -> None:
+        if settings.metrics.enabled:
+            self.metrics_server = start_metrics_server(settings.metrics.host, settings.metrics.port)
+        if self.session_pool is not None:
+            await self.session_pool.start()
+        if self.scheduler is not None:
+            await self.scheduler.start()
+
+    async def _post_shutdown(self, app: Application) -> None:
+        if self.scheduler is not None:
+            await self.scheduler.close()
+        if self.session_pool is not None:
+            await self.session_pool.close()
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server = None
+
+    def _scheduled(self, handler: UpdateHandler) -> UpdateHandler:
+        # Hand the request to the worker pool so a burst queues instead of spawning
+        # servers and API calls all at once, and tell the user where they are in line.
+        scheduler = self.scheduler
+        if scheduler is None:
+            return handler
+
+        @functools.wraps(handler)
+        async def submit(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+            chat_id = update.effective_chat.id if update.effective_chat else None
+            try:
+                position = scheduler.submit(chat_id, lambda: handler(update, context))
+            except RequestRejected as e:
+                if e.reason == "rate_limited":
+                    text = f"🚦 Too many requests. Please try again in {e.retry_after:.0f}s."
+                else:
+                    text = "🚦 I'm busy right now. Please try again in a little while."
+                if update.message:
+                    await update.message.reply_text(text)
+                return
+            if position and update.message:
+                await update.message.reply_text(f"🕒 Queued at position {position}...")
+
+        return submit
+
+    def _streaming_reply(self, update: Update, placeholder: Any = None) -> StreamingReply | None:
+        if not update.message:
+            return None
+        return StreamingReply(
+            update.message,
+            placeholder=placeholder if settings.openai.stream else None,
+            edit_interval=settings.telegram.stream_edit_interval,
+        )
+
+    async def _send_audio(
+        self, update: Update, audio_path: Path, filename: str, caption: str
+    ) -> None:
+        # Stream the spooled file straight to Telegram. The file may be shared by
+        # coalesced requests, so the single-flight layer deletes it after the last send.
+        if update.message:
+            with span("telegram.send_audio"), audio_path.open("rb") as audio:
+                await update.message.reply_audio(audio=audio, filename=filename, caption=caption)
+            self.logger.info("Audio sent successfully")
+        else:
+            self.logger.warning("No message found in update; cannot send audio.")
+
+    @staticmethod
+    def _request_key(command: str, timespan: str, fmt: str) -> tuple[str, str, str, str]:
+        return (command, " ".join(timespan.lower().split()), fmt, _account_key())
+
+    async def _summarize(
+        self,
+        system_prompt: str,
+        emails_json: str,
+        prompt_name: str,
+        timespan: str,
+        reply: StreamingReply | None = None,
+    ) -> str:
+        return await self.voice_agent_client.summarize_emails(
+            emails_json,
+            system_prompt,
+            drop_fields=settings.compaction.summary_drop_fields,
+            prompt_name=prompt_name,
+            prompt_args={"timespan": timespan},
+            on_text=reply.update if reply is not None and settings.openai.stream else None,
+        )
+
     async def _build_summary_prompt(self, timespan: str) -> str:
         return await self.voice_agent_client.get_summary_prompt(timespan)
 
+    async def _today_summary(
+        self, session: Any, for_audio: bool, reply: StreamingReply | None = None
+    ) -> str:
+        if for_audio:
+            prompt_name = settings.prompts.summary_audio_prompt
+            fallback_prompt = "Summarize today's emails for audio."
+        else:
+            prompt_name = settings.prompts.summary_prompt
+            fallback_prompt = "Summarize today's emails."
+
+        self.logger.info("Calling MCP tool: get_emails with days=0 (today)")
+        emails_result = await self.voice_agent_client.call_tool(session, "get_emails", {"days": 0})
+        emails_json = (
+            emails_result.content[0].text
+            if hasattr(emails_result, "content")
+            else str(emails_result)
+        )
+        self.logger.info(f"Received {len(emails_json)} chars of email JSON")
+
+        self.logger.info(f"Building summary prompt {prompt_name}")
+        prompt_result = await session.get_prompt(prompt_name, arguments={"timespan": "today"})
+        system_prompt = (
+            prompt_result.messages[0].content.text if prompt_result.messages else fallback_prompt
+        )
+
+        self.logger.info("Calling OpenAI for summary")
+        summary = await self._summarize(system_prompt, emails_json, prompt_name, "today", reply)
+        self.logger.info(f"Generated summary: {len(summary)} chars")
+        return summary
+
+    async def _today_text(self, reply: StreamingReply | None) -> str:
+        # Open a single MCP session for all calls
+        async with self.voice_agent_client.session() as session:
+            return await self._today_summary(session, for_audio=False, reply=reply)
+
+    async def _today_audio(self) -> Path:
+        async with self.voice_agent_client.session() as session:
+            summary_text = await self._today_summary(session, for_audio=True)
+            self.logger.info("Calling MCP tool: tts_instagram_audio")
+            audio_result = await self.voice_agent_client.call_tool(
+                session, "tts_instagram_audio", {"text": summary_text}
+            )
+        audio_path = audio_file_from_content(audio_result.content)
+        if audio_path is None:
+            raise RuntimeError("The TTS tool returned no audio")
+        self.logger.info(f"Generated audio: {audio_path.stat().st_size} bytes")
+        return audio_path
+
+    @asynccontextmanager
+    async def _today(
+        self, kind: DigestKind, reply: StreamingReply | None = None
+    ) -> AsyncIterator[Any]:
+        # Yields today's summary text or audio file. With digests enabled, a digest built
+        # from the mailbox as it is now is served as is; otherwise the result is computed
+        # once for all concurrent requests and kept as the new digest.
+        day = date.today()
+        history_id = None
+        if settings.digest.enabled:
+            async with self.voice_agent_client.session() as session:
+                history_id = await self.voice_agent_client.get_mailbox_history_id(session)
+            digest = self.digests.get(kind, day, history_id)
+            if digest is not None:
+                self.logger.info(f"Serving the {kind} digest of history id {history_id}")
+                yield digest.text if kind == "text" else digest.audio_path
+                return
+
+        async def compute() -> Any:
+            if kind == "text":
+                # Only the request that starts the work streams; the others get the final text.
+                summary = await self._today_text(reply)
+                if history_id is not None:
+                    self.digests.put_text(day, history_id, summary)
+                return summary
+            audio_path = await self._today_audio()
+            if history_id is not None:
+                return self.digests.put_audio(day, history_id, audio_path).audio_path
+            return audio_path
+
+        command = "summary_today" if kind == "text" else "audio_today"
+        # Digest files belong to the store; spooled files are deleted after the last send.
+        release = release_audio if kind == "audio" and history_id is None else None
+        async with self.in_flight.join(
+            self._request_key(command, "today", kind), compute, release
+        ) as result:
+            yield result
+
+    async def _refresh_digests(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        kinds: list[DigestKind] = ["text", "audio"] if settings.digest.audio else ["text"]
+        for kind in kinds:
+            try:
+                self._assert_openai_configured()
+                with span(f"digest.refresh.{kind}"):
+                    async with self._today(kind):
+                        pass
+            except Exception as e:
+                self.logger.error(f"Error refreshing the {kind} digest: {e}")
+
+    async def _deliver_answer(
+        self, update: Update, reply: StreamingReply | None, answer: str, audio_path: Path | None
+    ) -> None:
+        self.logger.info(
+            f"Agent response: {len(answer) if answer else 0} chars, audio: {bool(audio_path)}"
+        )
+
+        if answer and answer.strip():
+            if reply is not None:
+                await reply.finish(answer)
+            else:
+                self.logger.warning("No message found in update; cannot reply.")
+        else:
+            if update.message:
+                await update.message.reply_text("(No response from agent)")
+            else:
+                self.logger.warning("No message found in update; cannot reply.")
+
+        if audio_path:
+            try:
+                self.logger.info("Sending audio to user")
+                await self._send_audio(
+                    update, audio_path, filename="summary.mp3", caption="🎧 Audio summary"
+                )
+            except Exception as audio_error:
+                self.logger.error(f"Error sending audio: {str(audio_error)}")
+                if update.message:
+                    await update.message.reply_text(
+                        f"⚠️ Audio generation completed but failed to send: {str(audio_error)}"
+                    )
+                else:
+                    self.logger.warning("No message found in update; cannot reply.")
+
+    @_traced("bot.start")
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """
         Send a message when the command /start is issued.
@@ -55,6 +344,7 @@ class EmailSummaryBot:
         else:
             self.logger.warning("No message found in update; cannot reply.")
 
+    @_traced("bot.summary")
     async def summary(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """
         Handle the /summary command to run the agent with user instructions.
@@ -82,58 +372,30 @@ class EmailSummaryBot:
                 self.logger.warning("No message found in update; cannot reply.")
             return
 
+        placeholder = None
         if not (context.chat_data and context.chat_data.get("already_notified", False)):
             if update.message:
-                await update.message.reply_text("🧠 Running agent with your instruction... ⏳")
+                placeholder = await update.message.reply_text(
+                    "🧠 Running agent with your instruction... ⏳"
+                )
             else:
                 self.logger.warning("No message found in update; cannot reply.")
 
         try:
             self._assert_openai_configured()
             self.logger.info(f"Running agentic query: {user_text}")
-            answer, audio_b64 = await self.voice_agent_client.run_agentic_query(user_text)
-            self.logger.info(
-                f"Agent response: {len(answer) if answer else 0} chars, audio: {bool(audio_b64)}"
-            )
-
-            if answer and answer.strip():
-                max_length = 4000
-                if update.message:
-                    if len(answer) <= max_length:
-                        await update.message.reply_text(answer)
-                    else:
-                        for i in range(0, len(answer), max_length):
-                            chunk = answer[i : i + max_length]
-                            await update.message.reply_text(chunk)
-                else:
-                    self.logger.warning("No message found in update; cannot reply.")
-            else:
-                if update.message:
-                    await update.message.reply_text("(No response from agent)")
-                else:
-                    self.logger.warning("No message found in update; cannot reply.")
-
-            if audio_b64:
-                try:
-                    self.logger.info("Sending audio to user")
-                    mp3_bytes = base64.b64decode(audio_b64)
-                    bio = io.BytesIO(mp3_bytes)
-                    bio.name = "summary.mp3"
-                    if update.message:
-                        await update.message.reply_audio(
-                            audio=bio, filename="summary.mp3", caption="🎧 Audio summary"
-                        )
-                        self.logger.info("Audio sent successfully")
-                    else:
-                        self.logger.warning("No message found in update; cannot send audio.")
-                except Exception as audio_error:
-                    self.logger.error(f"Error sending audio: {str(audio_error)}")
-                    if update.message:
-                        await update.message.reply_text(
-                            f"⚠️ Audio generation completed but failed to send: {str(audio_error)}"
-                        )
-                    else:
-                        self.logger.warning("No message found in update; cannot reply.")
+            reply = self._streaming_reply(update, placeholder)
+            # The agent picks the timespan and format from the instruction itself.
+            key = self._request_key("summary", user_text, "agent")
+            async with self.in_flight.join(
+                key,
+                lambda: self.voice_agent_client.run_agentic_query(
+                    user_text,
+                    on_text=reply.update if reply is not None and settings.openai.stream else None,
+                ),
+                _release_answer_audio,
+            ) as (answer, audio_path):
+                await self._deliver_answer(update, reply, answer, audio_path)
 
         except Exception as e:
             import traceback
@@ -153,6 +415,7 @@ class EmailSummaryBot:
             else:
                 self.logger.warning("No message found in update; cannot reply.")
 
+    @_traced("bot.summary_today")
     async def summary_today(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """
         Summarize today's emails in text format.
@@ -165,55 +428,17 @@ class EmailSummaryBot:
            None
         """
 
+        placeholder = None
         if update.message:
-            await update.message.reply_text("📧 Summarizing today's emails... ⏳")
+            placeholder = await update.message.reply_text("📧 Summarizing today's emails... ⏳")
         else:
             self.logger.warning("No message found in update; cannot reply.")
         try:
             self._assert_openai_configured()
-            # Open a single MCP session for all calls
-            async with self.voice_agent_client.mcp_host_initialized_session() as session:
-                self.logger.info("Calling MCP tool: get_emails with days=0 (today)")
-                emails_result = await session.call_tool("get_emails", {"days": 0})
-                emails_json = (
-                    emails_result.content[0].text
-                    if hasattr(emails_result, "content")
-                    else str(emails_result)
-                )
-                self.logger.info(f"Received {len(emails_json)} chars of email JSON")
-
-                self.logger.info("Building summary prompt")
-                prompt_result = await session.get_prompt(
-                    settings.prompts.summary_prompt,
-                    arguments={"timespan": "today"},
-                )
-                system_prompt = (
-                    prompt_result.messages[0].content.text
-                    if prompt_result.messages
-                    else "Summarize today's emails."
-                )
-
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": emails_json},
-                ]
-
-                self.logger.info("Calling OpenAI for summary")
-                completion = get_openai_completion(
-                    openai_client=self.voice_agent_client.openai_client,
-                    model=(
-                        self.voice_agent_client.model
-                        if self.voice_agent_client.model is not None
-                        else "gpt-4o-mini"
-                    ),
-                    messages=messages,
-                    temperature=0.2,
-                )
-
-                summary = completion.choices[0].message.content  # type: ignore
-                self.logger.info(f"Generated summary: {len(summary)} chars")
-                if update.message:
-                    await update.message.reply_text(summary)
+            reply = self._streaming_reply(update, placeholder)
+            async with self._today("text", reply) as summary:
+                if reply is not None:
+                    await reply.finish(summary)
                 else:
                     self.logger.warning("No message found in update; cannot reply.")
         except Exception as e:
@@ -226,6 +451,7 @@ class EmailSummaryBot:
             else:
                 self.logger.warning("No message found in update; cannot reply.")
 
+    @_traced("bot.handle_message")
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """
         Handle incoming messages from users.
@@ -271,6 +497,7 @@ class EmailSummaryBot:
         else:
             await self.start(update, context)
 
+    @_traced("bot.audio_today")
     async def audio_today(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """
         Handle audio summary requests for today.
@@ -288,69 +515,13 @@ class EmailSummaryBot:
             self.logger.warning("No message found in update; cannot reply.")
         try:
             self._assert_openai_configured()
-            # Open a single MCP session for all calls
-            async with self.voice_agent_client.mcp_host_initialized_session() as session:
-                self.logger.info("Calling MCP tool: get_emails with days=0 (today)")
-                emails_result = await session.call_tool("get_emails", {"days": 0})
-                emails_json = (
-                    emails_result.content[0].text
-                    if hasattr(emails_result, "content")
-                    else str(emails_result)
-                )
-                self.logger.info(f"Received {len(emails_json)} chars of email JSON")
-
-                self.logger.info("Building AUDIO-FRIENDLY summary prompt")
-                prompt_result = await session.get_prompt(
-                    settings.prompts.summary_audio_prompt,
-                    arguments={"timespan": "today"},
-                )
-                system_prompt = (
-                    prompt_result.messages[0].content.text
-                    if prompt_result.messages
-                    else "Summarize today's emails for audio."
-                )
-
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": emails_json},
-                ]
-
-                self.logger.info("Calling OpenAI for conversational audio summary")
-                completion = get_openai_completion(
-                    openai_client=self.voice_agent_client.openai_client,
-                    model=(
-                        self.voice_agent_client.model
-                        if self.voice_agent_client.model is not None
-                        else "gpt-4o-mini"
-                    ),
-                    messages=messages,
-                    temperature=0.2,
-                )
-
-                summary_text = completion.choices[0].message.content  # type: ignore
-                self.logger.info(f"Generated conversational summary: {len(summary_text)} chars")
-
-                self.logger.info("Calling MCP tool: tts_instagram_audio")
-                audio_result = await session.call_tool(
-                    "tts_instagram_audio", {"text": summary_text}
+            async with self._today("audio") as audio_path:
+                await self._send_audio(
+                    update,
+                    audio_path,
+                    filename="summary_today.mp3",
+                    caption="Audio summary (today)",
                 )
-                b64 = (
-                    audio_result.content[0].text
-                    if hasattr(audio_result, "content")
-                    else str(audio_result)
-                )
-                self.logger.info(f"Generated audio: {len(b64)} chars base64")
-
-                mp3_bytes = base64.b64decode(b64)
-                bio = io.BytesIO(mp3_bytes)
-                bio.name = "summary_today.mp3"
-                if update.message:
-                    await update.message.reply_audio(
-                        audio=bio, filename="summary_today.mp3", caption="Audio summary (today)"
-                    )
-                else:
-                    self.logger.warning("No message found in update; cannot send audio.")
-                self.logger.info("Audio sent successfully")
         except Exception as e:
             import traceback
 
@@ -373,12 +544,31 @@ class EmailSummaryBot:
         """
         if not self.telegram_token:
             raise ValueError("No TELEGRAM_BOT_TOKEN found in environment variables")
-        app = Application.builder().token(self.telegram_token).build()
+        app = (
+            Application.builder()
+            .token(self.telegram_token)
+            .post_init(self._post_init)
+            .post_shutdown(self._post_shutdown)
+            .build()
+        )
+        if settings.digest.enabled:
+            if app.job_queue is None:
+                raise RuntimeError(
+                    "Digests need the job queue: install python-telegram-bot[job-queue]"
+                )
+            app.job_queue.run_repeating(
+                self._refresh_digests,
+                interval=settings.digest.interval,
+                first=settings.digest.first_delay,
+                name="daily-digest",
+            )
         app.add_handler(CommandHandler("start", self.start))
-        app.add_handler(CommandHandler("summary", self.summary))
-        app.add_handler(CommandHandler("summary_today", self.summary_today))
-        app.add_handler(CommandHandler("audio_today", self.audio_today))
-        app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
+        app.add_handler(CommandHandler("summary", self._scheduled(self.summary)))
+        app.add_handler(CommandHandler("summary_today", self._scheduled(self.summary_today)))
+        app.add_handler(CommandHandler("audio_today", self._scheduled(self.audio_today)))
+        app.add_handler(
+            MessageHandler(filters.TEXT & ~filters.COMMAND, self._scheduled(self.handle_message))
+        )
         app.run_polling(allowed_updates=Update.ALL_TYPES)
 
 
@@ -0,0 +1,96 @@
+"""Precomputed digests of today's emails, valid while the mailbox is unchanged."""
+
+import shutil
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Literal
+
+from voice_agent.utils.logger_util import get_logger
+
+logger = get_logger(name="DailyDigest")
+
+type DigestKind = Literal["text", "audio"]
+
+
+@dataclass(frozen=True)
+class Digest:
+    day: date
+    history_id: str
+    text: str | None = None
+    audio_path: Path | None = None
+    created_at: float = field(default_factory=time.time)
+
+
+class DigestStore:
+    """The latest text and audio digest, each tagged with the mailbox history id it saw."""
+
+    def __init__(self, audio_dir: Path) -> None:
+        self.audio_dir = audio_dir
+        self._digests: dict[DigestKind, Digest] = {}
+
+    def get(self, kind: DigestKind, day: date, history_id: str | None) -> Digest | None:
+        """
+        Get the digest if it was computed today from the mailbox as it is now.
+
+        Args:
+                kind: "text" or "audio".
+                day: Today's date.
+                history_id: The mailbox's current history id, None if unknown.
+
+        Returns:
+                The digest, or None if there is none or the mailbox changed since.
+        """
+        digest = self._digests.get(kind)
+        if digest is None or history_id is None:
+            return None
+        if digest.day != day or digest.history_id != history_id:
+            return None
+        if digest.audio_path is not None and not digest.audio_path.exists():
+            return None
+        return digest
+
+    def put_text(self, day: date, history_id: str, text: str) -> Digest:
+        """
+        Store a text digest.
+
+        Args:
+                day: The day the digest covers.
+                history_id: The mailbox history id read before the emails were fetched.
+                text: The summary.
+
+        Returns:
+                The stored digest.
+        """
+        digest = Digest(day=day, history_id=history_id, text=text)
+        self._digests["text"] = digest
+        return digest
+
+    def put_audio(self, day: date, history_id: str, spooled: Path) -> Digest:
+        """
+        Store an audio digest, taking the spooled MP3 over from the spool directory.
+
+        The previous audio file is kept, since a reply may still be sending it; older
+        files are deleted.
+
+        Args:
+                day: The day the digest covers.
+                history_id: The mailbox history id read before the emails were fetched.
+                spooled: The MP3 returned by the TTS tool.
+
+        Returns:
+                The stored digest, with the MP3's new path.
+        """
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        path = self.audio_dir / f"digest-{day.isoformat()}-{history_id}-{time.time_ns()}.mp3"
+        shutil.move(spooled, path)
+        previous = self._digests.get("audio")
+        keep = {path, previous.audio_path if previous is not None else None}
+        for old in self.audio_dir.glob("digest-*.mp3"):
+            if old not in keep:
+                old.unlink(missing_ok=True)
+        digest = Digest(day=day, history_id=history_id, audio_path=path)
+        self._digests["audio"] = digest
+        logger.info(f"Stored audio digest for {day.isoformat()} at history id {history_id}")
+        return digest
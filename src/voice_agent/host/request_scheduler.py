@@ -0,0 +1,222 @@
+"""Bounded queue and worker pool for bot requests, with per-chat and global rate limits."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Literal
+
+from voice_agent.utils.logger_util import get_logger
+from voice_agent.utils.metrics_util import REGISTRY
+from voice_agent.utils.tracing_util import record_span
+
+REJECTIONS = REGISTRY.counter(
+    "voice_agent_scheduler_rejections_total", "Bot requests turned away", ["reason"]
+)
+# Per-chat buckets are dropped once refilled, so idle chats do not accumulate.
+_MAX_IDLE_BUCKETS = 1024
+
+
+class TokenBucket:
+    """Allows bursts of up to burst requests and rate requests per second on average."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def full(self) -> bool:
+        """Whether the bucket has refilled completely, i.e. it has been idle."""
+        self._refill()
+        return self._tokens >= self.capacity
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available.
+
+        Args:
+                None
+
+        Returns:
+                0 if a token was taken, otherwise the seconds until one will be available.
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def acquire(self) -> None:
+        """
+        Wait until a token is available and take it.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        while (wait := self.try_acquire()) > 0:
+            await asyncio.sleep(wait)
+
+
+class RequestRejected(Exception):
+    """Raised by RequestScheduler.submit when a request cannot be queued."""
+
+    def __init__(self, reason: Literal["rate_limited", "queue_full"], retry_after: float) -> None:
+        super().__init__(f"Request rejected ({reason}); retry after {retry_after:.0f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Job:
+    run: Callable[[], Awaitable[None]]
+    chat_id: Hashable
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class RequestScheduler:
+    def __init__(
+        self,
+        max_in_flight: int = 2,
+        max_queue: int = 20,
+        chat_rate: float = 0.2,
+        chat_burst: int = 3,
+        global_rate: float = 1.0,
+        global_burst: int = 5,
+        retry_after: float = 30.0,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("The scheduler needs at least one worker")
+        self.logger = get_logger("RequestScheduler")
+        self.max_in_flight = max_in_flight
+        self.max_queue = max(0, max_queue)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.retry_after = retry_after
+        self._global_bucket = TokenBucket(global_rate, global_burst)
+        self._chat_buckets: dict[Hashable, TokenBucket] = {}
+        # Unbounded; submit enforces max_queue so it can say why a request was turned away.
+        self._queue: asyncio.Queue[_Job] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        self._running = 0
+
+    @property
+    def started(self) -> bool:
+        """Whether the workers are running and requests can be submitted."""
+        return bool(self._workers)
+
+    @property
+    def queued(self) -> int:
+        """The number of requests waiting for a worker."""
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> int:
+        """The number of requests being handled."""
+        return self._running
+
+    async def start(self) -> None:
+        """
+        Start the worker tasks.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"bot-worker-{i}")
+            for i in range(self.max_in_flight)
+        ]
+        self.logger.info(
+            f"Started request scheduler with {self.max_in_flight} worker(s), "
+            f"queue of {self.max_queue}"
+        )
+
+    async def close(self) -> None:
+        """
+        Stop the workers, cancelling running requests and dropping queued ones.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        for worker in workers:
+            with suppress(asyncio.CancelledError):
+                await worker
+        if self._queue.qsize():
+            self.logger.warning(f"Dropped {self._queue.qsize()} queued request(s) on shutdown")
+        self._queue = asyncio.Queue()
+        self._running = 0
+
+    def _chat_bucket(self, chat_id: Hashable) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= _MAX_IDLE_BUCKETS:
+                self._chat_buckets = {k: b for k, b in self._chat_buckets.items() if not b.full}
+            bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def submit(self, chat_id: Hashable, run: Callable[[], Awaitable[None]]) -> int:
+        """
+        Queue a request for the next free worker.
+
+        Args:
+                chat_id: The chat the request came from, for the per-chat rate limit.
+                run: Coroutine function handling the request.
+
+        Returns:
+                The request's position in the queue, or 0 if a worker is free to start it.
+
+        Raises:
+                RequestRejected: The chat is over its rate limit or the queue is full.
+        """
+        if not self._workers:
+            raise RuntimeError("The request scheduler is not started.")
+        if self._queue.qsize() >= self.max_queue and self._running >= self.max_in_flight:
+            REJECTIONS.inc(reason="queue_full")
+            raise RequestRejected("queue_full", self.retry_after)
+        wait = self._chat_bucket(chat_id).try_acquire()
+        if wait > 0:
+            REJECTIONS.inc(reason="rate_limited")
+            raise RequestRejected("rate_limited", wait)
+        busy = self._running + self._queue.qsize()
+        self._queue.put_nowait(_Job(run=run, chat_id=chat_id))
+        return busy - self.max_in_flight + 1 if busy >= self.max_in_flight else 0
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._running += 1
+            try:
+                # Paces the outbound Gmail, OpenAI and TTS calls across all chats.
+                await self._global_bucket.acquire()
+                record_span("scheduler.wait", time.monotonic() - job.queued_at)
+                await job.run()
+            except Exception as e:
+                self.logger.error(f"Error handling request from chat {job.chat_id}: {e}")
+            finally:
+                self._running -= 1
+                self._queue.task_done()
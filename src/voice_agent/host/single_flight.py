@@ -0,0 +1,92 @@
+"""Single-flight coalescing: concurrent identical requests share one computation."""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from voice_agent.utils.logger_util import get_logger
+
+logger = get_logger(name="SingleFlight")
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task, release: Callable[[Any], None] | None) -> None:
+        self.task = task
+        self.release = release
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one computation per key; callers arriving meanwhile share its result."""
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def in_flight(self, key: Hashable) -> int:
+        """
+        Get the number of callers waiting on the computation for a key.
+
+        Args:
+                key: The request key.
+
+        Returns:
+                The number of callers, 0 if nothing is running for the key.
+        """
+        flight = self._flights.get(key)
+        return flight.waiters if flight is not None else 0
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        # Only coalesce while running; a request after completion starts fresh.
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _leave(self, flight: _Flight) -> None:
+        flight.waiters -= 1
+        if flight.waiters > 0:
+            return
+        task = flight.task
+        if not task.done():
+            # Every caller gave up, so nobody will use the result.
+            task.cancel()
+        elif flight.release is not None and not task.cancelled() and task.exception() is None:
+            flight.release(task.result())
+
+    @asynccontextmanager
+    async def join[T](
+        self,
+        key: Hashable,
+        work: Callable[[], Awaitable[T]],
+        release: Callable[[T], None] | None = None,
+    ) -> AsyncIterator[T]:
+        """
+        Share the result of work with every concurrent caller using the same key.
+
+        The first caller starts work in its own task; later callers wait for it. The
+        work is cancelled only when every caller has left, and its result stays valid
+        until the last caller leaves the context.
+
+        Args:
+                key: The normalized request; equal keys mean interchangeable results.
+                work: Coroutine function computing the result, called once per flight.
+                release: Called with the result once the last caller has left, e.g. to
+                        delete a shared file. Set by the caller that starts the flight.
+
+        Yields:
+                The result of work. Exceptions raised by work are raised in every caller.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(work()), release)
+            self._flights[key] = flight
+            started = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, started))
+        else:
+            logger.info(f"Joining in-flight request {key} ({flight.waiters} waiting)")
+        flight.waiters += 1
+        try:
+            # Shielded, so one caller's cancellation does not cancel the others' work.
+            result = await asyncio.shield(flight.task)
+            yield result
+        finally:
+            self._leave(flight)
@@ -0,0 +1,95 @@
+"""Progressive delivery of streamed LLM text by editing a Telegram message."""
+
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any
+
+from telegram.error import RetryAfter, TelegramError
+
+from voice_agent.utils.logger_util import get_logger
+from voice_agent.utils.tracing_util import span
+
+# Telegram rejects messages over 4096 characters; keep the margin the bot already uses.
+MAX_MESSAGE_LENGTH = 4000
+_CURSOR = " ▌"
+
+
+def _retry_delay(error: RetryAfter) -> float:
+    delay = error.retry_after
+    return delay.total_seconds() if isinstance(delay, timedelta) else float(delay)
+
+
+class StreamingReply:
+    def __init__(
+        self,
+        message: Any,
+        placeholder: Any = None,
+        edit_interval: float = 1.0,
+        max_length: int = MAX_MESSAGE_LENGTH,
+    ) -> None:
+        self.logger = get_logger("StreamingReply")
+
+        self.message = message
+        self.placeholder = placeholder
+        self.edit_interval = edit_interval
+        self.max_length = max_length
+        self._next_edit = 0.0
+        self._shown: str | None = None
+
+    async def _show(self, text: str, final: bool = False) -> None:
+        if text == self._shown:
+            return
+        try:
+            if self.placeholder is None:
+                self.placeholder = await self.message.reply_text(text)
+            else:
+                await self.placeholder.edit_text(text)
+            self._shown = text
+        except RetryAfter as e:
+            delay = _retry_delay(e)
+            if not final:
+                # Flood control: skip partial updates until Telegram accepts edits again.
+                self._next_edit = time.monotonic() + delay
+                return
+            await asyncio.sleep(delay)
+            await self._show(text, final=True)
+        except TelegramError as e:
+            self.logger.warning(f"Could not update streamed message: {e}")
+            if final:
+                await self.message.reply_text(text)
+                self._shown = text
+
+    async def update(self, text: str) -> None:
+        """
+        Show the text generated so far, at most once per edit_interval.
+
+        Args:
+                text: The accumulated text of the completion.
+
+        Returns:
+                None
+        """
+        now = time.monotonic()
+        if now < self._next_edit or not text.strip():
+            return
+        self._next_edit = now + self.edit_interval
+        await self._show(text[: self.max_length - len(_CURSOR)] + _CURSOR)
+
+    async def finish(self, text: str) -> None:
+        """
+        Replace the partial text with the final text, sending overflow as extra messages.
+
+        Args:
+                text: The complete text.
+
+        Returns:
+                None
+        """
+        chunks = [text[i : i + self.max_length] for i in range(0, len(text), self.max_length)]
+        if not chunks:
+            return
+        with span("telegram.reply", messages=len(chunks)):
+            await self._show(chunks[0], final=True)
+            for chunk in chunks[1:]:
+                await self.message.reply_text(chunk)
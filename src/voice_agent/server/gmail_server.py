@@ -1,7 +1,9 @@
+import threading
 from typing import Literal
 
 from fastmcp import FastMCP
 from fastmcp.prompts import Prompt
+from fastmcp.resources import Resource
 from fastmcp.tools import Tool
 
 from voice_agent.config import settings
@@ -10,9 +12,13 @@ from voice_agent.server.prompts.prompt_calls import (
     email_summary_audio_format_prompt,
     email_summary_format_prompt,
 )
+from voice_agent.server.resources.mailbox_state import get_mailbox_state
+from voice_agent.server.tools.get_email_body import get_email_body
 from voice_agent.server.tools.get_emails import get_emails
-from voice_agent.server.tools.tts_reply import tts_instagram_audio
+from voice_agent.server.tools.tts_reply import tts_instagram_audio, warm_up_tts_client
+from voice_agent.server.tracing_middleware import TracingMiddleware
 from voice_agent.utils.logger_util import get_logger
+from voice_agent.utils.parse_pool_util import shutdown_parse_pool
 
 logger = get_logger(name="GmailServer")
 
@@ -21,8 +27,19 @@ class GmailMcpServer:
     def __init__(self, name: str = "Gmail MCP Server"):
         self.logger = logger
         self.mcp = FastMCP(name=name)
+        self.mcp.add_middleware(TracingMiddleware())
         self._register_tools()
         self._register_prompts()
+        self._register_resources()
+        if settings.tts.warm_up:
+            threading.Thread(target=self._warm_up_tts, name="tts-warm-up", daemon=True).start()
+
+    def _warm_up_tts(self) -> None:
+        try:
+            warm_up_tts_client()
+            self.logger.info("TTS client warmed up")
+        except Exception as e:
+            self.logger.warning(f"TTS warm-up failed, the client will be created on first use: {e}")
 
     def _register_tools(self) -> None:
         self.mcp.add_tool(
@@ -30,11 +47,22 @@ class GmailMcpServer:
                 name=settings.tools.get_emails_tool,
                 description=(
                     "Fetch emails from Gmail for a specified number of days. "
-                    "Returns JSON array of emails with id, from, subject, date, and body fields."
+                    "Returns JSON array of emails with id, from, subject, date, and body fields. "
+                    "With include_body=False returns a snippet instead of the body."
                 ),
                 fn=get_emails,
             )
         )
+        self.mcp.add_tool(
+            Tool.from_function(
+                name=settings.tools.get_email_body_tool,
+                description=(
+                    "Fetch the full body of specific emails by id. "
+                    "Returns JSON array of emails with id, from, subject, date, and body fields."
+                ),
+                fn=get_email_body,
+            )
+        )
         self.mcp.add_tool(
             Tool.from_function(
                 name=settings.tools.tts_instagram_audio_tool,
@@ -70,6 +98,20 @@ class GmailMcpServer:
             )
         )
 
+    def _register_resources(self) -> None:
+        self.mcp.add_resource(
+            Resource.from_function(
+                get_mailbox_state,
+                uri=settings.resources.mailbox_state_uri,
+                name="mailbox_state",
+                description=(
+                    "Current Gmail history id of the mailbox, to tell whether anything "
+                    "changed since a previous fetch."
+                ),
+                mime_type="application/json",
+            )
+        )
+
     def run(
         self,
         transport: Literal["stdio", "http", "streamable-http"] | None = "stdio",
@@ -104,9 +146,13 @@ class GmailMcpServer:
                 asyncio.run(log_tools_and_prompts())
         except Exception as e:
             self.logger.error(f"Error logging tools/prompts: {e}")
-        self.mcp.run(
-            transport=transport,
-        )
+        try:
+            self.mcp.run(
+                transport=transport,
+            )
+        finally:
+            # Stop the spawned parse workers with the server, not at interpreter exit.
+            shutdown_parse_pool()
 
 
 def main() -> None:
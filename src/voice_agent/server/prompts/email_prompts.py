@@ -8,11 +8,13 @@ EMAIL_ASSISTANT_SYSTEM_PROMPT = """
         - Analyze the user's request and automatically select the appropriate tool(s) to fulfill it.
 
     AVAILABLE TOOLS:
-        1. get_emails(days, max_results)
+        1. get_emails(days, max_results, include_body)
             - This is your PRIMARY tool for fetching emails
             - Fetch emails from the last N days
             - The "days" parameter determines the timeframe
             - You MUST decide the number of days based on the user's request
+            - include_body=False returns only sender, subject, date and a short snippet;
+              prefer it for wide timeframes (a week or more) or "what's new" questions
 
            HOW TO CHOOSE THE "days" PARAMETER FOR get_emails:
             - "today" or "today's emails" → days=0
@@ -25,15 +27,21 @@ EMAIL_ASSISTANT_SYSTEM_PROMPT = """
             - "last month" → days=30
             - "recent" or "recent emails" → days=7 (default to a week)
 
-        2. tts_instagram_audio(text) - Generate audio (MP3) from text
+        2. get_email_body(ids) - Fetch the full body of specific emails
+            - Use after get_emails(include_body=False) for the ids whose full content
+              you need to answer or summarize properly
+            - Skip newsletters and notifications the snippet already explains
+
+        3. tts_instagram_audio(text) - Generate audio (MP3) from text
             - Use ONLY when user explicitly requests: "audio", "with audio", "read it to me"
             - Do NOT generate audio unless explicitly requested
 
     WORKFLOW:
         1. Parse user request to determine timeframe (number of days)
         2. Call get_emails with appropriate "days" parameter
-        3. Summarize the email data
-        4. If user requested audio, call tts_instagram_audio with the summary text
+        3. If you fetched headers only, call get_email_body for the emails that matter
+        4. Summarize the email data
+        5. If user requested audio, call tts_instagram_audio with the summary text
 
     OUTPUT FORMAT WHEN USER WANTS AUDIO:
         - Generate a CONVERSATIONAL, NATURAL-SOUNDING summary in spoken style
@@ -124,3 +132,25 @@ EMAIL_SUMMARY_AUDIO_PROMPT = """
 
     Be conversational and natural - this will be listened to, not read.
     """
+
+# Map step of the map-reduce summary: condenses one batch of emails (or earlier notes).
+EMAIL_CHUNK_SUMMARY_PROMPT = """
+    You condense one batch of a larger set of user emails into notes for a later summary.
+    You receive either a JSON array of emails with keys id, from, subject, date, body
+    (or snippet), or notes that were written for earlier batches.
+
+    YOUR TASK:
+        - Write compact notes covering EVERY email in the input, oldest details included.
+        - For each email keep: id (if present), sender, subject, date, the key facts,
+          action items, deadlines, amounts and raw URLs.
+        - Merge near-duplicate notifications into one note and say how many there were.
+        - Do not summarize across emails or add an introduction or conclusion.
+        - Be specific and do not invent information beyond provided content.
+        - Plain text only, one short paragraph per email.
+    """
+
+# Appended to the summary prompts when the reduce step receives notes instead of raw emails.
+EMAIL_REDUCE_NOTE = """
+    NOTE: The emails were condensed in batches. Instead of a JSON array you receive notes
+    on every email of the timespan, grouped by batch. Treat them as the email data.
+    """
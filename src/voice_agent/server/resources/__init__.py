@@ -0,0 +1 @@
+# Resources module
@@ -0,0 +1,28 @@
+import asyncio
+import json
+
+from voice_agent.utils.gmail_auth_util import get_gmail_service
+from voice_agent.utils.gmail_fetch_util import execute_request
+from voice_agent.utils.mailbox_watch_util import get_mailbox_watcher
+
+
+async def get_mailbox_state() -> str:
+    """Report the current Gmail history id of the mailbox.
+
+    The history id increases with every change to the mailbox, so a client that kept
+    the id from its last fetch can tell whether anything changed without listing mail.
+    While the mailbox watcher is up to date, the id is answered without calling Gmail.
+
+    Returns:
+            JSON object with the history_id and messages_total of the mailbox
+    """
+    watcher = get_mailbox_watcher()
+    if watcher is not None and watcher.is_fresh and watcher.history_id is not None:
+        return json.dumps(
+            {"history_id": watcher.history_id, "messages_total": watcher.messages_total}
+        )
+    service = await asyncio.to_thread(get_gmail_service)
+    profile = await execute_request(service, service.users().getProfile(userId="me"))
+    return json.dumps(
+        {"history_id": str(profile["historyId"]), "messages_total": profile.get("messagesTotal")}
+    )
@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+from fastmcp import Context
+
+from voice_agent.config import settings
+from voice_agent.utils.email_parser_util import parse_gmail_raw_message
+from voice_agent.utils.email_store_util import get_email_store
+from voice_agent.utils.gmail_auth_util import get_gmail_service
+from voice_agent.utils.gmail_fetch_util import fetch_messages_concurrently, with_internal_date
+
+
+async def get_email_body(ids: list[str], ctx: Context | None = None) -> str:
+    """Fetch the full body of specific emails by id.
+
+    Use this after get_emails(include_body=False) for the emails whose sender, subject
+    or snippet show they matter. Only the requested emails are downloaded and parsed.
+
+    Args:
+            ids: Gmail message ids returned by get_emails.
+
+    Returns:
+            JSON array of emails with id, from, subject, date, and body fields
+    """
+    ids = list(dict.fromkeys(ids))[: settings.gmail.max_total_results]
+    if ctx:
+        await ctx.info(f"Fetching full body for {len(ids)} email(s)", extra={"count": len(ids)})
+
+    stored: list[dict] = []
+    missing = ids
+    if settings.store.enabled:
+        store = get_email_store()
+        stored = store.get_emails(ids)
+        missing = store.missing_ids(ids)
+
+    fetched: list[tuple[int, dict]] = []
+    if missing:
+        fetched = await fetch_messages_concurrently(
+            await asyncio.to_thread(get_gmail_service),
+            missing,
+            with_internal_date(parse_gmail_raw_message),
+            batch_size=settings.gmail.batch_size,
+            max_retries=settings.gmail.max_retries,
+            parse_in_pool=True,
+        )
+        if settings.store.enabled:
+            get_email_store().upsert(fetched)
+
+    by_id = {email["id"]: email for email in stored}
+    by_id.update((email["id"], email) for _, email in fetched)
+    emails = [by_id[i] for i in ids if i in by_id]
+    if ctx:
+        await ctx.info(f"Prepared full JSON for {len(emails)} emails", extra={"count": len(emails)})
+    return json.dumps(emails, ensure_ascii=False)
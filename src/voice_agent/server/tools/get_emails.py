@@ -1,17 +1,78 @@
-import base64
+import asyncio
 import json
-from datetime import datetime
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from typing import Any
 
 from fastmcp import Context
 
-from voice_agent.utils.email_parser_util import parse_email_from_raw
+from voice_agent.config import settings
+from voice_agent.utils.email_parser_util import (
+    parse_gmail_metadata_message,
+    parse_gmail_raw_message,
+)
+from voice_agent.utils.email_store_util import get_email_store
 from voice_agent.utils.gmail_auth_util import get_gmail_service
+from voice_agent.utils.gmail_fetch_util import iter_messages
+from voice_agent.utils.gmail_sync_util import sync_emails
+from voice_agent.utils.mailbox_watch_util import get_mailbox_watcher
 
+# Logger name of the notifications carrying partial results, for clients to filter on.
+PARTIAL_RESULTS_LOGGER = "get_emails.partial"
 
-async def get_emails(days: int = 1, max_results: int = 50, ctx: Context | None = None) -> str:
-    """Fetch emails from the last N days with full body content.
+
+async def iter_emails(
+    service: Any, query: str, budget: int, include_body: bool = True
+) -> AsyncIterator[dict]:
+    """
+    Yield parsed emails matching query as their batches arrive, following every page.
+
+    Args:
+            service: Authenticated Gmail API service instance.
+            query: Gmail search query.
+            budget: Maximum number of emails to yield.
+            include_body: Fetch and parse full bodies; otherwise only headers and snippet.
+
+    Yields:
+            Email dicts with id, from, subject, date, and body (or snippet) fields,
+            newest first.
+    """
+    # Get raw email format in concurrent batches off the event loop; each worker
+    # parses its batch as soon as it arrives and the output keeps the listing order
+    async for batch in iter_messages(
+        service,
+        query,
+        parse_gmail_raw_message if include_body else parse_gmail_metadata_message,
+        budget,
+        batch_size=settings.gmail.batch_size,
+        max_retries=settings.gmail.max_retries,
+        max_concurrency=settings.gmail.max_concurrency,
+        fmt="raw" if include_body else "metadata",
+        parse_in_pool=include_body,
+    ):
+        for email in batch:
+            yield email
+
+
+async def _send_partial(ctx: Context, batch: list[str], offset: int) -> None:
+    await ctx.info(
+        f"Fetched emails {offset + 1}-{offset + len(batch)}",
+        logger_name=PARTIAL_RESULTS_LOGGER,
+        extra={"offset": offset, "emails": "[" + ", ".join(batch) + "]"},
+    )
+
+
+async def get_emails(
+    days: int = 1,
+    max_results: int = 50,
+    include_body: bool = True,
+    ctx: Context | None = None,
+) -> str:
+    """Fetch emails from the last N days with full body content, or headers only.
 
     This is the main tool for fetching emails.
+    Set include_body=False for a cheap overview (sender, subject, date and a short
+    snippet), then call get_email_body for the ids that need their full content.
     The LLM should decide how many days based on user request:
     - "today" → days=0 (or days=1)
     - "yesterday" → days=1
@@ -20,64 +81,79 @@ async def get_emails(days: int = 1, max_results: int = 50, ctx: Context | None =
     - "last 3 weeks" → days=21
     - "last month" → days=30
 
+    With a context, every batch is also sent as soon as it is parsed, in a log
+    notification from the "get_emails.partial" logger whose extra holds the batch's
+    offset and its emails as a JSON array, so clients can start on the first emails
+    before the call returns. The returned array still holds every email: memory grows
+    with max_results (capped by GMAIL__MAX_TOTAL_RESULTS), not with the mailbox size.
+
     Args:
             days: Number of days to look back (0 for today only, 1+ for past days). Default: 1
-            max_results: Maximum number of emails to fetch (1-100). Default: 50
+            max_results: Maximum number of emails to fetch across all result pages
+                    (capped by the server's overall budget). Default: 50
+            include_body: Whether to fetch full bodies. Default: True
 
     Returns:
             JSON array of emails with id, from, subject, date, and body fields
+            (snippet instead of body when include_body is False)
     """
     if ctx:
         await ctx.info(
             f"Fetching emails from last {days} day(s)",
-            extra={"days": days, "max_results": max_results},
+            extra={"days": days, "max_results": max_results, "include_body": include_body},
         )
 
-    service = get_gmail_service()
+    # Building the service or refreshing its token can block on HTTP.
+    service = await asyncio.to_thread(get_gmail_service)
 
     # Build query based on days
+    now = datetime.now()
     if days == 0:
         # Today only
-        today = datetime.now().strftime("%Y/%m/%d")
+        today = now.strftime("%Y/%m/%d")
         query = f"after:{today}"
+        since = now.replace(hour=0, minute=0, second=0, microsecond=0)
     else:
         # Last N days
         query = f"newer_than:{days}d"
+        since = now - timedelta(days=days)
 
-    results = (
-        service.users()
-        .messages()
-        .list(userId="me", q=query, maxResults=max(1, min(max_results, 100)))
-        .execute()
-    )
-
-    messages = results.get("messages", [])
-    if ctx:
-        await ctx.debug("Gmail list() returned messages", extra={"count": len(messages)})
+    budget = max(1, min(max_results, settings.gmail.max_total_results))
+    # Encode each email as soon as it is parsed so only the JSON text is kept around
+    encoded: list[str] = []
+    batch_size = settings.gmail.batch_size
+    sent = 0
+    if settings.store.enabled and include_body:
+        # Serve from the local store; only mail that changed since the last call is fetched
+        emails = await sync_emails(
+            service,
+            get_email_store(),
+            query,
+            since_ms=int(since.timestamp() * 1000),
+            max_results=budget,
+            transform=parse_gmail_raw_message,
+            watcher=get_mailbox_watcher(),
+        )
+        encoded = [json.dumps(email, ensure_ascii=False) for email in emails]
+    else:
+        async for email in iter_emails(service, query, budget, include_body=include_body):
+            encoded.append(json.dumps(email, ensure_ascii=False))
+            if ctx and len(encoded) - sent >= batch_size:
+                await _send_partial(ctx, encoded[sent:], sent)
+                sent = len(encoded)
+                await ctx.report_progress(len(encoded), budget, f"Fetched {len(encoded)} email(s)")
 
-    emails: list[dict] = []
-    if not messages:
+    if not encoded:
         if ctx:
             await ctx.info("No emails found for specified timeframe")
-        return json.dumps(emails, ensure_ascii=False)
-
-    for msg in messages:
-        # Get raw email format - single API call gets everything
-        raw_msg = service.users().messages().get(userId="me", id=msg["id"], format="raw").execute()
-        raw_bytes = base64.urlsafe_b64decode(raw_msg["raw"])
-
-        # Parse email to extract headers and body
-        email_data = parse_email_from_raw(raw_bytes)
-        emails.append(
-            {
-                "id": msg["id"],
-                "from": email_data["from"],
-                "subject": email_data["subject"],
-                "date": email_data["date"],
-                "body": email_data["body"],
-            }
-        )
+        return "[]"
 
     if ctx:
-        await ctx.info(f"Prepared full JSON for {len(emails)} emails", extra={"count": len(emails)})
-    return json.dumps(emails, ensure_ascii=False)
+        # The tail of the listing, or every email when they were served from the store
+        for start in range(sent, len(encoded), batch_size):
+            await _send_partial(ctx, encoded[start : start + batch_size], start)
+        await ctx.report_progress(len(encoded), len(encoded), "Done")
+        await ctx.info(
+            f"Prepared full JSON for {len(encoded)} emails", extra={"count": len(encoded)}
+        )
+    return "[" + ", ".join(encoded) + "]"
@@ -1,10 +1,45 @@
+import asyncio
 import base64
+import contextlib
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from fastmcp import Context
+from google.api_core.exceptions import ServiceUnavailable
 from google.cloud import texttospeech as tts
+from mcp.types import AudioContent, ResourceLink
 
 from voice_agent.config import settings
+from voice_agent.utils.audio_cache_util import audio_cache_key, get_audio_cache
+from voice_agent.utils.audio_spool_util import AUDIO_MIME_TYPE, spool_audio
+from voice_agent.utils.logger_util import get_logger
+from voice_agent.utils.tracing_util import span
+
+logger = get_logger(name="TtsReply")
+
+# Google TTS rejects synthesis inputs larger than this many bytes.
+MAX_INPUT_BYTES = 5000
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|(?<=[.!?…][\"'”’)\]])\s+")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+_client: tts.TextToSpeechClient | None = None
+_client_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.tts.max_concurrency), thread_name_prefix="tts"
+            )
+        return _executor
 
 
 def _init_tts_client() -> tts.TextToSpeechClient:
@@ -17,8 +52,139 @@ def _init_tts_client() -> tts.TextToSpeechClient:
     return tts.TextToSpeechClient()
 
 
+def get_tts_client() -> tts.TextToSpeechClient:
+    """
+    Get the process-wide TTS client, creating it (and its gRPC channel) on first use.
+
+    Args:
+            None
+
+    Returns:
+            The shared TextToSpeechClient.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = _init_tts_client()
+        return _client
+
+
+def reset_tts_client(client: tts.TextToSpeechClient) -> None:
+    """
+    Drop a client whose channel failed so the next call creates a new one.
+
+    Args:
+            client: The failed client; ignored if it was already replaced.
+
+    Returns:
+            None
+    """
+    global _client
+    with _client_lock:
+        if _client is client:
+            _client = None
+    with contextlib.suppress(Exception):
+        client.transport.close()
+
+
+def warm_up_tts_client() -> None:
+    """
+    Create the TTS client and open its channel before the first synthesis request.
+
+    Args:
+            None
+
+    Returns:
+            None
+    """
+    # A cheap RPC pays for the channel, TLS handshake and token fetch up front.
+    get_tts_client().list_voices(language_code="en-US")
+
+
+def _is_channel_failure(error: Exception) -> bool:
+    return isinstance(error, ServiceUnavailable) or (
+        isinstance(error, ValueError) and "closed channel" in str(error)
+    )
+
+
+def _byte_len(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def _split_oversized(text: str, max_bytes: int) -> list[str]:
+    # Last resort for a single sentence over the limit: cut at words, then at characters.
+    pieces: list[str] = []
+    current = ""
+    for word in text.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if _byte_len(candidate) <= max_bytes:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        while _byte_len(word) > max_bytes:
+            cut = max_bytes
+            while _byte_len(word[:cut]) > max_bytes:
+                cut -= 1
+            pieces.append(word[:cut])
+            word = word[cut:]
+        current = word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_text(text: str, max_bytes: int) -> list[str]:
+    """
+    Split text into chunks of at most max_bytes UTF-8 bytes for speech synthesis.
+
+    Chunks end at paragraph or sentence boundaries so the voice keeps natural pauses;
+    sentences are packed together up to the limit and only a single sentence longer
+    than the limit is cut at word boundaries.
+
+    Args:
+            text: The text to split.
+            max_bytes: Maximum UTF-8 size of a chunk.
+
+    Returns:
+            The chunks in reading order.
+    """
+    max_bytes = min(max_bytes, MAX_INPUT_BYTES)
+    chunks: list[str] = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        current = ""
+        for sentence in _SENTENCE_END.split(paragraph.strip()):
+            sentence = " ".join(sentence.split())
+            if not sentence:
+                continue
+            candidate = f"{current} {sentence}" if current else sentence
+            if _byte_len(candidate) <= max_bytes:
+                current = candidate
+                continue
+            if current:
+                chunks.append(current)
+            if _byte_len(sentence) <= max_bytes:
+                current = sentence
+            else:
+                *full, current = _split_oversized(sentence, max_bytes)
+                chunks.extend(full)
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def _strip_id3(mp3: bytes) -> bytes:
+    # Only the first chunk may carry tags; tags mid-stream confuse some players.
+    if mp3[:3] == b"ID3" and len(mp3) >= 10:
+        size = (mp3[6] << 21) | (mp3[7] << 14) | (mp3[8] << 7) | mp3[9]
+        footer = 10 if mp3[5] & 0x10 else 0
+        mp3 = mp3[10 + size + footer :]
+    if len(mp3) >= 128 and mp3[-128:-125] == b"TAG":
+        mp3 = mp3[:-128]
+    return mp3
+
+
 def _synthesize_chunks(text_chunks: list[str], language_code: str, voice_name: str) -> bytes:
-    client = _init_tts_client()
     voice_params = tts.VoiceSelectionParams(
         language_code=language_code,
         name=voice_name,
@@ -28,17 +194,37 @@ def _synthesize_chunks(text_chunks: list[str], language_code: str, voice_name: s
         sample_rate_hertz=24000,
     )
 
-    # Concatenate chunks into one synthesis for a single output file (Instagram-friendly MP3)
-    text = "".join(text_chunks)
-    input_cfg = tts.SynthesisInput(text=text)
-    response = client.synthesize_speech(
-        request={
-            "input": input_cfg,
+    cache = get_audio_cache()
+    config_key = tts.AudioConfig.to_dict(audio_config)
+
+    def synthesize(text: str) -> bytes:
+        key = audio_cache_key(text, language_code, voice_name, config_key)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        request = {
+            "input": tts.SynthesisInput(text=text),
             "voice": voice_params,
             "audio_config": audio_config,
         }
-    )
-    return response.audio_content
+        client = get_tts_client()
+        try:
+            response = client.synthesize_speech(request=request)
+        except Exception as e:
+            if not _is_channel_failure(e):
+                raise
+            logger.warning(f"TTS channel failed ({e}); recreating the client")
+            reset_tts_client(client)
+            response = get_tts_client().synthesize_speech(request=request)
+        if cache is not None:
+            cache.put(key, response.audio_content)
+        return response.audio_content
+
+    # Chunks are synthesized in parallel; map keeps them in reading order so the MP3
+    # frames can be concatenated into a single Instagram-friendly file.
+    parts = list(_get_executor().map(synthesize, text_chunks))
+    return b"".join(part if i == 0 else _strip_id3(part) for i, part in enumerate(parts))
 
 
 async def tts_instagram_audio(
@@ -46,7 +232,7 @@ async def tts_instagram_audio(
     language_code: str = "en-US",
     voice_name: str = "en-US-Chirp3-HD-Aoede",
     ctx: Context | None = None,
-) -> str:
+) -> ResourceLink | AudioContent:
     """Generate audio (MP3) from text using Google Text-to-Speech.
 
     IMPORTANT: Only use this tool when the user explicitly requests audio output with keywords like:
@@ -63,12 +249,19 @@ async def tts_instagram_audio(
             voice_name: Voice to use (default: 'en-US-Chirp3-HD-Aoede')
 
     Returns:
-            Base64-encoded MP3 audio string
+            A link to the spooled MP3 file, or inline MP3 audio content
     """
     if ctx:
         await ctx.info("Starting TTS synthesis for Instagram MP3")
-    chunks = [text]
-    mp3_bytes = _synthesize_chunks(chunks, language_code, voice_name)
+    chunks = split_text(text, settings.tts.max_chunk_bytes)
+    with span("tts.synthesize", chunks=len(chunks)):
+        mp3_bytes = await asyncio.to_thread(_synthesize_chunks, chunks, language_code, voice_name)
     if ctx:
-        await ctx.info("TTS synthesis complete", extra={"bytes": len(mp3_bytes)})
-    return base64.b64encode(mp3_bytes).decode("ascii")
+        await ctx.info(
+            "TTS synthesis complete", extra={"bytes": len(mp3_bytes), "chunks": len(chunks)}
+        )
+    if settings.tts.audio_transfer == "file":
+        return spool_audio(mp3_bytes)
+    return AudioContent(
+        type="audio", data=base64.b64encode(mp3_bytes).decode("ascii"), mime_type=AUDIO_MIME_TYPE
+    )
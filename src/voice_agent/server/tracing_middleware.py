@@ -0,0 +1,35 @@
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools import ToolResult
+from mcp.types import CallToolRequestParams
+
+from voice_agent.utils.tracing_util import TRACEPARENT_KEY, continue_trace, span, spans_meta
+
+
+class TracingMiddleware(Middleware):
+    """Joins tool calls to the caller's trace and returns the server-side spans in _meta."""
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[CallToolRequestParams],
+        call_next: CallNext[CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        """
+        Run a tool call inside a span continuing the trace named in the request _meta.
+
+        Args:
+            context: The middleware context of the tools/call request.
+            call_next: The next handler in the chain.
+
+        Returns:
+            The tool result, with the spans recorded during the call in its _meta.
+        """
+        fastmcp_context = context.fastmcp_context
+        request_context = fastmcp_context.request_context if fastmcp_context else None
+        meta = (request_context.meta if request_context is not None else None) or {}
+        with (
+            continue_trace(meta.get(TRACEPARENT_KEY)) as remote,
+            span(f"tool.{context.message.name}"),
+        ):
+            result = await call_next(context)
+        result.meta = {**(result.meta or {}), **spans_meta(remote)}
+        return result
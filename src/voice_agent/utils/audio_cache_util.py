@@ -0,0 +1,160 @@
+"""Size-bounded on-disk cache of synthesized MP3 audio, keyed by text and voice."""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any
+
+from voice_agent.config import settings
+from voice_agent.utils.logger_util import get_logger
+
+logger = get_logger(name="AudioCache")
+
+_SUFFIX = ".mp3"
+
+
+def audio_cache_key(
+    text: str, language_code: str, voice_name: str, audio_config: dict[str, Any]
+) -> str:
+    """
+    Build the cache key of a synthesized text from everything that shapes the audio.
+
+    Args:
+            text: The synthesized text.
+            language_code: The voice language code.
+            voice_name: The voice name.
+            audio_config: The TTS audio config as a plain dict.
+
+    Returns:
+            A hex SHA-256 digest.
+    """
+    material = json.dumps(
+        {
+            "text": text,
+            "language_code": language_code,
+            "voice_name": voice_name,
+            "audio_config": audio_config,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def _entries(self) -> list[tuple[str, int, float]]:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _touch(self, path: str) -> None:
+        # The modification time doubles as the LRU timestamp; set it explicitly because
+        # the kernel's own timestamps can be too coarse to order quick successive uses.
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Return the cached audio for key and mark it as recently used.
+
+        Args:
+                key: The cache key.
+
+        Returns:
+                The MP3 bytes, or None if not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            self._touch(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store audio under key, evicting least recently used files beyond max_bytes.
+
+        Args:
+                key: The cache key.
+                data: The MP3 bytes.
+
+        Returns:
+                None
+        """
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            with self._lock:
+                with contextlib.suppress(FileNotFoundError):
+                    self._total_bytes -= os.path.getsize(path)
+                os.replace(tmp_path, path)
+                self._touch(path)
+                self._total_bytes += len(data)
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
+
+    def _evict(self) -> None:
+        # Oldest first until the cache is back to 90% of its budget.
+        target = self.max_bytes * 0.9
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self._total_bytes <= target:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+                self._total_bytes -= size
+        logger.info(f"Evicted audio cache down to {self._total_bytes} bytes")
+
+
+_cache: AudioCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_audio_cache() -> AudioCache | None:
+    """
+    Get the process-wide audio cache in the configured directory.
+
+    Args:
+            None
+
+    Returns:
+            The shared AudioCache, or None if audio caching is disabled.
+    """
+    global _cache
+    config = settings.tts
+    if not config.cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = AudioCache(config.cache_dir, config.cache_max_bytes)
+            logger.info(f"Opened audio cache at {config.cache_dir}")
+        return _cache
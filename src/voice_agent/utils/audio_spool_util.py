@@ -0,0 +1,121 @@
+"""Hand synthesized audio from the MCP server to the bot through spool files."""
+
+import base64
+import binascii
+import contextlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from mcp.types import AudioContent, ResourceLink
+
+from voice_agent.config import settings
+from voice_agent.utils.logger_util import get_logger
+
+logger = get_logger(name="AudioSpool")
+
+AUDIO_MIME_TYPE = "audio/mpeg"
+_SUFFIX = ".mp3"
+
+
+def _spool_dir() -> Path:
+    path = Path(settings.tts.spool_dir).resolve()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _cleanup_stale(directory: Path, max_age: float) -> None:
+    # Files the bot never collected (e.g. after a crash) must not pile up.
+    cutoff = time.time() - max_age
+    for entry in directory.glob(f"*{_SUFFIX}"):
+        with contextlib.suppress(FileNotFoundError):
+            if entry.stat().st_mtime < cutoff:
+                entry.unlink()
+
+
+def _write_spool_file(data: bytes) -> Path:
+    directory = _spool_dir()
+    _cleanup_stale(directory, settings.tts.spool_max_age)
+    fd, path = tempfile.mkstemp(dir=directory, prefix="audio-", suffix=_SUFFIX)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return Path(path)
+
+
+def spool_audio(data: bytes) -> ResourceLink:
+    """
+    Write MP3 audio to the spool directory and reference it by a file URI.
+
+    Only the short link crosses the stdio JSON-RPC channel, not the audio itself.
+
+    Args:
+            data: The MP3 bytes.
+
+    Returns:
+            A resource link to the spooled file.
+    """
+    path = _write_spool_file(data)
+    return ResourceLink(
+        type="resource_link",
+        uri=path.as_uri(),
+        name=path.name,
+        mime_type=AUDIO_MIME_TYPE,
+        size=len(data),
+    )
+
+
+def _spooled_path(uri: str) -> Path | None:
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return None
+    path = Path(unquote(parsed.path)).resolve()
+    # Never touch files outside the spool directory, whatever the server sent.
+    if path.parent != _spool_dir() or not path.is_file():
+        logger.warning(f"Ignoring audio link outside the spool directory: {uri}")
+        return None
+    return path
+
+
+def audio_file_from_content(content: list[Any]) -> Path | None:
+    """
+    Get a local MP3 file for the audio in an MCP tool result.
+
+    Accepts a resource link to a spooled file, an audio content block, or the legacy
+    base64 text result. Inline audio is written to a spool file so callers can always
+    stream from disk.
+
+    Args:
+            content: The content blocks of a tts_instagram_audio result.
+
+    Returns:
+            The path of the MP3 file (to be released with release_audio), or None.
+    """
+    for block in content:
+        if isinstance(block, ResourceLink):
+            return _spooled_path(str(block.uri))
+        if isinstance(block, AudioContent):
+            return _write_spool_file(base64.b64decode(block.data))
+        text = getattr(block, "text", None)
+        if text:
+            try:
+                return _write_spool_file(base64.b64decode(text, validate=True))
+            except (binascii.Error, ValueError):
+                return None
+    return None
+
+
+def release_audio(path: Path) -> None:
+    """
+    Delete a spooled audio file once it was delivered.
+
+    Args:
+            path: The file returned by audio_file_from_content.
+
+    Returns:
+            None
+    """
+    with contextlib.suppress(FileNotFoundError):
+        path.unlink()
@@ -1,42 +1,92 @@
 """Email parsing and text processing utilities."""
 
+import base64
+import functools
+import html
+import re
+import time
+import unicodedata
 from email import policy
 from email.message import Message
 from email.parser import BytesParser
 from email.utils import parsedate_to_datetime
+from typing import Any
 
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 
+from voice_agent.config import settings
 from voice_agent.utils.logger_util import get_logger
 
 logger = get_logger(name="GmailUtils")
 
 
-def _clean_text(text: str) -> str:
-    """Clean text by removing invisible characters and normalizing whitespace."""
-    import unicodedata
+# Planes that hold Cf/Mn/Cc characters; planes 4-13 are unassigned and 15-16 are private
+# use. tests/unit/test_clean_text.py checks this against a scan of every code point.
+_SCANNED_PLANES = (range(0x0, 0x40000), range(0xE0000, 0xF0000))
+_KEPT_CONTROLS = "\n\t"
+_ASTRAL = re.compile("[\U00010000-\U0010ffff]")
+
+
+def _is_invisible(char: str) -> bool:
+    category = unicodedata.category(char)
+    return category in ("Cf", "Mn") or (category == "Cc" and char not in _KEPT_CONTROLS)
+
 
-    cleaned_chars = []
-    for char in text:
-        category = unicodedata.category(char)
-        # Keep visible characters and basic whitespace
-        if category not in ("Cf", "Mn") and (category != "Cc" or char in "\n\t"):
-            cleaned_chars.append(char)
-    text = "".join(cleaned_chars)
+def _class_ranges(codepoints: list[int]) -> str:
+    ranges: list[str] = []
+    start = prev = codepoints[0]
+    for cp in [*codepoints[1:], -1]:
+        if cp == prev + 1:
+            prev = cp
+            continue
+        ranges.append(re.escape(chr(start)) + (f"-{re.escape(chr(prev))}" if prev > start else ""))
+        start = prev = cp
+    return "".join(ranges)
 
-    # Replace various types of spaces with regular space
-    text = text.replace("\u00a0", " ")  # Non-breaking space
-    text = text.replace("\u202f", " ")  # Narrow no-break space
-    text = text.replace("\u2007", " ")  # Figure space
 
-    # Normalize line endings
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
+@functools.cache
+def _invisible_tables() -> tuple[dict[int, None], re.Pattern[str], frozenset[str]]:
+    invisible = [cp for plane in _SCANNED_PLANES for cp in plane if _is_invisible(chr(cp))]
+    ascii_table = dict.fromkeys(cp for cp in invisible if cp < 0x80)
+    # Astral code points are kept out of the regex class: sre only has a fast bitmap
+    # for BMP sets and falls back to a linear range scan per character otherwise.
+    bmp_pattern = re.compile(f"[{_class_ranges([cp for cp in invisible if cp <= 0xFFFF])}]+")
+    astral = frozenset(chr(cp) for cp in invisible if cp > 0xFFFF)
+    return ascii_table, bmp_pattern, astral
+
+
+def _clean_text(text: str) -> str:
+    """Clean text by removing invisible characters and normalizing whitespace."""
+    ascii_table, bmp_pattern, astral = _invisible_tables()
+    # Drop format (Cf), nonspacing mark (Mn) and control (Cc) characters except
+    # newline and tab. "\r" is a control character too, so line endings need no
+    # further normalization.
+    if text.isascii():
+        text = text.translate(ascii_table)
+    else:
+        text = bmp_pattern.sub("", text)
+        if _ASTRAL.search(text):
+            text = _ASTRAL.sub(lambda m: "" if m.group() in astral else m.group(), text)
+        # Replace various types of spaces with regular space
+        text = text.replace("\u00a0", " ")  # Non-breaking space
+        text = text.replace("\u202f", " ")  # Narrow no-break space
+        text = text.replace("\u2007", " ")  # Figure space
 
     # Remove excessive whitespace but preserve paragraph breaks
-    lines = text.splitlines()
-    cleaned_lines = [line.strip() for line in lines if line.strip()]
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
 
-    return "\n".join(cleaned_lines)
+def _format_date(date_raw: str | None) -> str | None:
+    """Format a Date header without time and timezone, e.g. "Fri, 03 Oct 2025"."""
+    if not date_raw:
+        return None
+    try:
+        dt = parsedate_to_datetime(date_raw)
+        return dt.strftime("%a, %d %b %Y")
+    except Exception:
+        return date_raw  # Fallback to raw if parsing fails
 
 
 def parse_email_from_raw(raw_email_bytes: bytes) -> dict:
@@ -58,14 +108,7 @@ def parse_email_from_raw(raw_email_bytes: bytes) -> dict:
         sender = msg.get("From", "Unknown")
         date_raw = msg.get("Date", None)
 
-        # Format date to remove timestamp and timezone: "Fri, 03 Oct 2025"
-        date_formatted = None
-        if date_raw:
-            try:
-                dt = parsedate_to_datetime(date_raw)
-                date_formatted = dt.strftime("%a, %d %b %Y")
-            except Exception:
-                date_formatted = date_raw  # Fallback to raw if parsing fails
+        date_formatted = _format_date(date_raw)
 
         def decode_payload(part: Message) -> str | None:
             payload = part.get_payload(decode=True)
@@ -113,16 +156,130 @@ def parse_email_from_raw(raw_email_bytes: bytes) -> dict:
         return {"subject": "Error", "from": "Unknown", "date": None, "body": ""}
 
 
+# Elements whose content is never rendered as body text.
+_INVISIBLE_TAGS = frozenset(
+    {"head", "title", "script", "style", "noscript", "template", "svg", "object", "iframe"}
+)
+# Inline styles used to hide preheaders and tracking text in marketing emails.
+_HIDDEN_STYLE = re.compile(
+    r"display\s*:\s*none|visibility\s*:\s*hidden|mso-hide\s*:\s*all"
+    r"|(?:max-height|font-size|opacity)\s*:\s*0(?![.\d]*[1-9])",
+    re.IGNORECASE,
+)
+# Elements visited between deadline checks.
+_DEADLINE_CHECK_EVERY = 512
+
+
+def _is_hidden(element: Any) -> bool:
+    if element.tag in _INVISIBLE_TAGS:
+        return True
+    if element.get("hidden") is not None or element.get("aria-hidden") == "true":
+        return True
+    style = element.get("style")
+    return bool(style and _HIDDEN_STYLE.search(style))
+
+
+def _html_to_text_lxml(html: str, max_chars: int, max_seconds: float) -> str:
+    if len(html) > max_chars:
+        logger.info(f"Truncating {len(html)} chars of HTML to {max_chars}")
+        html = html[:max_chars]
+    root = lxml_html.document_fromstring(html)
+
+    deadline = time.perf_counter() + max_seconds
+    parts: list[str] = []
+    # Depth-first walk; a tail is pushed before the children so it is emitted after them.
+    stack: list[Any] = [root]
+    visited = 0
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        visited += 1
+        if visited % _DEADLINE_CHECK_EVERY == 0 and time.perf_counter() > deadline:
+            logger.warning(f"HTML extraction stopped after {max_seconds}s")
+            break
+        if item is not root and item.tail:
+            stack.append(item.tail)
+        # Comments and processing instructions have no visible text of their own.
+        if not isinstance(item.tag, str) or _is_hidden(item):
+            continue
+        stack.extend(reversed(item))
+        if item.text:
+            parts.append(item.text)
+
+    # Same layout as BeautifulSoup's get_text(separator="\n", strip=True)
+    return "\n".join(stripped for part in parts if (stripped := part.strip()))
+
+
+def _html_to_text_bs4(html: str) -> str:
+    soup = BeautifulSoup(html, "lxml")
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+    # Get text with line breaks
+    return soup.get_text(separator="\n", strip=True)
+
+
 def _html_to_text(html: str) -> str:
-    """Convert HTML to clean plain text using BeautifulSoup."""
+    """Convert HTML to clean plain text with the configured engine."""
+    config = settings.parser
+    if config.html_engine == "lxml":
+        try:
+            return _clean_text(
+                _html_to_text_lxml(html, config.max_html_chars, config.max_html_seconds)
+            )
+        except Exception as e:
+            logger.warning(f"lxml HTML extraction failed, falling back to BeautifulSoup: {e}")
     try:
-        soup = BeautifulSoup(html, "lxml")
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        # Get text with line breaks
-        text = soup.get_text(separator="\n", strip=True)
-        return _clean_text(text)
+        return _clean_text(_html_to_text_bs4(html))
     except Exception:
         # Fallback to basic cleaning if BeautifulSoup fails
         return _clean_text(html)
+
+
+def parse_gmail_raw_message(message: dict) -> dict:
+    """
+    Turn a Gmail message resource fetched with format="raw" into an email record.
+
+    Args:
+            message: The Gmail API message resource with a base64url "raw" field.
+
+    Returns:
+            A dictionary with id, from, subject, date, and body fields.
+    """
+    raw_bytes = base64.urlsafe_b64decode(message["raw"])
+
+    # Parse email to extract headers and body
+    email_data = parse_email_from_raw(raw_bytes)
+    return {
+        "id": message["id"],
+        "from": email_data["from"],
+        "subject": email_data["subject"],
+        "date": email_data["date"],
+        "body": email_data["body"],
+    }
+
+
+def parse_gmail_metadata_message(message: dict) -> dict:
+    """
+    Turn a Gmail message resource fetched with format="metadata" into a header record.
+
+    Args:
+            message: The Gmail API message resource with payload headers and a snippet.
+
+    Returns:
+            A dictionary with id, from, subject, date, and snippet fields.
+    """
+    headers = {
+        header["name"].lower(): header["value"]
+        for header in message.get("payload", {}).get("headers", [])
+    }
+    return {
+        "id": message["id"],
+        "from": headers.get("from", "Unknown"),
+        "subject": headers.get("subject", "No Subject"),
+        "date": _format_date(headers.get("date")),
+        # Gmail returns snippets HTML-escaped (e.g. "&#39;")
+        "snippet": _clean_text(html.unescape(message.get("snippet", ""))),
+    }
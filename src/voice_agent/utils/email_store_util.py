@@ -0,0 +1,308 @@
+"""Local SQLite store of parsed Gmail messages and sync state."""
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+
+from voice_agent.config import settings
+from voice_agent.utils.logger_util import get_logger
+
+logger = get_logger(name="EmailStore")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS emails (
+    id TEXT PRIMARY KEY,
+    internal_date INTEGER NOT NULL,
+    sender TEXT,
+    subject TEXT,
+    date TEXT,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS emails_internal_date ON emails (internal_date);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class EmailStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        with self._lock:
+            self._conn.close()
+
+    def _get_state(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM sync_state WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def get_history_id(self) -> str | None:
+        """
+        Get the Gmail historyId the store was last synced to.
+
+        Args:
+                None
+
+        Returns:
+                The last seen historyId, or None if the store was never synced.
+        """
+        return self._get_state("history_id")
+
+    def set_history_id(self, history_id: str) -> None:
+        """
+        Record the Gmail historyId the store is now synced to.
+
+        Args:
+                history_id: The historyId returned by Gmail.
+
+        Returns:
+                None
+        """
+        self._set_state("history_id", str(history_id))
+
+    def get_synced_since(self) -> int | None:
+        """
+        Get the oldest internal date (epoch ms) covered by a full listing.
+
+        Args:
+                None
+
+        Returns:
+                The epoch milliseconds, or None if no window was synced yet.
+        """
+        value = self._get_state("synced_since")
+        return int(value) if value is not None else None
+
+    def set_synced_since(self, since_ms: int) -> None:
+        """
+        Record the oldest internal date (epoch ms) covered by a full listing.
+
+        Args:
+                since_ms: The window start in epoch milliseconds.
+
+        Returns:
+                None
+        """
+        self._set_state("synced_since", str(since_ms))
+
+    def missing_ids(self, message_ids: Iterable[str]) -> list[str]:
+        """
+        Return the ids that are not stored yet, keeping their order.
+
+        Args:
+                message_ids: Gmail message ids to check.
+
+        Returns:
+                The ids that still need to be fetched.
+        """
+        ids = list(message_ids)
+        if not ids:
+            return []
+        stored: set[str] = set()
+        with self._lock:
+            # Stay below SQLite's limit on bound parameters per statement.
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id FROM emails WHERE id IN ({placeholders})",  # noqa: S608
+                    chunk,
+                )
+                stored.update(row[0] for row in rows)
+        return [i for i in ids if i not in stored]
+
+    def oldest_date(self, message_ids: Iterable[str]) -> int | None:
+        """
+        Return the earliest internal date among the given stored emails.
+
+        Args:
+                message_ids: Gmail message ids to look at; ids not stored are ignored.
+
+        Returns:
+                The earliest internal date in epoch milliseconds, or None if none is stored.
+        """
+        ids = list(message_ids)
+        oldest: int | None = None
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                row = self._conn.execute(
+                    f"SELECT MIN(internal_date) FROM emails WHERE id IN ({placeholders})",  # noqa: S608
+                    chunk,
+                ).fetchone()
+                if row[0] is not None and (oldest is None or row[0] < oldest):
+                    oldest = row[0]
+        return oldest
+
+    def ids_since(self, since_ms: int) -> set[str]:
+        """
+        Return the ids of stored emails received at or after since_ms.
+
+        Args:
+                since_ms: The window start in epoch milliseconds.
+
+        Returns:
+                The set of stored message ids in the window.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM emails WHERE internal_date >= ?", (since_ms,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def upsert(self, records: Iterable[tuple[int, dict]]) -> None:
+        """
+        Insert or replace parsed emails.
+
+        Args:
+                records: Pairs of (internal date in epoch ms, email dict with
+                        id, from, subject, date and body).
+
+        Returns:
+                None
+        """
+        rows = [
+            (r["id"], internal_date, r["from"], r["subject"], r["date"], r["body"])
+            for internal_date, r in records
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO emails (id, internal_date, sender, subject, date, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete(self, message_ids: Iterable[str]) -> None:
+        """
+        Delete emails by id.
+
+        Args:
+                message_ids: Gmail message ids to remove.
+
+        Returns:
+                None
+        """
+        ids = [(i,) for i in message_ids]
+        if not ids:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM emails WHERE id = ?", ids)
+
+    def emails_since(self, since_ms: int, limit: int) -> list[dict]:
+        """
+        Return stored emails received at or after since_ms, newest first.
+
+        Args:
+                since_ms: The window start in epoch milliseconds.
+                limit: Maximum number of emails to return.
+
+        Returns:
+                A list of dicts with id, from, subject, date and body fields.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, sender, subject, date, body FROM emails "
+                "WHERE internal_date >= ? ORDER BY internal_date DESC, id LIMIT ?",
+                (since_ms, limit),
+            ).fetchall()
+        return [
+            {"id": row[0], "from": row[1], "subject": row[2], "date": row[3], "body": row[4]}
+            for row in rows
+        ]
+
+    def get_emails(self, message_ids: list[str]) -> list[dict]:
+        """
+        Return the stored emails with the given ids, in the order requested.
+
+        Args:
+                message_ids: Gmail message ids to look up.
+
+        Returns:
+                A list of dicts with id, from, subject, date and body fields for the
+                ids that are stored.
+        """
+        found: dict[str, dict] = {}
+        with self._lock:
+            for start in range(0, len(message_ids), 500):
+                chunk = message_ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT id, sender, subject, date, body FROM emails "
+                    f"WHERE id IN ({placeholders})",  # noqa: S608
+                    chunk,
+                )
+                for row in rows:
+                    found[row[0]] = {
+                        "id": row[0],
+                        "from": row[1],
+                        "subject": row[2],
+                        "date": row[3],
+                        "body": row[4],
+                    }
+        return [found[i] for i in message_ids if i in found]
+
+    def reset(self) -> None:
+        """
+        Drop all stored emails and sync state.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM emails")
+            self._conn.execute("DELETE FROM sync_state")
+
+
+_store: EmailStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_email_store() -> EmailStore:
+    """
+    Get the process-wide email store at the configured path.
+
+    Args:
+            None
+
+    Returns:
+            The shared EmailStore instance.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EmailStore(settings.store.path)
+            logger.info(f"Opened email store at {settings.store.path}")
+        return _store
@@ -1,5 +1,8 @@
 import json
 import os
+import tempfile
+import threading
+from datetime import UTC, datetime, timedelta
 
 import googleapiclient
 from google.auth.transport.requests import Request
@@ -17,6 +20,9 @@ def save_token_to_env(token_json: str) -> None:
     """
     Save Gmail OAuth token to .env file.
 
+    The file is rewritten through a temporary file and an atomic rename, so a crash
+    mid-write never leaves a truncated .env behind.
+
     Args:
             token_json: The token JSON string to save.
 
@@ -30,24 +36,50 @@ def save_token_to_env(token_json: str) -> None:
             existing_lines = [
                 line for line in f.readlines() if not line.startswith("GOOGLE__GMAIL_TOKEN=")
             ]
-    with open(env_file, "w") as f:
-        f.writelines(existing_lines)
-        if existing_lines and not existing_lines[-1].endswith("\n"):
-            f.write("\n")
-        f.write(f"GOOGLE__GMAIL_TOKEN={token_json}\n")
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(env_file)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.writelines(existing_lines)
+            if existing_lines and not existing_lines[-1].endswith("\n"):
+                f.write("\n")
+            f.write(f"GOOGLE__GMAIL_TOKEN={token_json}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, env_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
     logger.info("Saved GOOGLE__GMAIL_TOKEN to .env")
 
 
-def get_gmail_service() -> googleapiclient.discovery.Resource:
-    """
-    Authenticates using OAuth2. If no valid token is found, initiates the OAuth flow.
+_service: googleapiclient.discovery.Resource | None = None
+_credentials: Credentials | None = None
+_saved_token: str | None = None
+_lock = threading.Lock()
 
-    Args:
-            None
 
-    Returns:
-            Authenticated Gmail API service instance.
-    """
+def _persist_token(creds: Credentials) -> None:
+    global _saved_token
+    token_json = creds.to_json()
+    if token_json != _saved_token:
+        save_token_to_env(token_json)
+        _saved_token = token_json
+
+
+def _refresh_if_needed(creds: Credentials) -> None:
+    # Refresh ahead of expiry so no request pays for a refresh or a 401 round trip.
+    if not creds.refresh_token:
+        return
+    margin = timedelta(seconds=settings.google.token_refresh_margin)
+    now = datetime.now(UTC).replace(tzinfo=None)  # google-auth uses naive UTC expiry
+    if creds.expired or (creds.expiry is not None and creds.expiry - margin <= now):
+        creds.refresh(Request())
+        _persist_token(creds)
+        logger.info("Refreshed Gmail credentials")
+
+
+def _load_credentials() -> Credentials:
+    global _saved_token
     creds: Credentials | None = None  # cspell:ignore creds
     token_json = settings.google.gmail_token
     if token_json:
@@ -55,12 +87,11 @@ def get_gmail_service() -> googleapiclient.discovery.Resource:
             creds = Credentials.from_authorized_user_info(
                 json.loads(token_json), settings.google.scopes
             )
+            _saved_token = creds.to_json()
         except Exception as e:
             logger.error(f"Error loading token: {e}")
-    if creds and creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-        # creds is guaranteed to be non-None here due to the condition above
-        save_token_to_env(creds.to_json())  # type: ignore[union-attr]
+    if creds and creds.refresh_token:
+        _refresh_if_needed(creds)
     if not creds or not creds.valid:
         client_id = settings.google.client_id
         client_secret = settings.google.client_secret
@@ -83,6 +114,52 @@ def get_gmail_service() -> googleapiclient.discovery.Resource:
         # Request offline access to get a refresh token
         creds = flow.run_local_server(port=0)
         # creds is guaranteed to be non-None after OAuth flow
-        save_token_to_env(creds.to_json())  # type: ignore[union-attr]
+        _persist_token(creds)  # type: ignore[arg-type]
         logger.info("Authentication successful. Token saved.")
-    return build("gmail", "v1", credentials=creds)
+    return creds  # type: ignore[return-value]
+
+
+def get_gmail_service() -> googleapiclient.discovery.Resource:
+    """
+    Authenticates using OAuth2. If no valid token is found, initiates the OAuth flow.
+
+    The service is built once per process from the bundled static discovery document
+    and reused; later calls only refresh the credentials in memory when they are
+    about to expire.
+
+    Args:
+            None
+
+    Returns:
+            Authenticated Gmail API service instance.
+    """
+    global _service, _credentials
+    with _lock:
+        if _service is None or _credentials is None:
+            _credentials = _load_credentials()
+            _service = build(
+                "gmail",
+                "v1",
+                credentials=_credentials,
+                static_discovery=True,
+                cache_discovery=False,
+            )
+        else:
+            _refresh_if_needed(_credentials)
+        return _service
+
+
+def reset_gmail_service() -> None:
+    """
+    Drop the cached Gmail service so the next call rebuilds it.
+
+    Args:
+            None
+
+    Returns:
+            None
+    """
+    global _service, _credentials
+    with _lock:
+        _service = None
+        _credentials = None
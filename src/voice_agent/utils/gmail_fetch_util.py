@@ -0,0 +1,337 @@
+"""Batched, concurrent retrieval of Gmail messages."""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+
+from voice_agent.config import settings
+from voice_agent.utils.logger_util import get_logger
+from voice_agent.utils.parse_pool_util import parse_messages
+from voice_agent.utils.tracing_util import span
+
+logger = get_logger(name="GmailFetch")
+
+# Gmail rejects batches above 100 sub-requests and starts rate limiting well before that.
+MAX_BATCH_SIZE = 100
+# messages.list returns at most 500 ids per page.
+MAX_PAGE_SIZE = 500
+
+# Extra messages.get parameters per format. The metadata format only needs the headers
+# the summaries use, and the field mask drops everything else from the response.
+_FORMAT_PARAMS: dict[str, dict[str, Any]] = {
+    "metadata": {
+        "metadataHeaders": ["From", "Subject", "Date"],
+        "fields": "id,threadId,snippet,internalDate,payload/headers",
+    },
+}
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # One pool per process, so it is sized once from settings, not per caller.
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.gmail.max_concurrency),
+                thread_name_prefix="gmail-fetch",
+            )
+        return _executor
+
+
+def _thread_http(service: Any) -> Any:
+    # httplib2.Http is not thread-safe, so each worker thread gets its own authorized
+    # connection built on the service credentials. Fakes without credentials use None.
+    credentials = getattr(getattr(service, "_http", None), "credentials", None)
+    if credentials is None:
+        return None
+    http = getattr(_thread_local, "http", None)
+    if http is None or http.credentials is not credentials:
+        http = AuthorizedHttp(credentials, http=httplib2.Http())
+        _thread_local.http = http
+    return http
+
+
+def _get_message_request(service: Any, message_id: str, fmt: str) -> Any:
+    return (
+        service.users()
+        .messages()
+        .get(userId="me", id=message_id, format=fmt, **_FORMAT_PARAMS.get(fmt, {}))
+    )
+
+
+def fetch_messages_batched(
+    service: Any,
+    message_ids: list[str],
+    batch_size: int = 25,
+    max_retries: int = 3,
+    fmt: str = "raw",
+    http: Any = None,
+) -> list[dict]:
+    """
+    Fetch Gmail messages by id using batch HTTP requests.
+
+    Messages that fail inside a batch are retried one by one with exponential backoff.
+
+    Args:
+            service: Authenticated Gmail API service instance.
+            message_ids: Ids of the messages to fetch.
+            batch_size: Number of messages per batch request (1-100).
+            max_retries: Retries for each message that failed inside a batch.
+            fmt: Gmail message format to request (e.g. "raw").
+            http: Optional HTTP object to send the requests with.
+
+    Returns:
+            The message resources in the same order as message_ids. Messages that still
+            fail after retrying are logged and left out.
+    """
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    results: list[dict | None] = [None] * len(message_ids)
+    failed: list[int] = []
+
+    def on_response(request_id: str, response: dict, exception: Exception | None) -> None:
+        index = int(request_id)
+        if exception is not None:
+            failed.append(index)
+        else:
+            results[index] = response
+
+    for start in range(0, len(message_ids), batch_size):
+        batch = service.new_batch_http_request(callback=on_response)
+        for index in range(start, min(start + batch_size, len(message_ids))):
+            batch.add(_get_message_request(service, message_ids[index], fmt), request_id=str(index))
+        batch.execute(http=http)
+
+    for index in sorted(failed):
+        try:
+            results[index] = _get_message_request(service, message_ids[index], fmt).execute(
+                http=http, num_retries=max_retries
+            )
+        except Exception as e:
+            logger.error(f"Error fetching message {message_ids[index]}: {e}")
+
+    return [result for result in results if result is not None]
+
+
+async def execute_request(service: Any, request: Any) -> Any:
+    """
+    Execute a single Gmail API request on the fetch worker pool without blocking the loop.
+
+    Args:
+            service: Authenticated Gmail API service instance the request was built from.
+            request: The googleapiclient HttpRequest to execute.
+
+    Returns:
+            The decoded API response.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(),
+        contextvars.copy_context().run,
+        lambda: request.execute(http=_thread_http(service)),
+    )
+
+
+def _dated[T](transform: Callable[[dict], T], message: dict) -> tuple[int, T]:
+    return int(message.get("internalDate", 0)), transform(message)
+
+
+def with_internal_date[T](transform: Callable[[dict], T]) -> Callable[[dict], tuple[int, T]]:
+    """
+    Wrap a transform so it also returns the message's internalDate, as the store expects.
+
+    Unlike a lambda, the wrapper can be sent to the parse worker processes.
+
+    Args:
+            transform: Module-level function turning a message resource into a record.
+
+    Returns:
+            A function returning (internalDate in ms, transformed message).
+    """
+    return functools.partial(_dated, transform)
+
+
+def _fetch_and_transform[T](
+    service: Any,
+    message_ids: list[str],
+    transform: Callable[[dict], T],
+    batch_size: int,
+    max_retries: int,
+    fmt: str,
+    parse_in_pool: bool,
+) -> list[T]:
+    with span("gmail.fetch", messages=len(message_ids)):
+        messages = fetch_messages_batched(
+            service,
+            message_ids,
+            batch_size=batch_size,
+            max_retries=max_retries,
+            fmt=fmt,
+            http=_thread_http(service),
+        )
+    with span("email.parse", messages=len(messages)):
+        if parse_in_pool:
+            return parse_messages(transform, messages)
+        return [transform(message) for message in messages]
+
+
+async def fetch_messages_concurrently[T](
+    service: Any,
+    message_ids: list[str],
+    transform: Callable[[dict], T],
+    batch_size: int = 25,
+    max_retries: int = 3,
+    fmt: str = "raw",
+    parse_in_pool: bool = False,
+) -> list[T]:
+    """
+    Fetch Gmail messages in concurrent batches on a bounded worker pool.
+
+    At most GMAIL__MAX_CONCURRENCY batches run at once, the size of the fetch pool;
+    the others wait in its queue.
+
+    Each worker fetches one batch and immediately runs transform over it, so parsing of
+    one batch overlaps with the network round trips of the others.
+
+    Args:
+            service: Authenticated Gmail API service instance.
+            message_ids: Ids of the messages to fetch.
+            transform: Function applied to every fetched message resource in the worker.
+            batch_size: Number of messages per batch request (1-100).
+            max_retries: Retries for each message that failed inside a batch.
+            fmt: Gmail message format to request (e.g. "raw").
+            parse_in_pool: Run transform in the parse worker processes (it must be
+                    picklable); for CPU-heavy transforms such as parsing raw emails.
+
+    Returns:
+            The transformed messages in the same order as message_ids.
+    """
+    if not message_ids:
+        return []
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    batches = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                executor,
+                # Carry the caller's trace into the worker thread.
+                contextvars.copy_context().run,
+                _fetch_and_transform,
+                service,
+                message_ids[i : i + batch_size],
+                transform,
+                batch_size,
+                max_retries,
+                fmt,
+                parse_in_pool,
+            )
+            for i in range(0, len(message_ids), batch_size)
+        )
+    )
+    return [item for batch in batches for item in batch]
+
+
+async def iter_message_ids(service: Any, query: str, budget: int) -> AsyncIterator[list[str]]:
+    """
+    Page through messages.list with nextPageToken, yielding one page of ids at a time.
+
+    Args:
+            service: Authenticated Gmail API service instance.
+            query: Gmail search query.
+            budget: Maximum number of ids to yield across all pages.
+
+    Yields:
+            Lists of message ids in listing order (newest first).
+    """
+    remaining = budget
+    page_token: str | None = None
+    while remaining > 0:
+        with span("gmail.list"):
+            response = await execute_request(
+                service,
+                service.users()
+                .messages()
+                .list(
+                    userId="me",
+                    q=query,
+                    maxResults=min(remaining, MAX_PAGE_SIZE),
+                    pageToken=page_token,
+                ),
+            )
+        ids = [msg["id"] for msg in response.get("messages", [])][:remaining]
+        if ids:
+            yield ids
+        remaining -= len(ids)
+        page_token = response.get("nextPageToken")
+        if not page_token or not ids:
+            return
+
+
+async def iter_messages[T](
+    service: Any,
+    query: str,
+    transform: Callable[[dict], T],
+    budget: int,
+    batch_size: int = 25,
+    max_retries: int = 3,
+    max_concurrency: int = 2,
+    fmt: str = "raw",
+    parse_in_pool: bool = False,
+) -> AsyncIterator[list[T]]:
+    """
+    Stream every message matching query, one transformed batch at a time.
+
+    Pages are listed lazily and at most max_concurrency batches are in flight, so memory
+    stays flat however many messages match. Batches are yielded in listing order.
+
+    Args:
+            service: Authenticated Gmail API service instance.
+            query: Gmail search query.
+            transform: Function applied to every fetched message resource in the worker.
+            budget: Maximum number of messages to fetch overall.
+            batch_size: Number of messages per batch request (1-100).
+            max_retries: Retries for each message that failed inside a batch.
+            max_concurrency: Maximum number of batch requests in flight at once.
+            fmt: Gmail message format to request (e.g. "raw").
+            parse_in_pool: Run transform in the parse worker processes (it must be
+                    picklable); for CPU-heavy transforms such as parsing raw emails.
+
+    Yields:
+            Lists of transformed messages.
+    """
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    pending: deque[asyncio.Future[list[T]]] = deque()
+    async for page in iter_message_ids(service, query, budget):
+        for start in range(0, len(page), batch_size):
+            pending.append(
+                loop.run_in_executor(
+                    executor,
+                    contextvars.copy_context().run,
+                    _fetch_and_transform,
+                    service,
+                    page[start : start + batch_size],
+                    transform,
+                    batch_size,
+                    max_retries,
+                    fmt,
+                    parse_in_pool,
+                )
+            )
+            while len(pending) > max_concurrency:
+                yield await pending.popleft()
+    while pending:
+        yield await pending.popleft()
@@ -0,0 +1,215 @@
+"""Incremental sync of the local email store through the Gmail history API."""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from googleapiclient.errors import HttpError
+
+from voice_agent.config import settings
+from voice_agent.utils.email_store_util import EmailStore
+from voice_agent.utils.gmail_fetch_util import (
+    execute_request,
+    fetch_messages_concurrently,
+    iter_message_ids,
+    with_internal_date,
+)
+from voice_agent.utils.logger_util import get_logger
+
+if TYPE_CHECKING:
+    from voice_agent.utils.mailbox_watch_util import MailboxWatcher
+
+logger = get_logger(name="GmailSync")
+
+# messages.list skips these by default, so the history deltas must skip them too.
+_EXCLUDED_LABELS = {"SPAM", "TRASH"}
+
+
+class HistoryExpiredError(Exception):
+    """Raised when Gmail no longer has history for the stored historyId."""
+
+
+@dataclass
+class HistoryChanges:
+    """
+    Messages added to and deleted from the mailbox between two historyIds.
+
+    An id in both added and deleted was deleted after it was added.
+    """
+
+    start_history_id: str
+    history_id: str
+    added: list[str] = field(default_factory=list)
+    deleted: set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.deleted)
+
+
+async def _store_messages(
+    service: Any, store: EmailStore, message_ids: list[str], transform: Callable[[dict], dict]
+) -> None:
+    missing = store.missing_ids(message_ids)
+    if not missing:
+        return
+    records = await fetch_messages_concurrently(
+        service,
+        missing,
+        with_internal_date(transform),
+        batch_size=settings.gmail.batch_size,
+        max_retries=settings.gmail.max_retries,
+        parse_in_pool=True,
+    )
+    store.upsert(records)
+    logger.info(f"Stored {len(records)} new email(s)")
+
+
+async def _full_sync(
+    service: Any,
+    store: EmailStore,
+    query: str,
+    since_ms: int,
+    max_results: int,
+    transform: Callable[[dict], dict],
+) -> None:
+    # Read the historyId before listing so changes made during the listing are
+    # picked up by the next incremental sync instead of being lost.
+    profile = await execute_request(service, service.users().getProfile(userId="me"))
+    listed: list[str] = []
+    async for page in iter_message_ids(service, query, max_results):
+        await _store_messages(service, store, page, transform)
+        listed.extend(page)
+
+    # A complete listing covers the whole window. One cut off at max_results only
+    # covers back to its oldest message, so a later request reaching further back
+    # lists again instead of trusting the history deltas for mail never stored.
+    covered_since = since_ms
+    if len(listed) >= max_results:
+        oldest = store.oldest_date(listed)
+        covered_since = max(since_ms, oldest) if oldest is not None else int(time.time() * 1000)
+    # The covered part of the window tells us which stored emails in it are gone.
+    store.delete(store.ids_since(covered_since) - set(listed))
+    store.set_synced_since(covered_since)
+    store.set_history_id(profile["historyId"])
+
+
+async def list_history_changes(service: Any, start_history_id: str) -> HistoryChanges:
+    """
+    List the messages added to and deleted from the mailbox since a historyId.
+
+    Messages moved to spam or trash count as deleted, like messages.list treats them,
+    and messages restored from there count as added.
+
+    Args:
+            service: Authenticated Gmail API service instance.
+            start_history_id: The historyId the changes are listed from.
+
+    Returns:
+            The changes, up to the latest historyId reported by Gmail.
+
+    Raises:
+            HistoryExpiredError: Gmail no longer has history for start_history_id.
+    """
+    changes = HistoryChanges(start_history_id=start_history_id, history_id=start_history_id)
+    added: dict[str, None] = {}
+    page_token: str | None = None
+    while True:
+        try:
+            response = await execute_request(
+                service,
+                service.users()
+                .history()
+                .list(
+                    userId="me",
+                    startHistoryId=start_history_id,
+                    historyTypes=["messageAdded", "messageDeleted", "labelAdded", "labelRemoved"],
+                    pageToken=page_token,
+                ),
+            )
+        except HttpError as e:
+            if e.resp.status == 404:
+                raise HistoryExpiredError(start_history_id) from e
+            raise
+        for record in response.get("history", []):
+            for item in record.get("messagesAdded", []):
+                message = item["message"]
+                if not _EXCLUDED_LABELS & set(message.get("labelIds", [])):
+                    added[message["id"]] = None
+            for item in record.get("messagesDeleted", []):
+                changes.deleted.add(item["message"]["id"])
+            for item in record.get("labelsAdded", []):
+                if _EXCLUDED_LABELS & set(item.get("labelIds", [])):
+                    changes.deleted.add(item["message"]["id"])
+            for item in record.get("labelsRemoved", []):
+                message = item["message"]
+                # Restored from spam or trash, and not still in the other one.
+                if _EXCLUDED_LABELS & set(item.get("labelIds", [])) and not (
+                    _EXCLUDED_LABELS & set(message.get("labelIds", []))
+                ):
+                    changes.deleted.discard(message["id"])
+                    added[message["id"]] = None
+        changes.history_id = str(response.get("historyId", changes.history_id))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            break
+    changes.added = list(added)
+    return changes
+
+
+async def _apply_changes(
+    service: Any, store: EmailStore, changes: HistoryChanges, transform: Callable[[dict], dict]
+) -> None:
+    added = [i for i in changes.added if i not in changes.deleted]
+    await _store_messages(service, store, added, transform)
+    store.delete(changes.deleted)
+    store.set_history_id(changes.history_id)
+    if changes:
+        logger.info(f"History sync: {len(changes.added)} added, {len(changes.deleted)} deleted")
+
+
+async def sync_emails(
+    service: Any,
+    store: EmailStore,
+    query: str,
+    since_ms: int,
+    max_results: int,
+    transform: Callable[[dict], dict],
+    watcher: "MailboxWatcher | None" = None,
+) -> list[dict]:
+    """
+    Bring the local store up to date and return the emails of the requested window.
+
+    The first request for a window lists it in full and fetches only the messages that
+    are not stored yet. Later requests inside an already synced window only apply the
+    deltas reported by users.history.list since the last seen historyId. When a mailbox
+    watcher already knows those deltas, Gmail is only asked for the new messages, and
+    not at all if the mailbox is unchanged.
+
+    Args:
+            service: Authenticated Gmail API service instance.
+            store: The local email store.
+            query: Gmail search query selecting the window (e.g. "newer_than:2d").
+            since_ms: Start of the same window in epoch milliseconds.
+            max_results: Maximum number of emails to return.
+            transform: Function turning a raw message resource into an email dict.
+            watcher: Background watcher of the mailbox historyId, if running.
+
+    Returns:
+            Parsed emails in the window, newest first.
+    """
+    history_id = store.get_history_id()
+    synced_since = store.get_synced_since()
+    if history_id is None or synced_since is None or since_ms < synced_since:
+        await _full_sync(service, store, query, since_ms, max_results, transform)
+    else:
+        changes = watcher.changes_since(history_id) if watcher is not None else None
+        try:
+            if changes is None:
+                changes = await list_history_changes(service, history_id)
+            await _apply_changes(service, store, changes, transform)
+        except HistoryExpiredError:
+            logger.warning("Stored historyId expired; resyncing the window from scratch")
+            store.reset()
+            await _full_sync(service, store, query, since_ms, max_results, transform)
+    return store.emails_since(since_ms, max_results)
@@ -0,0 +1,226 @@
+"""Background change detection for the mailbox, so unchanged mailboxes skip Gmail."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from contextlib import suppress
+from typing import Any
+
+from voice_agent.config import settings
+from voice_agent.utils.gmail_auth_util import get_gmail_service
+from voice_agent.utils.gmail_fetch_util import execute_request
+from voice_agent.utils.gmail_sync_util import (
+    HistoryChanges,
+    HistoryExpiredError,
+    list_history_changes,
+)
+from voice_agent.utils.logger_util import get_logger
+
+logger = get_logger(name="MailboxWatch")
+
+
+class MailboxWatcher:
+    """
+    Tracks the mailbox historyId and the messages added and deleted since it was first seen.
+
+    The watcher polls users.getProfile, which is far cheaper than listing mail, and only
+    asks users.history.list for the changes when the historyId has moved. A Gmail
+    users.watch push consumer can call notify() to make it check right away.
+    """
+
+    def __init__(
+        self,
+        get_service: Callable[[], Any] = get_gmail_service,
+        poll_interval: float = 10.0,
+        max_age: float = 30.0,
+        max_changes: int = 100,
+    ) -> None:
+        self.get_service = get_service
+        self.poll_interval = poll_interval
+        self.max_age = max_age
+        self.history_id: str | None = None
+        self.messages_total: int | None = None
+        # Contiguous change sets, oldest first; the first starts at the baseline historyId.
+        self._changes: deque[HistoryChanges] = deque(maxlen=max(1, max_changes))
+        self._baseline: str | None = None
+        self._checked_at: float | None = None
+        self._invalidated_at = float("-inf")
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the last successful check is recent enough to answer requests."""
+        return self._checked_at is not None and time.monotonic() - self._checked_at <= self.max_age
+
+    def changes_since(self, history_id: str) -> HistoryChanges | None:
+        """
+        Get the changes between a historyId and the latest one seen, without calling Gmail.
+
+        Args:
+                history_id: The historyId a consumer (e.g. the email store) last synced to.
+
+        Returns:
+                The added and deleted message ids, empty if the mailbox is unchanged, or
+                None if the watcher is stale or does not cover history_id.
+        """
+        if not self.is_fresh or self.history_id is None or self._baseline is None:
+            return None
+        start, current = int(history_id), int(self.history_id)
+        if start < int(self._baseline) or start > current:
+            return None
+        changes = HistoryChanges(start_history_id=history_id, history_id=self.history_id)
+        added: dict[str, None] = {}
+        for entry in self._changes:
+            # Changes up to history_id are already applied; applying them again is harmless.
+            if int(entry.history_id) > start:
+                # Merge in order, so a message restored after an earlier delete is added.
+                changes.deleted -= set(entry.added) - entry.deleted
+                changes.deleted |= entry.deleted
+                added.update(dict.fromkeys(entry.added))
+        changes.added = list(added)
+        return changes
+
+    def unchanged_since(self, history_id: str) -> bool:
+        """
+        Check whether the mailbox is known to be unchanged since a historyId.
+
+        Args:
+                history_id: The historyId a consumer last saw.
+
+        Returns:
+                True if the watcher is fresh and the mailbox has not moved past history_id.
+        """
+        return self.is_fresh and self.history_id is not None and self.history_id == history_id
+
+    def notify(self, history_id: str | None = None) -> None:
+        """
+        Signal that the mailbox changed, e.g. from a users.watch Pub/Sub notification.
+
+        Args:
+                history_id: The historyId carried by the notification, if any.
+
+        Returns:
+                None
+        """
+        if history_id is None or self.history_id is None or int(history_id) > int(self.history_id):
+            # Until the next check, requests must not rely on the outdated view.
+            self._checked_at = None
+            self._invalidated_at = time.monotonic()
+        if self._wake is not None:
+            self._wake.set()
+
+    async def poll(self) -> bool:
+        """
+        Check the mailbox once and record the changes since the previous check.
+
+        Args:
+                None
+
+        Returns:
+                Whether the historyId moved since the previous check.
+        """
+        checked_at = time.monotonic()
+        service = await asyncio.to_thread(self.get_service)
+        profile = await execute_request(service, service.users().getProfile(userId="me"))
+        history_id = str(profile["historyId"])
+        self.messages_total = profile.get("messagesTotal")
+        changed = self.history_id is not None and history_id != self.history_id
+        if self.history_id is None:
+            self._baseline = history_id
+        elif changed:
+            try:
+                changes = await list_history_changes(service, self.history_id)
+            except HistoryExpiredError:
+                logger.warning("Watched historyId expired; restarting change tracking")
+                self._changes.clear()
+                self._baseline = history_id
+            else:
+                if len(self._changes) == self._changes.maxlen:
+                    self._baseline = self._changes[1].start_history_id
+                self._changes.append(changes)
+                history_id = max(history_id, changes.history_id, key=int)
+                logger.info(
+                    f"Mailbox changed to historyId {history_id}: "
+                    f"{len(changes.added)} added, {len(changes.deleted)} deleted"
+                )
+        self.history_id = history_id
+        # A notification that arrived mid-check may not be covered by this check.
+        self._checked_at = checked_at if checked_at >= self._invalidated_at else None
+        return changed
+
+    async def _run(self) -> None:
+        wake = self._wake = asyncio.Event()
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                self._checked_at = None
+                logger.warning(f"Mailbox check failed: {e}")
+            with suppress(TimeoutError):
+                await asyncio.wait_for(wake.wait(), timeout=self.poll_interval)
+            wake.clear()
+
+    def start(self) -> None:
+        """
+        Start polling in the running event loop, unless already polling there.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._checked_at = None
+        self._task = loop.create_task(self._run(), name="mailbox-watch")
+        logger.info(f"Watching the mailbox every {self.poll_interval:.0f}s")
+
+    async def stop(self) -> None:
+        """
+        Stop polling.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        self._checked_at = None
+
+
+_watcher: MailboxWatcher | None = None
+_watcher_lock = threading.Lock()
+
+
+def get_mailbox_watcher() -> MailboxWatcher | None:
+    """
+    Get the process-wide mailbox watcher, starting it in the running event loop.
+
+    Args:
+            None
+
+    Returns:
+            The shared MailboxWatcher, or None if watching is disabled.
+    """
+    global _watcher
+    if not settings.mailbox_watch.enabled:
+        return None
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = MailboxWatcher(
+                poll_interval=settings.mailbox_watch.poll_interval,
+                max_age=settings.mailbox_watch.max_age,
+                max_changes=settings.mailbox_watch.max_changes,
+            )
+    _watcher.start()
+    return _watcher
@@ -0,0 +1,302 @@
+"""Prometheus-style counters and histograms, served over HTTP in text exposition format."""
+
+import math
+import threading
+from collections.abc import Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from voice_agent.utils.logger_util import get_logger
+
+logger = get_logger(name="Metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Seconds; spans range from sub-millisecond parsing to minute-long summaries.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+type LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """
+        Render the metric in Prometheus text exposition format.
+
+        Args:
+                None
+
+        Returns:
+                The HELP and TYPE lines followed by one line per sample.
+        """
+        header = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        return "\n".join(header + self._samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        Increase the counter for a label combination.
+
+        Args:
+                amount: Non-negative amount to add.
+                **labels: A value for each label name.
+
+        Returns:
+                None
+        """
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """
+        Get the current value for a label combination.
+
+        Args:
+                **labels: A value for each label name.
+
+        Returns:
+                The counter value (0 if never increased).
+        """
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: count in each bucket (non-cumulative), sum, count.
+        self._values: dict[LabelValues, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Record one observation for a label combination.
+
+        Args:
+                value: The observed value, e.g. a duration in seconds.
+                **labels: A value for each label name.
+
+        Returns:
+                None
+        """
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), None)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            if index is not None:
+                counts[index] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def count(self, **labels: str) -> int:
+        """
+        Get the number of observations for a label combination.
+
+        Args:
+                **labels: A value for each label name.
+
+        Returns:
+                The observation count.
+        """
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, (list(c), s, n)) for key, (c, s, n) in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(total)}")
+            lines.append(f"{self.name}_count{plain} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register[M: _Metric](self, metric: M) -> M:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing  # type: ignore[return-value]
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """
+        Get or create a counter.
+
+        Args:
+                name: Metric name.
+                documentation: HELP text.
+                labelnames: Names of the labels every sample carries.
+
+        Returns:
+                The registered counter.
+        """
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """
+        Get or create a histogram.
+
+        Args:
+                name: Metric name.
+                documentation: HELP text.
+                labelnames: Names of the labels every sample carries.
+                buckets: Upper bounds of the buckets.
+
+        Returns:
+                The registered histogram.
+        """
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Render every registered metric in Prometheus text exposition format.
+
+        Args:
+                None
+
+        Returns:
+                The exposition text.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return "".join(metric.render() + "\n" for metric in metrics)
+
+
+REGISTRY = MetricsRegistry()
+
+SPAN_DURATION = REGISTRY.histogram(
+    "voice_agent_span_duration_seconds",
+    "Duration of traced stages (bot commands, MCP calls, Gmail, parsing, OpenAI, TTS)",
+    ["span", "status"],
+)
+OPENAI_REQUESTS = REGISTRY.counter(
+    "voice_agent_openai_requests_total", "OpenAI chat completions", ["model"]
+)
+OPENAI_TOKENS = REGISTRY.counter(
+    "voice_agent_openai_tokens_total",
+    "OpenAI tokens used, from completion.usage",
+    ["model", "type"],
+)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        # Scrapes every few seconds would drown the application log.
+        pass
+
+
+def start_metrics_server(
+    host: str, port: int, registry: MetricsRegistry = REGISTRY
+) -> ThreadingHTTPServer:
+    """
+    Serve the metrics at http://host:port/metrics from a background thread.
+
+    Args:
+            host: Interface to bind.
+            port: TCP port to bind (0 picks a free port).
+            registry: The registry to expose.
+
+    Returns:
+            The running server; call shutdown() to stop it.
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
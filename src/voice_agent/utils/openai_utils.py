@@ -1,34 +1,133 @@
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from typing import Any
 
+from voice_agent.utils.metrics_util import OPENAI_REQUESTS, OPENAI_TOKENS
+from voice_agent.utils.tracing_util import span
 
-def get_openai_completion(
+
+def record_usage(model: str, usage: Any) -> None:
+    """
+    Count an OpenAI request and the tokens reported in its usage.
+
+    Args:
+            model: The model name the request was made with.
+            usage: The completion's usage object, if any.
+
+    Returns:
+            None
+    """
+    OPENAI_REQUESTS.inc(model=model)
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if isinstance(tokens, int) and tokens > 0:
+            OPENAI_TOKENS.inc(tokens, model=model, type=kind)
+
+
+@dataclass
+class AssistantToolCall:
+    id: str = ""
+    name: str = ""
+    arguments: str = ""
+
+
+@dataclass
+class AssistantMessage:
+    content: str = ""
+    tool_calls: list[AssistantToolCall] = field(default_factory=list)
+
+
+async def get_openai_completion_async(
+    openai_client: Any,
+    model: str,
+    messages: list[dict],
+    tools: list | None = None,
+    tool_choice: str = "auto",
+    temperature: float = 0.2,
+) -> Any:
+    """
+    Wrapper for AsyncOpenAI chat.completions.create that does not block the event loop.
+
+    Args:
+            openai_client: The AsyncOpenAI client instance.
+            model: The model name to use.
+            messages: The list of messages for the chat completion.
+            tools: Optional list of tools for tool-using models.
+            tool_choice: Tool choice strategy, default is "auto".
+            temperature: Sampling temperature, default is 0.2.
+
+    Returns:
+            The OpenAI chat completion.
+    """
+    kwargs: dict[str, Any] = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+    }
+    if tools is not None:
+        kwargs["tools"] = tools
+        kwargs["tool_choice"] = tool_choice
+    with span("openai.completion", model=model):
+        completion = await openai_client.chat.completions.create(**kwargs)
+    record_usage(model, getattr(completion, "usage", None))
+    return completion
+
+
+async def stream_openai_completion(
     openai_client: Any,
     model: str,
     messages: list[dict],
+    on_text: Callable[[str], Awaitable[None]],
     tools: list | None = None,
     tool_choice: str = "auto",
     temperature: float = 0.2,
-) -> dict:
+) -> AssistantMessage:
     """
-    Wrapper for OpenAI chat.completions.create.
+    Stream an AsyncOpenAI chat completion, reporting the text as it arrives.
 
     Args:
-            openai_client: The OpenAI client instance.
+            openai_client: The AsyncOpenAI client instance.
             model: The model name to use.
             messages: The list of messages for the chat completion.
+            on_text: Awaited with the accumulated text after every content delta.
             tools: Optional list of tools for tool-using models.
             tool_choice: Tool choice strategy, default is "auto".
             temperature: Sampling temperature, default is 0.2.
 
     Returns:
-            The OpenAI API response as a dictionary.
+            The assembled assistant message with its content and tool calls.
     """
-    kwargs = {
+    kwargs: dict[str, Any] = {
         "model": model,
         "messages": messages,
         "temperature": temperature,
+        "stream": True,
+        # The last chunk then carries the usage of the whole request, with no choices.
+        "stream_options": {"include_usage": True},
     }
     if tools is not None:
         kwargs["tools"] = tools
         kwargs["tool_choice"] = tool_choice
-    return openai_client.chat.completions.create(**kwargs)
+
+    message = AssistantMessage()
+    tool_calls: dict[int, AssistantToolCall] = {}
+    usage = None
+    with span("openai.completion", model=model, stream=True):
+        stream = await openai_client.chat.completions.create(**kwargs)
+        async for chunk in stream:
+            usage = getattr(chunk, "usage", None) or usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            for tc in getattr(delta, "tool_calls", None) or []:
+                call = tool_calls.setdefault(tc.index, AssistantToolCall())
+                call.id = tc.id or call.id
+                if tc.function is not None:
+                    call.name += tc.function.name or ""
+                    call.arguments += tc.function.arguments or ""
+            if delta.content:
+                message.content += delta.content
+                await on_text(message.content)
+    record_usage(model, usage)
+    message.tool_calls = [tool_calls[i] for i in sorted(tool_calls)]
+    return message
@@ -0,0 +1,104 @@
+"""Process pool that parses fetched raw emails on the server's share of the cores."""
+
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from voice_agent.config import settings
+from voice_agent.utils.logger_util import get_logger
+
+logger = get_logger(name="ParsePool")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    workers = settings.parser.pool_workers
+    cpus = os.cpu_count() or 1
+    if workers <= 0:
+        # Every warm MCP server in the bot's pool starts its own parse pool.
+        return cpus // max(1, settings.mcp_pool.size)
+    return min(workers, cpus)
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    size = _pool_size()
+    if size <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # The server runs fetch threads, and forking a threaded process can deadlock,
+            # so workers start from a clean interpreter.
+            _pool = ProcessPoolExecutor(
+                max_workers=size, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started parse pool with {size} worker process(es)")
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _transform_chunk[T](transform: Callable[[dict], T], messages: list[dict]) -> list[T]:
+    return [transform(message) for message in messages]
+
+
+def parse_messages[T](transform: Callable[[dict], T], messages: list[dict]) -> list[T]:
+    """
+    Apply a parsing function to fetched message resources, in worker processes if worthwhile.
+
+    Batches smaller than the configured minimum are parsed in-process, where pickling
+    the messages would cost more than it saves. Larger batches are split into chunks so
+    each worker round trip carries several messages. If the pool breaks (e.g. a worker
+    was killed), the batch is parsed in-process and a new pool is started next time.
+
+    Args:
+            transform: Picklable module-level function turning one message into a record.
+            messages: The fetched message resources.
+
+    Returns:
+            The transformed messages in the same order.
+    """
+    config = settings.parser
+    pool = _get_pool() if len(messages) >= config.pool_min_batch else None
+    if pool is None:
+        return _transform_chunk(transform, messages)
+
+    chunk_size = max(1, config.pool_chunk_size)
+    try:
+        futures = [
+            pool.submit(_transform_chunk, transform, messages[i : i + chunk_size])
+            for i in range(0, len(messages), chunk_size)
+        ]
+        return [record for future in futures for record in future.result()]
+    except BrokenProcessPool as e:
+        logger.warning(f"Parse pool failed, parsing in-process: {e}")
+        _discard_pool(pool)
+        return _transform_chunk(transform, messages)
+
+
+def shutdown_parse_pool() -> None:
+    """
+    Stop the parse worker processes, if any were started.
+
+    Args:
+            None
+
+    Returns:
+            None
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
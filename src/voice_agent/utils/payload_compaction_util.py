@@ -0,0 +1,203 @@
+"""Token-budgeted compaction of email JSON payloads before LLM calls."""
+
+import json
+import re
+from dataclasses import dataclass, field
+
+# Rough but stable estimate for English text with OpenAI tokenizers.
+_CHARS_PER_TOKEN = 4
+_TRUNCATION_MARKER = " [truncated]"
+_BODY_FIELDS = ("body", "snippet")
+_AUTOMATED_SENDER = re.compile(
+    r"no-?reply|do-?not-?reply|newsletter|notifications?@|mailer|marketing|news@|digest",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class CompactionReport:
+    emails_in: int = 0
+    emails_kept: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+    bodies_truncated: int = 0
+    dropped_fields: list[str] = field(default_factory=list)
+    dropped_emails: list[dict] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        """Whether the budget cut anything; dropping the requested fields does not count."""
+        return bool(self.bodies_truncated or self.dropped_emails)
+
+    def summary(self) -> str:
+        """
+        Describe what was cut in one line.
+
+        Args:
+                None
+
+        Returns:
+                A human readable description of the compaction.
+        """
+        parts = [
+            f"kept {self.emails_kept}/{self.emails_in} emails",
+            f"~{self.tokens_after}/{self.tokens_before} tokens",
+        ]
+        if self.bodies_truncated:
+            parts.append(f"truncated {self.bodies_truncated} bodies")
+        if self.dropped_emails:
+            senders = ", ".join(str(e.get("from", "?")) for e in self.dropped_emails[:5])
+            more = len(self.dropped_emails) - 5
+            parts.append(
+                f"omitted {len(self.dropped_emails)} low-priority emails ({senders}"
+                + (f" and {more} more)" if more > 0 else ")")
+            )
+        return "; ".join(parts)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in text.
+
+    Args:
+            text: The text to measure.
+
+    Returns:
+            The approximate token count.
+    """
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def _email_tokens(email: dict) -> int:
+    return estimate_tokens(json.dumps(email, ensure_ascii=False))
+
+
+def _priority(email: dict) -> int:
+    # Lower is more important: people first, automated senders and bulk mail last.
+    score = 0
+    if _AUTOMATED_SENDER.search(str(email.get("from", ""))):
+        score += 2
+    if any("unsubscribe" in str(email.get(f, "")).lower() for f in _BODY_FIELDS):
+        score += 1
+    return score
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[: cut if cut > max_chars // 2 else max_chars].rstrip() + _TRUNCATION_MARKER
+
+
+def _truncate_bodies(email: dict, max_tokens: int) -> bool:
+    truncated = False
+    for name in _BODY_FIELDS:
+        value = email.get(name)
+        if isinstance(value, str):
+            shortened = _truncate(value, max_tokens)
+            if shortened != value:
+                email[name] = shortened
+                truncated = True
+    return truncated
+
+
+def compact_emails(
+    emails: list[dict],
+    token_budget: int,
+    max_body_tokens: int,
+    min_body_tokens: int = 60,
+    drop_fields: tuple[str, ...] | list[str] = (),
+) -> tuple[list[dict], CompactionReport]:
+    """
+    Fit a list of emails into a token budget.
+
+    The drop_fields are always removed first. Then, until the payload fits: cap every
+    body at max_body_tokens, shrink the bodies of low-priority emails down to
+    min_body_tokens, then omit the lowest-priority emails entirely. The original order
+    is preserved.
+
+    Args:
+            emails: Email dicts as returned by get_emails.
+            token_budget: Maximum estimated tokens of the resulting JSON.
+            max_body_tokens: Cap for any single body or snippet.
+            min_body_tokens: Size low-priority bodies are shrunk to before dropping emails.
+            drop_fields: Keys removed from every email (e.g. "id" for plain summaries).
+
+    Returns:
+            The compacted emails and a report of what was cut.
+    """
+    report = CompactionReport(emails_in=len(emails))
+    report.tokens_before = estimate_tokens(json.dumps(emails, ensure_ascii=False))
+
+    compacted = [{k: v for k, v in email.items() if k not in drop_fields} for email in emails]
+    report.dropped_fields = sorted({k for email in emails for k in email if k in drop_fields})
+
+    truncated: set[int] = set()
+    for index, email in enumerate(compacted):
+        if _truncate_bodies(email, max_body_tokens):
+            truncated.add(index)
+
+    sizes = [_email_tokens(email) for email in compacted]
+    # Two brackets and a ", " separator per email.
+    total = 2 + sum(sizes) + 2 * max(0, len(sizes) - 1)
+    # Least important (and, among equals, oldest) first.
+    by_value = sorted(range(len(compacted)), key=lambda i: (-_priority(compacted[i]), -i))
+
+    for index in by_value:
+        if total <= token_budget:
+            break
+        if _truncate_bodies(compacted[index], min_body_tokens):
+            truncated.add(index)
+            new_size = _email_tokens(compacted[index])
+            total -= sizes[index] - new_size
+            sizes[index] = new_size
+
+    dropped: set[int] = set()
+    for index in by_value:
+        if total <= token_budget or len(dropped) == len(compacted) - 1:
+            break
+        dropped.add(index)
+        total -= sizes[index] + 2
+
+    kept = [email for i, email in enumerate(compacted) if i not in dropped]
+    report.dropped_emails = [emails[i] for i in sorted(dropped)]
+    report.bodies_truncated = len(truncated - dropped)
+    report.emails_kept = len(kept)
+    report.tokens_after = estimate_tokens(json.dumps(kept, ensure_ascii=False))
+    return kept, report
+
+
+def compact_emails_json(
+    emails_json: str,
+    token_budget: int,
+    max_body_tokens: int,
+    min_body_tokens: int = 60,
+    drop_fields: tuple[str, ...] | list[str] = (),
+) -> tuple[str, CompactionReport]:
+    """
+    Compact a get_emails JSON payload to a token budget.
+
+    Payloads that are not a JSON array (e.g. tool errors) are returned unchanged.
+
+    Args:
+            emails_json: JSON array of emails as returned by get_emails.
+            token_budget: Maximum estimated tokens of the resulting JSON.
+            max_body_tokens: Cap for any single body or snippet.
+            min_body_tokens: Size low-priority bodies are shrunk to before dropping emails.
+            drop_fields: Keys removed from every email.
+
+    Returns:
+            The compacted JSON string and a report of what was cut.
+    """
+    try:
+        emails = json.loads(emails_json)
+    except ValueError:
+        emails = None
+    if not isinstance(emails, list) or not all(isinstance(e, dict) for e in emails):
+        tokens = estimate_tokens(emails_json)
+        return emails_json, CompactionReport(tokens_before=tokens, tokens_after=tokens)
+    kept, report = compact_emails(
+        emails, token_budget, max_body_tokens, min_body_tokens, drop_fields
+    )
+    return json.dumps(kept, ensure_ascii=False), report
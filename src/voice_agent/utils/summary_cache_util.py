@@ -0,0 +1,252 @@
+"""Content-addressed cache of LLM email summaries with TTL and LRU eviction."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any, Protocol
+
+from voice_agent.config import settings
+from voice_agent.utils.logger_util import get_logger
+
+logger = get_logger(name="SummaryCache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS summaries_accessed_at ON summaries (accessed_at);
+"""
+
+
+class SummaryCacheBackend(Protocol):
+    def get(self, key: str) -> str | None:
+        """Return the cached summary for key, or None if missing or expired."""
+        ...
+
+    def set(self, key: str, value: str) -> None:
+        """Store a summary under key, evicting the least recently used entries."""
+        ...
+
+    def clear(self) -> None:
+        """Remove every cached summary."""
+        ...
+
+
+def summary_cache_key(
+    message_ids: Iterable[str],
+    prompt_name: str,
+    prompt_args: dict[str, Any],
+    model: str,
+    temperature: float,
+    prompt_text: str = "",
+) -> str:
+    """
+    Build the cache key of a summary from everything that determines its content.
+
+    Gmail messages are immutable, so the set of message ids stands in for their content.
+
+    Args:
+            message_ids: Ids of the summarized emails, in any order.
+            prompt_name: Name of the MCP prompt used for the summary.
+            prompt_args: Arguments the prompt was rendered with.
+            model: The OpenAI model name.
+            temperature: The sampling temperature.
+            prompt_text: The rendered prompt, so prompt edits invalidate old entries.
+
+    Returns:
+            A hex SHA-256 digest.
+    """
+    material = json.dumps(
+        {
+            "ids": sorted(set(message_ids)),
+            "prompt": prompt_name,
+            "args": prompt_args,
+            "model": model,
+            "temperature": temperature,
+            "prompt_sha": hashlib.sha256(prompt_text.encode()).hexdigest(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class MemorySummaryCache:
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        """
+        Return the cached summary for key, or None if missing or expired.
+
+        Args:
+                key: The cache key.
+
+        Returns:
+                The cached summary or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if time.monotonic() - created_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a summary under key, evicting the least recently used entries.
+
+        Args:
+                key: The cache key.
+                value: The summary text.
+
+        Returns:
+                None
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove every cached summary.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskSummaryCache:
+    def __init__(self, path: str, max_entries: int, ttl: float) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> str | None:
+        """
+        Return the cached summary for key, or None if missing or expired.
+
+        Args:
+                key: The cache key.
+
+        Returns:
+                The cached summary or None.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE summaries SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a summary under key, evicting expired and least recently used entries.
+
+        Args:
+                key: The cache key.
+                value: The summary text.
+
+        Returns:
+                None
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._conn.execute("DELETE FROM summaries WHERE created_at < ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM summaries WHERE key NOT IN "
+                "(SELECT key FROM summaries ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """
+        Remove every cached summary.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM summaries")
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+
+        Args:
+                None
+
+        Returns:
+                None
+        """
+        with self._lock:
+            self._conn.close()
+
+
+_cache: SummaryCacheBackend | None = None
+_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> SummaryCacheBackend | None:
+    """
+    Get the process-wide summary cache for the configured backend.
+
+    Args:
+            None
+
+    Returns:
+            The shared cache, or None if summary caching is disabled.
+    """
+    global _cache
+    config = settings.summary_cache
+    if config.backend == "none":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            if config.backend == "disk":
+                _cache = DiskSummaryCache(config.path, config.max_entries, config.ttl)
+                logger.info(f"Opened summary cache at {config.path}")
+            else:
+                _cache = MemorySummaryCache(config.max_entries, config.ttl)
+        return _cache
@@ -0,0 +1,230 @@
+"""
+Lightweight request tracing: nested spans in a context variable, W3C trace context
+propagation across the MCP boundary, and span durations exported as metrics.
+"""
+
+import contextlib
+import contextvars
+import re
+import secrets
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from voice_agent.utils.logger_util import get_logger
+from voice_agent.utils.metrics_util import SPAN_DURATION
+
+logger = get_logger(name="Tracing")
+
+# Request and result _meta keys; traceparent follows https://www.w3.org/TR/trace-context/
+TRACEPARENT_KEY = "traceparent"
+SPANS_META_KEY = "voice_agent/spans"
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent: "Span | None" = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start: float = field(default_factory=time.perf_counter)
+    duration: float | None = None
+    status: str = "ok"
+    # Only set on a trace's local root: (name, seconds) of every finished descendant.
+    finished: list[tuple[str, float]] | None = None
+    remote: bool = False
+
+    @property
+    def root(self) -> "Span":
+        """The outermost span of this trace in the current process."""
+        span = self
+        while span.parent is not None:
+            span = span.parent
+        return span
+
+    @property
+    def traceparent(self) -> str:
+        """The W3C traceparent header value naming this span as the parent."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set(self, **attributes: Any) -> None:
+        """
+        Add attributes to the span, e.g. counts known only once the work is done.
+
+        Args:
+                **attributes: Attribute names and values.
+
+        Returns:
+                None
+        """
+        self.attributes.update(attributes)
+
+
+_current: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "voice_agent_span", default=None
+)
+
+
+def current_span() -> Span | None:
+    """
+    Get the innermost open span of the current task or thread.
+
+    Args:
+            None
+
+    Returns:
+            The current span, or None outside any trace.
+    """
+    return _current.get()
+
+
+def _breakdown(spans: list[tuple[str, float]]) -> str:
+    totals: dict[str, tuple[float, int]] = {}
+    for name, seconds in spans:
+        total, count = totals.get(name, (0.0, 0))
+        totals[name] = (total + seconds, count + 1)
+    return ", ".join(
+        f"{name}={total * 1000:.0f}ms" + (f"(x{count})" if count > 1 else "")
+        for name, (total, count) in totals.items()
+    )
+
+
+def record_span(name: str, seconds: float, status: str = "ok") -> None:
+    """
+    Record a span measured elsewhere (e.g. in the MCP server) under the current trace.
+
+    Args:
+            name: Span name.
+            seconds: Span duration.
+            status: "ok" or "error".
+
+    Returns:
+            None
+    """
+    SPAN_DURATION.observe(seconds, span=name, status=status)
+    parent = _current.get()
+    if parent is not None and parent.root.finished is not None:
+        parent.root.finished.append((name, seconds))
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time a stage as a child of the current span, or as the root of a new trace.
+
+    The duration is observed in the span duration histogram. When a local root ends,
+    the trace is logged with the total time of each stage inside it.
+
+    Args:
+            name: Span name, dotted by component (e.g. "gmail.fetch").
+            **attributes: Attributes logged with the span.
+
+    Yields:
+            The open span.
+    """
+    parent = _current.get()
+    current = Span(
+        name=name,
+        trace_id=parent.trace_id if parent is not None else secrets.token_hex(16),
+        span_id=secrets.token_hex(8),
+        parent=parent,
+        attributes=attributes,
+    )
+    if parent is None:
+        current.finished = []
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException:
+        current.status = "error"
+        raise
+    finally:
+        _current.reset(token)
+        current.duration = time.perf_counter() - current.start
+        SPAN_DURATION.observe(current.duration, span=name, status=current.status)
+        root = current.root
+        if current is root:
+            details = f" [{_breakdown(root.finished or [])}]" if root.finished else ""
+            logger.info(
+                f"Trace {current.trace_id} {name} {current.status} "
+                f"in {current.duration * 1000:.0f}ms{details}"
+            )
+        elif root.finished is not None:
+            root.finished.append((name, current.duration))
+
+
+def trace_meta() -> dict[str, Any] | None:
+    """
+    Build the MCP request _meta that carries the current trace to the server.
+
+    Args:
+            None
+
+    Returns:
+            A dict with the traceparent, or None outside any trace.
+    """
+    current = _current.get()
+    return {TRACEPARENT_KEY: current.traceparent} if current is not None else None
+
+
+@contextlib.contextmanager
+def continue_trace(traceparent: str | None) -> Iterator[Span]:
+    """
+    Collect the spans of a request that belongs to a trace started in another process.
+
+    Spans opened inside become children of the remote parent and are collected in the
+    yielded span's finished list, to be sent back with the response.
+
+    Args:
+            traceparent: The incoming W3C traceparent, if any.
+
+    Yields:
+            A stand-in for the remote parent span.
+    """
+    match = _TRACEPARENT.match(traceparent or "")
+    remote = Span(
+        name="remote",
+        trace_id=match.group(1) if match else secrets.token_hex(16),
+        span_id=match.group(2) if match else secrets.token_hex(8),
+        finished=[],
+        remote=True,
+    )
+    token = _current.set(remote)
+    try:
+        yield remote
+    finally:
+        _current.reset(token)
+        if remote.finished:
+            logger.info(f"Trace {remote.trace_id} (remote) [{_breakdown(remote.finished)}]")
+
+
+def spans_meta(remote: Span) -> dict[str, Any]:
+    """
+    Encode the spans collected under a remote parent for a response's _meta.
+
+    Args:
+            remote: The span yielded by continue_trace.
+
+    Returns:
+            A dict with the (name, seconds) pairs of the finished spans.
+    """
+    return {SPANS_META_KEY: [[name, seconds] for name, seconds in remote.finished or []]}
+
+
+def record_remote_spans(meta: dict[str, Any] | None) -> None:
+    """
+    Record the spans a server returned in a response's _meta under the current trace.
+
+    Args:
+            meta: The response _meta, if any.
+
+    Returns:
+            None
+    """
+    for entry in (meta or {}).get(SPANS_META_KEY) or []:
+        with contextlib.suppress(TypeError, ValueError):
+            name, seconds = entry
+            record_span(str(name), float(seconds))
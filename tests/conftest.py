@@ -2,6 +2,7 @@ from typing import Any
 
 import pytest
 
+from benchmarks.fakes import FakeGmailService
 from voice_agent.server.gmail_server import GmailMcpServer
 
 
@@ -22,3 +23,21 @@ def mock_gmail_server() -> Any:
             return [{"subject": "Test", "body": "Email"}]
 
     return MockGmailMcpServer()
+
+
+@pytest.fixture
+def fake_gmail_service() -> FakeGmailService:
+    """
+    Fake Gmail service holding a handful of simple raw messages.
+
+    Args:
+        None
+
+    Returns:
+        A FakeGmailService instance.
+    """
+    return FakeGmailService(
+        raw_messages={
+            f"m{i}": f"Subject: Mail {i}\nFrom: a@b.c\n\nBody {i}".encode() for i in range(7)
+        }
+    )
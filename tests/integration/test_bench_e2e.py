@@ -0,0 +1,24 @@
+import pytest
+
+from benchmarks.bench_e2e import STAGES, FakeConfig, format_breakdown, run_once
+
+
+@pytest.mark.asyncio
+async def test_audio_today_runs_end_to_end_against_fakes() -> None:
+    """
+    Integration test: run /audio_today through a fake-backed MCP server subprocess and
+    check that every stage of the latency breakdown was observed.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    config = FakeConfig(emails=8, gmail_latency=0, llm_latency=0, tts_latency=0, telegram_latency=0)
+    result = await run_once("audio_today", config)
+
+    assert all(result.calls[stage] > 0 for stage in STAGES)
+    assert result.calls["parse"] == 8
+    assert sum(result.stages.values()) > 0 and result.other < result.total
+    assert "/audio_today" in format_breakdown("audio_today", [result])
@@ -0,0 +1,117 @@
+import base64
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from mcp.types import AudioContent, ResourceLink, TextContent
+
+from voice_agent.client.agent import VoiceAgentClient
+from voice_agent.config import settings
+from voice_agent.server.tools.tts_reply import tts_instagram_audio
+from voice_agent.utils.audio_spool_util import audio_file_from_content, release_audio
+from voice_agent.utils.openai_utils import AssistantMessage, AssistantToolCall
+
+
+@pytest.mark.asyncio
+async def test_tts_tool_hands_audio_over_as_spooled_file(tmp_path: Path) -> None:
+    """
+    Test that the TTS tool returns a file link the bot can stream and then release.
+
+    Args:
+        tmp_path: Pytest temporary directory.
+
+    Returns:
+        None
+    """
+    with (
+        patch("voice_agent.config.settings.tts.spool_dir", str(tmp_path)),
+        patch("voice_agent.server.tools.tts_reply._synthesize_chunks", return_value=b"\xff\xfbMP3"),
+    ):
+        link = await tts_instagram_audio("Hello there.")
+        assert isinstance(link, ResourceLink)
+        assert link.mime_type == "audio/mpeg"
+        assert link.size == 5
+
+        path = audio_file_from_content([link])
+        assert path is not None
+        assert path.read_bytes() == b"\xff\xfbMP3"
+
+        release_audio(path)
+        assert not path.exists()
+
+
+def test_inline_and_foreign_audio_results(tmp_path: Path) -> None:
+    """
+    Test inline audio and legacy base64 results, and that foreign file links are refused.
+
+    Args:
+        tmp_path: Pytest temporary directory.
+
+    Returns:
+        None
+    """
+    outside = tmp_path / "secret.mp3"
+    outside.write_bytes(b"do not send")
+    encoded = base64.b64encode(b"MP3").decode()
+    with patch("voice_agent.config.settings.tts.spool_dir", str(tmp_path / "spool")):
+        inline = audio_file_from_content(
+            [AudioContent(type="audio", data=encoded, mime_type="audio/mpeg")]
+        )
+        legacy = audio_file_from_content([TextContent(type="text", text=encoded)])
+        foreign = audio_file_from_content(
+            [ResourceLink(type="resource_link", uri=outside.as_uri(), name="secret.mp3")]
+        )
+
+    assert inline is not None and inline.read_bytes() == b"MP3"
+    assert legacy is not None and legacy.read_bytes() == b"MP3"
+    assert foreign is None
+    assert audio_file_from_content([TextContent(type="text", text="not audio!")]) is None
+
+
+@pytest.mark.asyncio
+async def test_agent_releases_audio_when_query_fails_after_tts(tmp_path: Path) -> None:
+    """
+    Test that a spooled audio file is deleted when the query fails after the TTS call.
+
+    Args:
+        tmp_path: Pytest temporary directory.
+
+    Returns:
+        None
+    """
+    spooled = tmp_path / "reply.mp3"
+    spooled.write_bytes(b"\xff\xfbMP3")
+    session = MagicMock()
+    session.list_tools = AsyncMock(return_value=MagicMock(tools=[]))
+    session.list_prompts = AsyncMock(side_effect=RuntimeError("no prompts"))
+
+    @asynccontextmanager
+    async def fake_session() -> AsyncIterator[Any]:
+        yield session
+
+    tts_call = AssistantToolCall(
+        id="call-1", name=settings.tools.tts_instagram_audio_tool, arguments="{}"
+    )
+    agent = VoiceAgentClient(openai_client=MagicMock(), model="gpt-test")
+    with (
+        patch.object(agent, "session", fake_session),
+        patch.object(agent, "call_tool", AsyncMock(return_value=MagicMock(content=[]))),
+        patch.object(
+            agent,
+            "_agent_completion",
+            AsyncMock(
+                side_effect=[
+                    AssistantMessage(tool_calls=[tts_call]),
+                    RuntimeError("completion failed"),
+                ]
+            ),
+        ),
+        patch("voice_agent.client.agent.audio_file_from_content", return_value=spooled),
+        pytest.raises(RuntimeError, match="completion failed"),
+    ):
+        await agent.run_agentic_query("Read my mail aloud")
+
+    assert not spooled.exists()
@@ -0,0 +1,49 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.fakes import FakeGmailService, StageTimings, busy_seconds
+from voice_agent.server.tools.get_emails import get_emails
+
+
+def test_busy_seconds_counts_overlapping_calls_once() -> None:
+    """
+    Test that concurrent intervals are merged and gaps are left out.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    assert busy_seconds([]) == 0
+    assert busy_seconds([(0.0, 2.0), (1.0, 3.0), (5.0, 6.0), (5.5, 5.7)]) == pytest.approx(4.0)
+
+
+@pytest.mark.asyncio
+async def test_fake_gmail_serves_get_emails_and_records_round_trips() -> None:
+    """
+    Test that the fake Gmail service plugs into get_emails and times list and fetch calls.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    timings = StageTimings()
+    gmail = FakeGmailService(count=12, timings=timings)
+    with (
+        patch("voice_agent.server.tools.get_emails.get_gmail_service", return_value=gmail),
+        patch("voice_agent.server.tools.get_emails.settings.gmail.batch_size", 5),
+        patch("voice_agent.server.tools.get_emails.settings.store.enabled", False),
+    ):
+        emails = json.loads(await get_emails(days=0))
+        headers = json.loads(await get_emails(days=0, include_body=False))
+
+    assert [e["id"] for e in emails] == gmail.ids
+    assert all(e["body"] and e["date"] for e in emails)
+    assert [h["subject"] for h in headers] == [e["subject"] for e in emails]
+    assert timings.calls("list") == 2
+    assert timings.calls("fetch") == 6
@@ -0,0 +1,48 @@
+import pytest
+
+from benchmarks.bench_parser import format_results, run
+from benchmarks.corpus import KINDS, generate_corpus
+from voice_agent.utils.email_parser_util import parse_email_from_raw
+
+
+@pytest.mark.parametrize("kind", sorted(KINDS))
+def test_corpus_messages_parse_to_readable_bodies(kind: str) -> None:
+    """
+    Test that every kind of generated message is reproducible and parses to a clean body.
+
+    Args:
+        kind: The message kind.
+
+    Returns:
+        None
+    """
+    corpus = generate_corpus(3, seed=7, kind=kind)
+    assert corpus == generate_corpus(3, seed=7, kind=kind)
+
+    for raw in corpus:
+        parsed = parse_email_from_raw(raw)
+        assert parsed["subject"] != "Error"
+        assert parsed["date"]
+        assert parsed["body"]
+        assert "�" not in parsed["body"]
+        assert "Preheader" not in parsed["body"]
+
+
+def test_benchmark_reports_every_stage() -> None:
+    """
+    Test that a tiny benchmark run measures each stage and renders a comparison.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    results = run(count=10, seed=1, kind=None, repeat=1)
+    stages = [result.stage for result in results]
+    assert stages[0] == "parse_email_from_raw"
+    assert {"clean_text", "clean_text[legacy]", "json.dumps"} <= set(stages)
+    assert all(result.seconds > 0 and result.peak_bytes > 0 for result in results)
+
+    table = format_results(results, {"clean_text": {"seconds": results[3].seconds * 2}})
+    assert "2.00x" in table
@@ -0,0 +1,102 @@
+import random
+import sys
+import unicodedata
+
+import pytest
+
+from voice_agent.utils.email_parser_util import _SCANNED_PLANES, _clean_text
+
+
+def _reference_clean_text(text: str) -> str:
+    # The original per-character implementation the fast version must match exactly.
+    cleaned_chars = []
+    for char in text:
+        category = unicodedata.category(char)
+        if category not in ("Cf", "Mn") and (category != "Cc" or char in "\n\t"):
+            cleaned_chars.append(char)
+    text = "".join(cleaned_chars)
+    text = text.replace("\u00a0", " ")
+    text = text.replace("\u202f", " ")
+    text = text.replace("\u2007", " ")
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.splitlines()
+    cleaned_lines = [line.strip() for line in lines if line.strip()]
+    return "\n".join(cleaned_lines)
+
+
+_INTERESTING = (
+    "ab Zéé"  # ASCII, space, precomposed letter
+    "\n\t\r\x0b\x0c\x1c\x1d\x1e\x1f\x85\x00\x7f"  # kept and removed controls, line breaks
+    "\u2028\u2029"  # line and paragraph separators (kept, split lines)
+    "\u00a0\u202f\u2007\u2003\u3000"  # spaces that are replaced or stripped
+    "\u200b\u200c\u200d\u2060\ufeff\u00ad\u034f"  # zero-width and soft-hyphen characters
+    "\u0301\u0308\u20dd"  # nonspacing and enclosing marks
+    "\U0001f4e6\U0001f600\U0001d167\U000e0041\U000e0100\U000f0000"  # astral
+)
+
+
+def test_tables_cover_every_code_point() -> None:
+    """
+    Test that each Cf, Mn and Cc character is removed and none lie outside the scanned planes.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    scanned = {cp for plane in _SCANNED_PLANES for cp in plane}
+    for cp in range(sys.maxunicode + 1):
+        char = chr(cp)
+        category = unicodedata.category(char)
+        if category in ("Cf", "Mn") or (category == "Cc" and char not in "\n\t"):
+            assert cp in scanned, f"U+{cp:04X} ({category}) is outside the scanned planes"
+            assert _clean_text(f"a{char}b") == "ab", f"U+{cp:04X} ({category}) was kept"
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("", ""),
+        ("plain", "plain"),
+        ("  padded \t\n\n\n  lines  \r\n", "padded\nlines"),
+        ("crlf\r\nsplit\rlines", "crlf\nsplitlines"),
+        ("tab\tkept\x0bvt\x0cff", "tab\tkeptvtff"),
+        ("nbsp\u00a0narrow\u202ffigure\u2007", "nbsp narrow figure"),
+        ("\u00a0\u00a0indented\u00a0", "indented"),
+        ("para\u2029graph\u2028line", "para\ngraph\nline"),
+        ("zero\u200bwidth\u200c\ufeffjoin", "zerowidthjoin"),
+        ("cafe\u0301 na\u0308ive", "cafe naive"),
+        ("emoji \U0001f4e6 tag\U000e0041 vs\U000e0100", "emoji \U0001f4e6 tag vs"),
+        ("\x85next\x1cline", "nextline"),
+    ],
+)
+def test_whitespace_and_category_rules(text: str, expected: str) -> None:
+    """
+    Test representative Cf/Mn/Cc and whitespace cases against fixed expectations.
+
+    Args:
+        text: The input text.
+        expected: The expected cleaned text.
+
+    Returns:
+        None
+    """
+    assert _reference_clean_text(text) == expected
+    assert _clean_text(text) == expected
+
+
+def test_random_text_matches_reference() -> None:
+    """
+    Test that random mixes of tricky characters clean exactly like the reference.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    rng = random.Random(1234)
+    for _ in range(2000):
+        text = "".join(rng.choices(_INTERESTING, k=rng.randint(0, 40)))
+        assert _clean_text(text) == _reference_clean_text(text), repr(text)
@@ -0,0 +1,95 @@
+from contextlib import asynccontextmanager
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from voice_agent.host.bot import EmailSummaryBot
+from voice_agent.host.daily_digest import DigestStore
+
+
+def test_digest_store_serves_only_unchanged_mailboxes_and_keeps_two_audio_files(
+    tmp_path: Path,
+) -> None:
+    """
+    Test digest freshness by day and history id, and the audio file hand-over.
+
+    Args:
+        tmp_path: Pytest temporary directory.
+
+    Returns:
+        None
+    """
+    store = DigestStore(tmp_path / "digests")
+    today = date(2026, 10, 16)
+    store.put_text(today, "100", "3 new emails")
+
+    assert store.get("text", today, "100").text == "3 new emails"
+    assert store.get("text", today, "101") is None
+    assert store.get("text", date(2026, 10, 17), "100") is None
+    assert store.get("text", today, None) is None
+    assert store.get("audio", today, "100") is None
+
+    paths = []
+    for history_id in ("100", "101", "102"):
+        spooled = tmp_path / f"spool-{history_id}.mp3"
+        spooled.write_bytes(history_id.encode())
+        paths.append(store.put_audio(today, history_id, spooled).audio_path)
+        assert not spooled.exists()
+
+    assert store.get("audio", today, "102").audio_path == paths[2]
+    assert [p.exists() for p in paths] == [False, True, True]
+    assert paths[2].read_bytes() == b"102"
+
+
+@pytest.mark.asyncio
+async def test_bot_serves_the_precomputed_digest_until_the_mailbox_changes() -> None:
+    """
+    Test that /summary_today answers from the refreshed digest and recomputes on change.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    bot = EmailSummaryBot("token", "", "gpt-4o-mini")
+    bot.voice_agent_client.openai_client = MagicMock()
+    history_ids = iter(["100", "100", "100", "101"])
+    summaries = iter(["first summary", "second summary"])
+
+    @asynccontextmanager
+    async def session():
+        yield MagicMock()
+
+    async def today_text(reply):
+        return next(summaries)
+
+    async def summary_today() -> str:
+        message = SimpleNamespace(reply_text=AsyncMock())
+        message.reply_text.return_value = SimpleNamespace(edit_text=AsyncMock())
+        await bot.summary_today(SimpleNamespace(message=message), MagicMock())
+        placeholder = message.reply_text.return_value
+        return placeholder.edit_text.await_args.args[0]
+
+    with (
+        patch.object(bot.voice_agent_client, "session", session),
+        patch.object(
+            bot.voice_agent_client,
+            "get_mailbox_history_id",
+            AsyncMock(side_effect=lambda _: next(history_ids)),
+        ),
+        patch.object(bot, "_today_text", side_effect=today_text) as compute,
+        patch("voice_agent.host.bot.settings.digest.enabled", True),
+    ):
+        await bot._refresh_digests(MagicMock())
+        assert compute.call_count == 1
+
+        assert await summary_today() == "first summary"
+        assert await summary_today() == "first summary"
+        assert compute.call_count == 1
+
+        assert await summary_today() == "second summary"
+        assert compute.call_count == 2
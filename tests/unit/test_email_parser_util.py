@@ -1,6 +1,9 @@
+from unittest.mock import patch
+
 import pytest
 
-from voice_agent.utils.email_parser_util import parse_email_from_raw
+from voice_agent.config import settings
+from voice_agent.utils.email_parser_util import _html_to_text, parse_email_from_raw
 
 
 @pytest.mark.parametrize(
@@ -25,3 +28,74 @@ def test_parse_email_basic(raw: bytes, expected_subject: str, expected_body: str
     result = parse_email_from_raw(raw)
     assert result["subject"] == expected_subject
     assert result["body"].strip() == expected_body
+
+
+_NEWSLETTER = """<html><head><title>Weekly</title><style>p {color: red}</style></head>
+<body>
+<div style="display:none;max-height:0">Hidden preheader</div>
+<span aria-hidden="true">Tracking</span>
+<h1>Weekly&nbsp;news</h1>
+<p>Read <b>this</b> first<!-- ad slot -->, then that.</p>
+<script>var x = 1;</script>
+<table><tr><td>Cell one</td><td style="font-size: 0.9em">Cell two</td></tr></table>
+</body></html>"""
+
+
+def test_html_to_text_skips_hidden_content() -> None:
+    """
+    Test that the lxml engine drops invisible markup and keeps text around comments.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    assert _html_to_text(_NEWSLETTER) == (
+        "Weekly news\nRead\nthis\nfirst\n, then that.\nCell one\nCell two"
+    )
+
+
+def test_html_to_text_caps_input_size() -> None:
+    """
+    Test that HTML beyond the configured size is not extracted.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    html = "<p>kept</p>" + "<p>dropped</p>" * 100
+    with patch.object(settings.parser, "max_html_chars", 11):
+        assert _html_to_text(html) == "kept"
+
+
+@pytest.mark.parametrize("html_engine", ["lxml", "bs4"])
+def test_html_to_text_engines_agree_on_plain_markup(html_engine: str) -> None:
+    """
+    Test that both engines produce the same text for markup without hidden content.
+
+    Args:
+        html_engine: The configured HTML engine.
+
+    Returns:
+        None
+    """
+    html = "<div><p>Hello <a href='#'>there</a></p>\n<ul><li>One</li><li>Two</li></ul></div>"
+    with patch.object(settings.parser, "html_engine", html_engine):
+        assert _html_to_text(html) == "Hello\nthere\nOne\nTwo"
+
+
+def test_html_to_text_falls_back_to_bs4() -> None:
+    """
+    Test that markup lxml cannot parse directly is still extracted by BeautifulSoup.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    html = "<?xml version='1.0' encoding='utf-8'?><html><body><p>Declared</p></body></html>"
+    assert _html_to_text(html) == "Declared"
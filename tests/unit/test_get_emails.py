@@ -0,0 +1,130 @@
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from voice_agent.server.tools.get_email_body import get_email_body
+from voice_agent.server.tools.get_emails import PARTIAL_RESULTS_LOGGER, get_emails
+
+
+@pytest.mark.asyncio
+async def test_get_emails_parses_batches_in_listing_order(fake_gmail_service: Any) -> None:
+    """
+    Test that get_emails fetches concurrently but returns emails in listing order.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    with (
+        patch(
+            "voice_agent.server.tools.get_emails.get_gmail_service",
+            return_value=fake_gmail_service,
+        ),
+        patch("voice_agent.server.tools.get_emails.settings.gmail.batch_size", 2),
+        patch("voice_agent.server.tools.get_emails.settings.store.enabled", False),
+    ):
+        emails = json.loads(await get_emails(days=1))
+
+    assert [e["id"] for e in emails] == [f"m{i}" for i in reversed(range(7))]
+    assert emails[3]["subject"] == "Mail 3"
+    assert emails[3]["body"] == "Body 3"
+    assert fake_gmail_service.round_trips == 4
+
+
+@pytest.mark.asyncio
+async def test_get_emails_follows_pages_up_to_budget(fake_gmail_service: Any) -> None:
+    """
+    Test that get_emails pages past the first listing page and stops at max_results.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    for i in range(7, 130):
+        fake_gmail_service.add_message(f"m{i}", f"Subject: Mail {i}\n\nBody {i}".encode())
+    fake_gmail_service.page_size = 40
+    with (
+        patch(
+            "voice_agent.server.tools.get_emails.get_gmail_service",
+            return_value=fake_gmail_service,
+        ),
+        patch("voice_agent.server.tools.get_emails.settings.store.enabled", False),
+    ):
+        emails = json.loads(await get_emails(days=30, max_results=110))
+
+    assert len(emails) == 110
+    assert [e["id"] for e in emails[:2]] == ["m129", "m128"]
+    assert len(fake_gmail_service.fetched_ids) == 110
+
+
+@pytest.mark.asyncio
+async def test_get_emails_headers_only_then_body(fake_gmail_service: Any) -> None:
+    """
+    Test the metadata-first flow: headers and snippets first, bodies only on demand.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    with (
+        patch(
+            "voice_agent.server.tools.get_emails.get_gmail_service",
+            return_value=fake_gmail_service,
+        ),
+        patch(
+            "voice_agent.server.tools.get_email_body.get_gmail_service",
+            return_value=fake_gmail_service,
+        ),
+        patch("voice_agent.server.tools.get_emails.settings.store.enabled", False),
+    ):
+        overview = json.loads(await get_emails(days=1, include_body=False))
+        assert overview[0] == {
+            "id": "m6",
+            "from": "a@b.c",
+            "subject": "Mail 6",
+            "date": None,
+            "snippet": "Body 6",
+        }
+
+        bodies = json.loads(await get_email_body(["m2", "m5"]))
+
+    assert [e["body"] for e in bodies] == ["Body 2", "Body 5"]
+
+
+@pytest.mark.asyncio
+async def test_get_emails_streams_partial_batches(fake_gmail_service: Any) -> None:
+    """
+    Test that get_emails sends each batch through the context as it is parsed.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    ctx = AsyncMock()
+    with (
+        patch(
+            "voice_agent.server.tools.get_emails.get_gmail_service",
+            return_value=fake_gmail_service,
+        ),
+        patch("voice_agent.server.tools.get_emails.settings.gmail.batch_size", 2),
+        patch("voice_agent.server.tools.get_emails.settings.store.enabled", False),
+    ):
+        emails = json.loads(await get_emails(days=1, ctx=ctx))
+
+    partials = [
+        call.kwargs["extra"]
+        for call in ctx.info.await_args_list
+        if call.kwargs.get("logger_name") == PARTIAL_RESULTS_LOGGER
+    ]
+    assert [p["offset"] for p in partials] == [0, 2, 4, 6]
+    assert [e for p in partials for e in json.loads(p["emails"])] == emails
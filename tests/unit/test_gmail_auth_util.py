@@ -0,0 +1,95 @@
+import json
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from voice_agent.utils import gmail_auth_util
+
+
+def _token_json(expires_in: timedelta) -> str:
+    expiry = datetime.now(UTC).replace(tzinfo=None) + expires_in
+    return json.dumps(
+        {
+            "token": "access-1",
+            "refresh_token": "refresh",
+            "client_id": "id",
+            "client_secret": "secret",
+            "token_uri": "https://oauth2.googleapis.com/token",
+            "expiry": expiry.isoformat() + "Z",
+        }
+    )
+
+
+@pytest.fixture
+def auth_env() -> Iterator[dict[str, Any]]:
+    """
+    Patch token loading, refresh, persistence and service construction.
+
+    Args:
+        None
+
+    Returns:
+        A dict with the build, save and refresh mocks.
+    """
+
+    def fake_refresh(self: Credentials, request: Any) -> None:
+        self.token = "access-2"
+        self.expiry = datetime.now(UTC).replace(tzinfo=None) + timedelta(hours=1)
+
+    gmail_auth_util.reset_gmail_service()
+    with (
+        patch.object(gmail_auth_util, "build", return_value=MagicMock()) as build,
+        patch.object(gmail_auth_util, "save_token_to_env") as save,
+        patch.object(Credentials, "refresh", autospec=True, side_effect=fake_refresh) as refresh,
+    ):
+        yield {"build": build, "save": save, "refresh": refresh}
+    gmail_auth_util.reset_gmail_service()
+
+
+def test_service_is_built_once(auth_env: dict[str, Any]) -> None:
+    """
+    Test that repeated calls reuse the service without refreshing or saving the token.
+
+    Args:
+        auth_env: Fixture with the patched auth dependencies.
+
+    Returns:
+        None
+    """
+    with patch.object(
+        gmail_auth_util.settings.google, "gmail_token", _token_json(timedelta(hours=1))
+    ):
+        first = gmail_auth_util.get_gmail_service()
+        second = gmail_auth_util.get_gmail_service()
+
+    assert first is second
+    auth_env["build"].assert_called_once()
+    assert auth_env["build"].call_args.kwargs["static_discovery"] is True
+    auth_env["refresh"].assert_not_called()
+    auth_env["save"].assert_not_called()
+
+
+def test_token_refreshed_before_expiry(auth_env: dict[str, Any]) -> None:
+    """
+    Test that a token close to expiry is refreshed in memory and persisted once.
+
+    Args:
+        auth_env: Fixture with the patched auth dependencies.
+
+    Returns:
+        None
+    """
+    with patch.object(
+        gmail_auth_util.settings.google, "gmail_token", _token_json(timedelta(minutes=2))
+    ):
+        gmail_auth_util.get_gmail_service()
+        gmail_auth_util.get_gmail_service()
+
+    auth_env["build"].assert_called_once()
+    auth_env["refresh"].assert_called_once()
+    auth_env["save"].assert_called_once()
+    assert json.loads(auth_env["save"].call_args.args[0])["token"] == "access-2"
@@ -0,0 +1,36 @@
+from typing import Any
+
+from voice_agent.utils.gmail_fetch_util import fetch_messages_batched
+
+
+def test_fetch_messages_batched_keeps_order(fake_gmail_service: Any) -> None:
+    """
+    Test that batched fetching uses one round trip per batch and keeps the list order.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    ids = ["m6", "m0", "m3", "m1", "m5", "m2", "m4"]
+    messages = fetch_messages_batched(fake_gmail_service, ids, batch_size=3)
+    assert [m["id"] for m in messages] == ids
+    assert fake_gmail_service.round_trips == 3
+
+
+def test_fetch_messages_batched_retries_failed_messages(fake_gmail_service: Any) -> None:
+    """
+    Test that a message failing inside a batch is retried individually.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    fake_gmail_service.flaky_ids = {"m2", "m4"}
+    ids = [f"m{i}" for i in range(7)]
+    messages = fetch_messages_batched(fake_gmail_service, ids, batch_size=50)
+    assert [m["id"] for m in messages] == ids
+    assert fake_gmail_service.round_trips == 1
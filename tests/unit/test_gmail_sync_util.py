@@ -0,0 +1,123 @@
+import time
+from typing import Any
+
+import pytest
+
+from voice_agent.utils.email_parser_util import parse_gmail_raw_message
+from voice_agent.utils.email_store_util import EmailStore
+from voice_agent.utils.gmail_sync_util import sync_emails
+
+
+async def _sync(service: Any, store: EmailStore, since_ms: int) -> list[dict]:
+    return await sync_emails(
+        service, store, "newer_than:1d", since_ms, max_results=50, transform=parse_gmail_raw_message
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_fetches_only_new_mail(fake_gmail_service: Any) -> None:
+    """
+    Test that repeated syncs only fetch messages reported by the history API.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    store = EmailStore(":memory:")
+    since_ms = int(time.time() * 1000) - 86_400_000
+
+    emails = await _sync(fake_gmail_service, store, since_ms)
+    assert len(emails) == 7
+    assert len(fake_gmail_service.fetched_ids) == 7
+
+    fake_gmail_service.fetched_ids.clear()
+    assert await _sync(fake_gmail_service, store, since_ms) == emails
+    assert fake_gmail_service.fetched_ids == []
+
+    fake_gmail_service.add_message("m7", b"Subject: Fresh\nFrom: x@y.z\n\nNew mail")
+    fake_gmail_service.delete_message("m0")
+    emails = await _sync(fake_gmail_service, store, since_ms)
+    assert fake_gmail_service.fetched_ids == ["m7"]
+    assert emails[0]["subject"] == "Fresh"
+    assert "m0" not in {e["id"] for e in emails}
+    assert len(emails) == 7
+
+
+@pytest.mark.asyncio
+async def test_sync_widening_window_fetches_only_missing(fake_gmail_service: Any) -> None:
+    """
+    Test that asking for a wider window relists it but reuses stored messages.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    store = EmailStore(":memory:")
+    now_ms = int(time.time() * 1000)
+    await _sync(fake_gmail_service, store, now_ms - 3_600_000)
+    fake_gmail_service.fetched_ids.clear()
+
+    emails = await _sync(fake_gmail_service, store, now_ms - 7 * 86_400_000)
+    assert len(emails) == 7
+    assert fake_gmail_service.fetched_ids == []
+    assert store.get_synced_since() == now_ms - 7 * 86_400_000
+
+
+@pytest.mark.asyncio
+async def test_sync_after_truncated_listing_lists_again(fake_gmail_service: Any) -> None:
+    """
+    Test that a window cut off at max_results is not treated as fully synced.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    store = EmailStore(":memory:")
+    now_ms = int(time.time() * 1000)
+    emails = await sync_emails(
+        fake_gmail_service,
+        store,
+        "newer_than:7d",
+        now_ms - 7 * 86_400_000,
+        max_results=3,
+        transform=parse_gmail_raw_message,
+    )
+    assert len(emails) == 3
+
+    emails = await _sync(fake_gmail_service, store, now_ms - 86_400_000)
+    assert len(emails) == 7
+
+
+@pytest.mark.asyncio
+async def test_sync_restores_mail_taken_out_of_trash(fake_gmail_service: Any) -> None:
+    """
+    Test that a message moved to trash and back is stored again.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    store = EmailStore(":memory:")
+    since_ms = int(time.time() * 1000) - 86_400_000
+    await _sync(fake_gmail_service, store, since_ms)
+
+    fake_gmail_service.change_label("m3", "TRASH")
+    emails = await _sync(fake_gmail_service, store, since_ms)
+    assert "m3" not in {e["id"] for e in emails}
+
+    fake_gmail_service.change_label("m3", "TRASH", added=False)
+    emails = await _sync(fake_gmail_service, store, since_ms)
+    assert "m3" in {e["id"] for e in emails}
+
+    fake_gmail_service.change_label("m3", "SPAM")
+    fake_gmail_service.change_label("m3", "SPAM", added=False)
+    emails = await _sync(fake_gmail_service, store, since_ms)
+    assert "m3" in {e["id"] for e in emails}
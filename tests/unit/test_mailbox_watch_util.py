@@ -0,0 +1,165 @@
+import asyncio
+import json
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from voice_agent.server.resources.mailbox_state import get_mailbox_state
+from voice_agent.utils.email_parser_util import parse_gmail_raw_message
+from voice_agent.utils.email_store_util import EmailStore
+from voice_agent.utils.gmail_sync_util import sync_emails
+from voice_agent.utils.mailbox_watch_util import MailboxWatcher
+
+
+@pytest.mark.asyncio
+async def test_watcher_tracks_changes_since_a_history_id(fake_gmail_service: Any) -> None:
+    """
+    Test that the watcher lists history only when the historyId moves.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    watcher = MailboxWatcher(lambda: fake_gmail_service)
+    assert watcher.changes_since("100") is None
+
+    assert not await watcher.poll()
+    baseline = watcher.history_id
+    assert baseline is not None
+    assert watcher.changes_since(baseline) is not None
+    assert watcher.unchanged_since(baseline)
+
+    assert not await watcher.poll()
+    assert fake_gmail_service.history_reads == 0
+
+    fake_gmail_service.add_message("m7", b"Subject: Fresh\nFrom: x@y.z\n\nNew mail")
+    assert await watcher.poll()
+    fake_gmail_service.add_message("m8", b"Subject: Later\nFrom: x@y.z\n\nNewer mail")
+    fake_gmail_service.delete_message("m7")
+    assert await watcher.poll()
+    assert fake_gmail_service.history_reads == 2
+    assert not watcher.unchanged_since(baseline)
+
+    changes = watcher.changes_since(baseline)
+    assert changes is not None
+    assert changes.added == ["m7", "m8"]
+    assert changes.deleted == {"m7"}
+    assert watcher.changes_since(str(int(baseline) - 1)) is None
+
+    fake_gmail_service.change_label("m0", "TRASH")
+    await watcher.poll()
+    fake_gmail_service.change_label("m0", "TRASH", added=False)
+    await watcher.poll()
+    changes = watcher.changes_since(baseline)
+    assert changes is not None
+    assert "m0" in changes.added
+    assert "m0" not in changes.deleted
+
+
+@pytest.mark.asyncio
+async def test_notify_marks_watcher_stale_until_next_check(fake_gmail_service: Any) -> None:
+    """
+    Test that a push notification for a newer historyId wakes the poller.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    watcher = MailboxWatcher(lambda: fake_gmail_service, poll_interval=60)
+    watcher.start()
+    try:
+        while not watcher.is_fresh:
+            await asyncio.sleep(0.01)
+        watcher.notify(watcher.history_id)
+        assert watcher.is_fresh
+
+        fake_gmail_service.add_message("m7", b"Subject: Fresh\nFrom: x@y.z\n\nNew mail")
+        watcher.notify(str(fake_gmail_service.history_id))
+        assert not watcher.is_fresh
+        while not watcher.is_fresh:
+            await asyncio.sleep(0.01)
+        assert watcher.history_id == str(fake_gmail_service.history_id)
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_sync_with_fresh_watcher_skips_gmail(fake_gmail_service: Any) -> None:
+    """
+    Test that syncs against an unchanged mailbox make no Gmail calls at all.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    store = EmailStore(":memory:")
+    since_ms = int(time.time() * 1000) - 86_400_000
+    watcher = MailboxWatcher(lambda: fake_gmail_service)
+    await watcher.poll()
+
+    async def sync() -> list[dict]:
+        return await sync_emails(
+            fake_gmail_service,
+            store,
+            "newer_than:1d",
+            since_ms,
+            max_results=50,
+            transform=parse_gmail_raw_message,
+            watcher=watcher,
+        )
+
+    emails = await sync()
+    fake_gmail_service.fetched_ids.clear()
+    fake_gmail_service.profile_reads = 0
+
+    assert await sync() == emails
+    assert fake_gmail_service.profile_reads == 0
+    assert fake_gmail_service.history_reads == 0
+    assert fake_gmail_service.fetched_ids == []
+
+    fake_gmail_service.add_message("m7", b"Subject: Fresh\nFrom: x@y.z\n\nNew mail")
+    await watcher.poll()
+    history_reads = fake_gmail_service.history_reads
+    emails = await sync()
+    assert fake_gmail_service.history_reads == history_reads
+    assert fake_gmail_service.fetched_ids == ["m7"]
+    assert emails[0]["subject"] == "Fresh"
+    assert store.get_history_id() == watcher.history_id
+
+
+@pytest.mark.asyncio
+async def test_mailbox_state_with_fresh_watcher_skips_auth(fake_gmail_service: Any) -> None:
+    """
+    Test that the mailbox state resource builds no Gmail service while the watcher is fresh.
+
+    Args:
+        fake_gmail_service: A pytest fixture providing an in-memory Gmail service.
+
+    Returns:
+        None
+    """
+    watcher = MailboxWatcher(lambda: fake_gmail_service)
+    await watcher.poll()
+    module = "voice_agent.server.resources.mailbox_state"
+    with (
+        patch(f"{module}.get_mailbox_watcher", return_value=watcher),
+        patch(f"{module}.get_gmail_service", side_effect=AssertionError("auth")),
+    ):
+        state = json.loads(await get_mailbox_state())
+    assert state["history_id"] == watcher.history_id
+
+    watcher.notify()
+    with (
+        patch(f"{module}.get_mailbox_watcher", return_value=watcher),
+        patch(f"{module}.get_gmail_service", return_value=fake_gmail_service),
+    ):
+        state = json.loads(await get_mailbox_state())
+    assert state["history_id"] == str(fake_gmail_service.history_id)
@@ -0,0 +1,107 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from voice_agent.client.session_pool import McpSessionPool
+
+
+class FakeSessionFactory:
+    """Counts spawns and hands out mock sessions instead of starting real servers."""
+
+    def __init__(self) -> None:
+        self.spawned: list[Any] = []
+        self.closed = 0
+        self.spawn_delay = 0.0
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[Any]:
+        """Yield a mock session that answers pings."""
+        await asyncio.sleep(self.spawn_delay)
+        session = MagicMock()
+        session.send_ping = AsyncMock(return_value=None)
+        self.spawned.append(session)
+        try:
+            yield session
+        finally:
+            self.closed += 1
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_warm_sessions() -> None:
+    """
+    Test that checking out sessions repeatedly does not spawn new servers.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    factory = FakeSessionFactory()
+    pool = McpSessionPool(factory, size=2, health_check_interval=0)
+    await pool.start()
+    try:
+        for _ in range(5):
+            async with pool.session() as session:
+                assert session in factory.spawned
+        assert len(factory.spawned) == 2
+    finally:
+        await pool.close()
+    assert factory.closed == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_respawns_crashed_server() -> None:
+    """
+    Test that a session whose server stops answering pings is replaced on checkout.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    factory = FakeSessionFactory()
+    pool = McpSessionPool(factory, size=1, health_check_interval=0)
+    await pool.start()
+    try:
+        with pytest.raises(ConnectionError):
+            async with pool.session() as session:
+                session.send_ping.side_effect = ConnectionError("server exited")
+                raise ConnectionError("broken pipe")
+        async with pool.session() as session:
+            assert session is factory.spawned[-1]
+        assert len(factory.spawned) == 2
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_health_check_respawn_does_not_block_checkout() -> None:
+    """
+    Test that healthy servers stay available while a failed one is respawned.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    factory = FakeSessionFactory()
+    pool = McpSessionPool(factory, size=2, health_check_interval=0.05)
+    await pool.start()
+    try:
+        broken, healthy = factory.spawned
+        broken.send_ping.side_effect = ConnectionError("server exited")
+        factory.spawn_delay = 5.0
+        while broken.send_ping.await_count == 0:
+            await asyncio.sleep(0.01)
+        async with asyncio.timeout(1):
+            async with pool.session() as session:
+                assert session is healthy
+    finally:
+        await pool.close()
@@ -0,0 +1,62 @@
+import urllib.request
+
+from voice_agent.utils.metrics_util import CONTENT_TYPE, MetricsRegistry, start_metrics_server
+
+
+def test_metrics_render_in_prometheus_text_format() -> None:
+    """
+    Test counters and cumulative histogram buckets in the text exposition format.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    registry = MetricsRegistry()
+    tokens = registry.counter("tokens_total", "Tokens used", ["model", "type"])
+    latency = registry.histogram("latency_seconds", "Latency", ["span"], buckets=(0.1, 1.0))
+    tokens.inc(120, model="gpt-4o-mini", type="prompt")
+    tokens.inc(30, model="gpt-4o-mini", type="prompt")
+    latency.observe(0.05, span="gmail.fetch")
+    latency.observe(0.5, span="gmail.fetch")
+    latency.observe(2.0, span="gmail.fetch")
+
+    assert registry.counter("tokens_total", "Tokens used", ["model", "type"]) is tokens
+    assert tokens.value(model="gpt-4o-mini", type="prompt") == 150
+    assert latency.count(span="gmail.fetch") == 3
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{span="gmail.fetch",le="0.1"} 1',
+        'latency_seconds_bucket{span="gmail.fetch",le="1"} 2',
+        'latency_seconds_bucket{span="gmail.fetch",le="+Inf"} 3',
+        'latency_seconds_sum{span="gmail.fetch"} 2.55',
+        'latency_seconds_count{span="gmail.fetch"} 3',
+        "# HELP tokens_total Tokens used",
+        "# TYPE tokens_total counter",
+        'tokens_total{model="gpt-4o-mini",type="prompt"} 150',
+    ]
+
+
+def test_metrics_endpoint_serves_the_registry() -> None:
+    """
+    Test that the HTTP endpoint serves the registry at /metrics.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests").inc()
+    server = start_metrics_server("127.0.0.1", 0, registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert response.read().decode().endswith("requests_total 1\n")
+    finally:
+        server.shutdown()
+        server.server_close()
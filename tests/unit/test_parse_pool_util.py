@@ -0,0 +1,114 @@
+import base64
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from voice_agent.utils import parse_pool_util
+from voice_agent.utils.email_parser_util import parse_gmail_raw_message
+from voice_agent.utils.gmail_fetch_util import with_internal_date
+from voice_agent.utils.parse_pool_util import parse_messages, shutdown_parse_pool
+
+
+def _message(index: int) -> dict:
+    raw = f"Subject: Mail {index}\nContent-Type: text/html\n\n<p>Body <b>{index}</b></p>"
+    return {
+        "id": f"m{index}",
+        "internalDate": str(1000 + index),
+        "raw": base64.urlsafe_b64encode(raw.encode()).decode(),
+    }
+
+
+def test_large_batches_are_parsed_by_worker_processes_in_order() -> None:
+    """
+    Test that a batch above the threshold is parsed in the pool with the in-process result.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    messages = [_message(i) for i in range(10)]
+    transform = with_internal_date(parse_gmail_raw_message)
+    expected = [transform(message) for message in messages]
+    with (
+        patch.object(parse_pool_util.settings.parser, "pool_workers", 2),
+        patch.object(parse_pool_util.settings.parser, "pool_chunk_size", 3),
+        patch.object(parse_pool_util.os, "cpu_count", return_value=2),
+    ):
+        try:
+            assert parse_messages(transform, messages) == expected
+            assert parse_pool_util._pool is not None
+        finally:
+            shutdown_parse_pool()
+
+    assert expected[3][0] == 1003
+    assert (expected[3][1]["id"], expected[3][1]["body"]) == ("m3", "Body\n3")
+
+
+def test_small_batches_and_broken_pools_are_parsed_in_process() -> None:
+    """
+    Test the in-process fallback for small batches, disabled pools and failed workers.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    messages = [_message(i) for i in range(10)]
+    expected = [parse_gmail_raw_message(message) for message in messages]
+    with patch.object(parse_pool_util, "_get_pool") as get_pool:
+        assert parse_messages(parse_gmail_raw_message, messages[:3]) == expected[:3]
+        get_pool.assert_not_called()
+
+    with patch.object(parse_pool_util.settings.parser, "pool_workers", 1):
+        assert parse_messages(parse_gmail_raw_message, messages) == expected
+        assert parse_pool_util._pool is None
+
+    broken = MagicMock()
+    broken.submit.side_effect = BrokenProcessPool("worker died")
+    with patch.object(parse_pool_util, "_get_pool", return_value=broken):
+        assert parse_messages(parse_gmail_raw_message, messages) == expected
+    broken.shutdown.assert_called_once()
+
+
+def test_default_pool_shares_cpus_between_pooled_servers() -> None:
+    """
+    Test that the default worker count divides the CPUs between the warm MCP servers.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    with (
+        patch.object(parse_pool_util.settings.parser, "pool_workers", 0),
+        patch.object(parse_pool_util.os, "cpu_count", return_value=8),
+    ):
+        with patch.object(parse_pool_util.settings.mcp_pool, "size", 2):
+            assert parse_pool_util._pool_size() == 4
+        with patch.object(parse_pool_util.settings.mcp_pool, "size", 0):
+            assert parse_pool_util._pool_size() == 8
+
+
+def test_server_shutdown_stops_the_parse_pool(mock_gmail_server: Any) -> None:
+    """
+    Test that the parse workers are stopped when the MCP server stops.
+
+    Args:
+        mock_gmail_server: A pytest fixture providing a GmailMcpServer.
+
+    Returns:
+        None
+    """
+    with (
+        patch.object(mock_gmail_server.mcp, "run", side_effect=KeyboardInterrupt),
+        patch("voice_agent.server.gmail_server.shutdown_parse_pool") as shutdown,
+        pytest.raises(KeyboardInterrupt),
+    ):
+        mock_gmail_server.run()
+    shutdown.assert_called_once()
@@ -0,0 +1,80 @@
+import json
+
+from voice_agent.utils.payload_compaction_util import (
+    compact_emails,
+    compact_emails_json,
+    estimate_tokens,
+)
+
+
+def _email(i: int, sender: str, body_words: int) -> dict:
+    return {
+        "id": f"m{i}",
+        "from": sender,
+        "subject": f"Subject {i}",
+        "date": "Fri, 03 Oct 2025",
+        "body": " ".join(f"word{n}" for n in range(body_words)),
+    }
+
+
+def test_small_payload_is_untouched() -> None:
+    """
+    Test that a payload within budget comes back unchanged and reports no cuts.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    payload = json.dumps([_email(0, "alice@example.com", 20)])
+    compacted, report = compact_emails_json(payload, token_budget=1000, max_body_tokens=500)
+    assert json.loads(compacted) == json.loads(payload)
+    assert not report.changed
+
+
+def test_large_payload_fits_budget_and_keeps_people_first() -> None:
+    """
+    Test that bodies are truncated and newsletters are dropped before personal mail.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    emails = [
+        _email(0, "Boss <boss@example.com>", 2000),
+        _email(1, "Shop <newsletter@shop.example>", 2000),
+        _email(2, "no-reply@service.example", 2000),
+        _email(3, "Friend <friend@example.com>", 2000),
+    ]
+    kept, report = compact_emails(emails, token_budget=300, max_body_tokens=150, drop_fields=["id"])
+
+    assert estimate_tokens(json.dumps(kept)) <= 300
+    assert [e["subject"] for e in kept][:1] == ["Subject 0"]
+    assert "Subject 3" in {e["subject"] for e in kept}
+    assert {e["subject"] for e in report.dropped_emails} <= {"Subject 1", "Subject 2"}
+    assert all("id" not in e for e in kept)
+    assert report.dropped_fields == ["id"]
+    assert report.bodies_truncated >= 1
+    assert "omitted" in report.summary()
+
+
+def test_dropping_requested_fields_alone_is_not_reported() -> None:
+    """
+    Test that removing the caller's drop_fields from a small payload is not a cut.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    emails = [_email(0, "Boss <boss@example.com>", 10)]
+    kept, report = compact_emails(emails, token_budget=300, max_body_tokens=150, drop_fields=["id"])
+
+    assert "id" not in kept[0]
+    assert report.dropped_fields == ["id"]
+    assert not report.changed
+    assert "dropped fields" not in report.summary()
@@ -0,0 +1,118 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from voice_agent.host import request_scheduler
+from voice_agent.host.request_scheduler import RequestRejected, RequestScheduler, TokenBucket
+
+
+def test_token_bucket_allows_a_burst_then_the_sustained_rate() -> None:
+    """
+    Test that a bucket hands out its burst at once and then refills at its rate.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    now = [100.0]
+    with patch.object(request_scheduler.time, "monotonic", side_effect=lambda: now[0]):
+        bucket = TokenBucket(rate=0.5, burst=2)
+        assert [bucket.try_acquire() for _ in range(2)] == [0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(2.0)
+        now[0] += 1.0
+        assert bucket.try_acquire() == pytest.approx(1.0)
+        now[0] += 1.0
+        assert bucket.try_acquire() == 0.0
+        assert not bucket.full
+
+        unlimited = TokenBucket(rate=0, burst=1)
+        assert all(unlimited.try_acquire() == 0.0 for _ in range(10))
+
+
+@pytest.mark.asyncio
+async def test_scheduler_bounds_concurrency_and_reports_queue_positions() -> None:
+    """
+    Test that at most max_in_flight jobs run, the rest queue in order, and overflow is refused.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    scheduler = RequestScheduler(
+        max_in_flight=2, max_queue=2, chat_rate=0, global_rate=0, retry_after=15
+    )
+    gate = asyncio.Event()
+    running = 0
+    peak = 0
+    started: list[int] = []
+
+    def job(index: int):
+        async def run() -> None:
+            nonlocal running, peak
+            started.append(index)
+            running += 1
+            peak = max(peak, running)
+            await gate.wait()
+            running -= 1
+
+        return run
+
+    await scheduler.start()
+    try:
+        positions = []
+        for i in range(4):
+            positions.append(scheduler.submit(i, job(i)))
+            await asyncio.sleep(0)
+        assert positions == [0, 0, 1, 2]
+        with pytest.raises(RequestRejected) as rejected:
+            scheduler.submit(9, job(9))
+        assert (rejected.value.reason, rejected.value.retry_after) == ("queue_full", 15)
+
+        gate.set()
+        await scheduler._queue.join()
+        assert peak == 2
+        assert started == [0, 1, 2, 3]
+        assert scheduler.running == scheduler.queued == 0
+    finally:
+        await scheduler.close()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_rate_limits_each_chat_separately() -> None:
+    """
+    Test that a chat over its burst is refused while other chats are still served.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    scheduler = RequestScheduler(max_in_flight=1, chat_rate=0.01, chat_burst=2, global_rate=0)
+    handled: list[str] = []
+
+    def job(name: str):
+        async def run() -> None:
+            handled.append(name)
+
+        return run
+
+    await scheduler.start()
+    try:
+        scheduler.submit("alice", job("a1"))
+        scheduler.submit("alice", job("a2"))
+        with pytest.raises(RequestRejected) as rejected:
+            scheduler.submit("alice", job("a3"))
+        assert rejected.value.reason == "rate_limited"
+        assert rejected.value.retry_after > 90
+        scheduler.submit("bob", job("b1"))
+
+        await scheduler._queue.join()
+        assert handled == ["a1", "a2", "b1"]
+    finally:
+        await scheduler.close()
@@ -0,0 +1,122 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from voice_agent.host.bot import EmailSummaryBot
+from voice_agent.host.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_computation() -> None:
+    """
+    Test that duplicates await the first caller's work and the result is released once.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    flight = SingleFlight()
+    calls = 0
+    released = []
+    gate = asyncio.Event()
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await gate.wait()
+        return "summary"
+
+    async def caller() -> str:
+        async with flight.join("key", work, released.append) as result:
+            await asyncio.sleep(0)
+            assert released == []
+            return result
+
+    tasks = [asyncio.create_task(caller()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert flight.in_flight("key") == 3
+    gate.set()
+
+    assert await asyncio.gather(*tasks) == ["summary"] * 3
+    assert calls == 1
+    assert released == ["summary"]
+    assert flight.in_flight("key") == 0
+
+    async with flight.join("key", work) as result:
+        assert result == "summary"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_cancellation_only_one() -> None:
+    """
+    Test that a failure is raised in every caller and a cancelled caller leaves the rest.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    flight = SingleFlight()
+    gate = asyncio.Event()
+
+    async def failing() -> str:
+        await gate.wait()
+        raise RuntimeError("Gmail is down")
+
+    async def caller() -> str:
+        async with flight.join("key", failing) as result:
+            return result
+
+    tasks = [asyncio.create_task(caller()) for _ in range(3)]
+    await asyncio.sleep(0)
+    tasks[0].cancel()
+    await asyncio.sleep(0)
+    gate.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert [str(r) for r in results[1:]] == ["Gmail is down"] * 2
+
+
+@pytest.mark.asyncio
+async def test_bot_coalesces_concurrent_audio_requests(tmp_path: Path) -> None:
+    """
+    Test that simultaneous /audio_today commands synthesize once and all get the audio.
+
+    Args:
+        tmp_path: Pytest temporary directory.
+
+    Returns:
+        None
+    """
+    audio = tmp_path / "summary.mp3"
+    audio.write_bytes(b"mp3")
+    gate = asyncio.Event()
+
+    async def today_audio() -> Path:
+        await gate.wait()
+        return audio
+
+    bot = EmailSummaryBot("token", "", "gpt-4o-mini")
+    bot.voice_agent_client.openai_client = MagicMock()
+    messages = [SimpleNamespace(reply_text=AsyncMock(), reply_audio=AsyncMock()) for _ in range(2)]
+    with patch.object(bot, "_today_audio", side_effect=today_audio) as compute:
+        tasks = [
+            asyncio.create_task(bot.audio_today(SimpleNamespace(message=m), MagicMock()))
+            for m in messages
+        ]
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    compute.assert_called_once()
+    for message in messages:
+        message.reply_audio.assert_awaited_once()
+    assert not audio.exists()
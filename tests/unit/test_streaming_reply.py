@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from voice_agent.host.streaming_reply import StreamingReply
+from voice_agent.utils.openai_utils import stream_openai_completion
+
+
+def _chunk(content: str | None = None, tool_calls: list | None = None) -> Any:
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def _tool_delta(index: int, id: str | None, name: str | None, arguments: str) -> Any:
+    function = SimpleNamespace(name=name, arguments=arguments)
+    return SimpleNamespace(index=index, id=id, function=function)
+
+
+class FakeStream:
+    """Async iterator over canned chat completion chunks."""
+
+    def __init__(self, chunks: list[Any]) -> None:
+        self._chunks = iter(chunks)
+
+    def __aiter__(self) -> "FakeStream":
+        """Return the iterator itself."""
+        return self
+
+    async def __anext__(self) -> Any:
+        """Return the next chunk."""
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_text_and_assembles_tool_calls() -> None:
+    """
+    Test that streamed deltas are reported as they arrive and tool calls are reassembled.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    chunks = [
+        _chunk("Hel"),
+        _chunk("lo"),
+        _chunk(tool_calls=[_tool_delta(0, "call_1", "get_emails", '{"da')]),
+        _chunk(tool_calls=[_tool_delta(0, None, None, 'ys": 2}')]),
+        SimpleNamespace(choices=[]),
+    ]
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(return_value=FakeStream(chunks))
+    seen: list[str] = []
+
+    async def on_text(text: str) -> None:
+        seen.append(text)
+
+    message = await stream_openai_completion(client, "m", [], on_text=on_text, tools=[])
+
+    assert seen == ["Hel", "Hello"]
+    assert message.content == "Hello"
+    assert [(tc.id, tc.name, tc.arguments) for tc in message.tool_calls] == [
+        ("call_1", "get_emails", '{"days": 2}')
+    ]
+    assert client.chat.completions.create.call_args.kwargs["stream"] is True
+
+
+@pytest.mark.asyncio
+async def test_streaming_reply_edits_placeholder_and_splits_long_text() -> None:
+    """
+    Test that partial text edits the placeholder and the final text overflows into replies.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    message = MagicMock()
+    message.reply_text = AsyncMock()
+    placeholder = MagicMock()
+    placeholder.edit_text = AsyncMock()
+    reply = StreamingReply(message, placeholder, edit_interval=0.0, max_length=10)
+
+    await reply.update("Hi")
+    await reply.update("Hi there")
+    await reply.finish("Hi there, how are you?")
+
+    edits = [call.args[0] for call in placeholder.edit_text.await_args_list]
+    assert edits == ["Hi ▌", "Hi there ▌", "Hi there, "]
+    assert [call.args[0] for call in message.reply_text.await_args_list] == [
+        "how are yo",
+        "u?",
+    ]
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from voice_agent.client.summarizer import EmailSummarizer, chunk_emails
+from voice_agent.server.prompts.email_prompts import EMAIL_CHUNK_SUMMARY_PROMPT
+
+
+class FakeOpenAI:
+    """Records chat completions and the peak number of them running at once."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.calls: list[list[dict]] = []
+        self.active = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs: Any) -> Any:
+        """Return a canned completion naming the call number."""
+        self.calls.append(kwargs["messages"])
+        number = len(self.calls)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.latency)
+        self.active -= 1
+        message = SimpleNamespace(content=f"notes {number}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _emails(count: int, body_words: int) -> list[dict]:
+    body = " ".join(f"word{n}" for n in range(body_words))
+    return [{"from": f"s{i}@example.com", "subject": f"S{i}", "body": body} for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_small_payload_uses_single_completion() -> None:
+    """
+    Test that a payload within chunk_tokens is summarized in one call with the given prompt.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    client = FakeOpenAI()
+    summarizer = EmailSummarizer(client, "m", chunk_tokens=1000, max_concurrency=4)
+    payload = json.dumps(_emails(3, 10))
+
+    summary = await summarizer.summarize(payload, "SUMMARY PROMPT")
+
+    assert summary == "notes 1"
+    assert client.calls == [
+        [
+            {"role": "system", "content": "SUMMARY PROMPT"},
+            {"role": "user", "content": payload},
+        ]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_large_payload_is_mapped_concurrently_then_reduced() -> None:
+    """
+    Test that chunks are summarized in parallel within the limit and then reduced.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    emails = _emails(12, 80)
+    chunks = chunk_emails(emails, chunk_tokens=400)
+    assert [e for chunk in chunks for e in chunk] == emails
+    assert len(chunks) == 6
+
+    client = FakeOpenAI(latency=0.05)
+    summarizer = EmailSummarizer(client, "m", chunk_tokens=400, max_concurrency=3)
+    started = time.perf_counter()
+    summary = await summarizer.summarize(json.dumps(emails), "SUMMARY PROMPT")
+    elapsed = time.perf_counter() - started
+
+    map_calls, reduce_call = client.calls[:-1], client.calls[-1]
+    assert len(map_calls) == 6
+    assert all(call[0]["content"] == EMAIL_CHUNK_SUMMARY_PROMPT for call in map_calls)
+    assert client.peak == 3
+    # Two waves of three chunks plus the reduce, not six sequential chunk calls.
+    assert elapsed < 6 * 0.05
+    assert reduce_call[0]["content"].startswith("SUMMARY PROMPT")
+    assert "BATCH 6 of 6" in reduce_call[1]["content"]
+    assert summary == "notes 7"
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from voice_agent.client.agent import VoiceAgentClient
+from voice_agent.utils.summary_cache_util import (
+    DiskSummaryCache,
+    MemorySummaryCache,
+    summary_cache_key,
+)
+
+
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+def test_cache_evicts_least_recently_used_and_expired(backend: str, tmp_path: Path) -> None:
+    """
+    Test LRU eviction, TTL expiry and order-independent keys for both backends.
+
+    Args:
+        backend: Which cache backend to exercise.
+        tmp_path: Pytest temporary directory.
+
+    Returns:
+        None
+    """
+
+    def make(ttl: float) -> Any:
+        if backend == "memory":
+            return MemorySummaryCache(max_entries=2, ttl=ttl)
+        return DiskSummaryCache(str(tmp_path / f"cache-{ttl}.sqlite3"), max_entries=2, ttl=ttl)
+
+    key_a = summary_cache_key(["m1", "m2"], "p", {"timespan": "today"}, "gpt", 0.2)
+    assert key_a == summary_cache_key(["m2", "m1"], "p", {"timespan": "today"}, "gpt", 0.2)
+    key_b = summary_cache_key(["m1", "m2"], "p", {"timespan": "today"}, "gpt", 0.7)
+    key_c = summary_cache_key(["m1", "m2", "m3"], "p", {"timespan": "today"}, "gpt", 0.2)
+    assert len({key_a, key_b, key_c}) == 3
+
+    cache = make(ttl=60)
+    cache.set(key_a, "A")
+    cache.set(key_b, "B")
+    assert cache.get(key_a) == "A"
+    cache.set(key_c, "C")
+    assert cache.get(key_b) is None
+    assert (cache.get(key_a), cache.get(key_c)) == ("A", "C")
+
+    expired = make(ttl=-1)
+    expired.set(key_a, "A")
+    assert expired.get(key_a) is None
+
+
+@pytest.mark.asyncio
+async def test_repeat_summary_of_unchanged_inbox_skips_openai() -> None:
+    """
+    Test that summarize_emails only calls OpenAI again once the message ids change.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    completion = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="S"))])
+    openai_client = MagicMock()
+    openai_client.chat.completions.create = AsyncMock(return_value=completion)
+    client = VoiceAgentClient(openai_client=openai_client, model="gpt-4o-mini")
+    emails = [{"id": "m1", "subject": "Hi", "body": "Hello"}]
+    cache = MemorySummaryCache(max_entries=8, ttl=60)
+
+    with patch("voice_agent.client.agent.get_summary_cache", return_value=cache):
+        for _ in range(2):
+            summary = await client.summarize_emails(
+                json.dumps(emails), "PROMPT", ["id"], "summary", {"timespan": "today"}
+            )
+            assert summary == "S"
+        assert openai_client.chat.completions.create.call_count == 1
+
+        emails.append({"id": "m2", "subject": "New", "body": "Mail"})
+        await client.summarize_emails(
+            json.dumps(emails), "PROMPT", ["id"], "summary", {"timespan": "today"}
+        )
+        assert openai_client.chat.completions.create.call_count == 2
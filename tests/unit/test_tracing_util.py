@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from voice_agent.client.agent import VoiceAgentClient
+from voice_agent.server.tracing_middleware import TracingMiddleware
+from voice_agent.utils.metrics_util import OPENAI_TOKENS, SPAN_DURATION
+from voice_agent.utils.openai_utils import record_usage
+from voice_agent.utils.tracing_util import current_span, span
+
+
+def test_spans_nest_under_the_root_and_are_observed() -> None:
+    """
+    Test that child spans share the root's trace and are collected and measured.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    before = SPAN_DURATION.count(span="test.child", status="error")
+    with span("test.root") as root:
+        with span("test.child") as child:
+            assert current_span() is child
+        with pytest.raises(ValueError), span("test.child"):
+            raise ValueError("boom")
+
+    assert current_span() is None
+    assert child.trace_id == root.trace_id and child.parent is root
+    assert [name for name, _ in root.finished or []] == ["test.child", "test.child"]
+    assert SPAN_DURATION.count(span="test.child", status="error") == before + 1
+
+
+def test_openai_usage_is_counted_per_model_and_type() -> None:
+    """
+    Test that prompt and completion tokens from completion.usage are counted.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    record_usage("test-model", SimpleNamespace(prompt_tokens=100, completion_tokens=20))
+    record_usage("test-model", None)
+
+    assert OPENAI_TOKENS.value(model="test-model", type="prompt") == 100
+    assert OPENAI_TOKENS.value(model="test-model", type="completion") == 20
+
+
+@pytest.mark.asyncio
+async def test_trace_context_crosses_the_mcp_boundary() -> None:
+    """
+    Test that a tool call joins the caller's trace and returns its spans in _meta.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    server = FastMCP("tracing-test")
+    server.add_middleware(TracingMiddleware())
+    server_traces = []
+
+    @server.tool
+    async def echo(text: str) -> str:
+        span_in_tool = current_span()
+        server_traces.append(span_in_tool.trace_id if span_in_tool else None)
+        with span("test.inner"):
+            return text
+
+    async with Client(server) as client:
+        with span("test.request") as root:
+            result = await VoiceAgentClient.call_tool(client.session, "echo", {"text": "hi"})
+
+    assert result.content[0].text == "hi"
+    assert server_traces == [root.trace_id]
+    assert [name for name, _ in root.finished or []] == [
+        "test.inner",
+        "tool.echo",
+        "mcp.call_tool.echo",
+    ]
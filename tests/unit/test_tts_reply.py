@@ -0,0 +1,154 @@
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from google.api_core.exceptions import ServiceUnavailable
+
+from voice_agent.server.tools import tts_reply
+from voice_agent.server.tools.tts_reply import _synthesize_chunks, split_text
+from voice_agent.utils.audio_cache_util import AudioCache
+
+
+class FakeTtsClient:
+    """Returns each chunk's text as its audio and tracks concurrent requests."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.texts: list[str] = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def synthesize_speech(self, request: dict[str, Any]) -> Any:
+        """Return a fake MP3 whose later chunks carry an ID3 tag to strip."""
+        text = request["input"].text
+        with self._lock:
+            self.texts.append(text)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+        tag = b"ID3\x04\x00\x00\x00\x00\x00\x02xx"
+        return SimpleNamespace(audio_content=tag + f"<{text}>".encode())
+
+
+def test_split_text_respects_sentences_and_byte_limit() -> None:
+    """
+    Test that chunks stay under the byte limit, end at sentences and keep every word.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    text = (
+        "First sentence here. Second one, with “quotes.” Third!\n\n"
+        "Next paragraph starts. " + "Ünïcode wörds " * 30 + "end."
+    )
+    chunks = split_text(text, max_bytes=40)
+
+    assert all(len(chunk.encode("utf-8")) <= 40 for chunk in chunks)
+    assert chunks[0] == "First sentence here."
+    assert chunks[1] == "Second one, with “quotes.” Third!"
+    assert chunks[2] == "Next paragraph starts."
+    assert " ".join(chunks).split() == text.split()
+    assert split_text("Short. Text.", max_bytes=1500) == ["Short. Text."]
+
+
+def test_chunks_are_synthesized_concurrently_and_joined_in_order() -> None:
+    """
+    Test that synthesis runs in parallel up to the pool size and keeps reading order.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    client = FakeTtsClient(latency=0.05)
+    chunks = [f"Sentence {i}." for i in range(6)]
+    with (
+        patch.object(tts_reply, "_init_tts_client", return_value=client),
+        patch.object(tts_reply, "_client", None),
+        patch.object(tts_reply, "_executor", None),
+        patch.object(tts_reply, "get_audio_cache", return_value=None),
+        patch.object(tts_reply.settings.tts, "max_concurrency", 3),
+    ):
+        started = time.perf_counter()
+        mp3 = _synthesize_chunks(chunks, "en-US", "voice")
+        elapsed = time.perf_counter() - started
+
+    assert client.peak == 3
+    assert elapsed < 6 * 0.05
+    assert mp3.startswith(b"ID3")
+    assert mp3.split(b"xx", 1)[1] == b"".join(f"<{c}>".encode() for c in chunks)
+
+
+def test_repeated_chunks_are_served_from_audio_cache(tmp_path: Path) -> None:
+    """
+    Test that replayed text costs no TTS calls and the cache evicts least recently used.
+
+    Args:
+        tmp_path: Pytest temporary directory.
+
+    Returns:
+        None
+    """
+    client = FakeTtsClient()
+    cache = AudioCache(str(tmp_path), max_bytes=10_000)
+    with (
+        patch.object(tts_reply, "_init_tts_client", return_value=client),
+        patch.object(tts_reply, "_client", None),
+        patch.object(tts_reply, "get_audio_cache", return_value=cache),
+    ):
+        first = _synthesize_chunks(["Hello there.", "Bye."], "en-US", "voice")
+        second = _synthesize_chunks(["Hello there.", "Bye."], "en-US", "voice")
+        _synthesize_chunks(["Hello there."], "en-US", "other-voice")
+
+    assert first == second
+    assert client.texts.count("Bye.") == 1
+    assert client.texts.count("Hello there.") == 2
+
+    small = AudioCache(str(tmp_path / "small"), max_bytes=25)
+    small.put("a", b"a" * 10)
+    small.put("b", b"b" * 10)
+    assert small.get("a") == b"a" * 10
+    small.put("c", b"c" * 10)
+    assert small.get("b") is None
+    assert (small.get("a"), small.get("c")) == (b"a" * 10, b"c" * 10)
+
+
+def test_tts_client_is_reused_and_recreated_after_channel_failure() -> None:
+    """
+    Test that one client serves all calls until its channel fails, then a new one is made.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    broken = MagicMock()
+    broken.synthesize_speech.side_effect = ServiceUnavailable("channel down")
+    healthy = FakeTtsClient()
+    with (
+        patch.object(tts_reply, "_init_tts_client", side_effect=[broken, healthy]) as init,
+        patch.object(tts_reply, "_client", None),
+        patch.object(tts_reply, "get_audio_cache", return_value=None),
+    ):
+        tts_reply.warm_up_tts_client()
+        assert tts_reply.get_tts_client() is broken
+
+        _synthesize_chunks(["One."], "en-US", "voice")
+        _synthesize_chunks(["Two."], "en-US", "voice")
+
+        assert tts_reply.get_tts_client() is healthy
+
+    assert init.call_count == 2
+    broken.transport.close.assert_called_once()
+    assert healthy.texts == ["One.", "Two."]